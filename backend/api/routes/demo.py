@@ -2,16 +2,24 @@
 Demo API Routes - Simplified for Hackathon
 Fast implementation, focus on working demo
 """
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List
 import json
+import os
 from pathlib import Path
 from datetime import datetime
 
 from config.database import get_db
 from db.models import Scholarship, StudentProfile, Persona, Essay, Evaluation
 from api.services.claude_service import claude_service
+from api.services.request_hedging import request_hedger
+from api.services.circuit_breaker import claude_breaker
+from api.services.request_cancellation import cancellation_monitor, ClientDisconnected
+from api.services.api_call_log import api_call_log
+from api.services.similarity_index import similarity_service
+from api.services.archetype_matcher import archetype_matcher
+from api.services.local_evaluator import local_evaluator
 
 router = APIRouter(prefix="/demo", tags=["demo"])
 
@@ -39,6 +47,9 @@ def load_mock_data():
 # Cache mock data
 MOCK_SCHOLARSHIPS, MOCK_STUDENTS = load_mock_data()
 
+# compare-essays scorer when the request doesn't say: "fast" (local) or "deep" (Claude)
+DEFAULT_EVALUATION_MODE = os.getenv("EVALUATION_MODE", "fast")
+
 @router.get("/")
 async def demo_info():
     """Get demo API information"""
@@ -47,13 +58,52 @@ async def demo_info():
         "version": "1.0.0-hackathon",
         "endpoints": [
             "/demo/scholarships - Get all scholarships",
+            "/demo/scholarships/{id}/similar - Get similar scholarships",
             "/demo/students - Get all student profiles",
             "/demo/analyze-scholarship - Build persona for scholarship",
             "/demo/generate-essay - Generate adaptive essay",
-            "/demo/compare-essays - Compare two essays"
+            "/demo/compare-essays - Compare two essays",
+            "/demo/llm/hedging - Hedged request stats",
+            "/demo/llm/circuit - Claude circuit breaker state",
+            "/demo/llm/cancellations - LLM calls cancelled on client disconnect",
+            "/demo/llm/routes - Model route per prompt type with latency/token stats"
         ]
     }
 
+@router.get("/llm/hedging")
+async def get_hedging_stats():
+    """
+    Hedged Claude request stats per prompt type (hedge rate, wins, latency won)
+    """
+    return request_hedger.stats()
+
+@router.get("/llm/circuit")
+async def get_circuit_state():
+    """
+    Claude circuit breaker state (closed, open or half_open) and counters
+    """
+    return claude_breaker.stats()
+
+@router.get("/llm/cancellations")
+async def get_cancellation_stats():
+    """
+    LLM calls cancelled because the client disconnected, per endpoint
+    """
+    return cancellation_monitor.stats()
+
+@router.get("/llm/routes")
+async def get_model_routes(hours: float = 24.0, db: Session = Depends(get_db)):
+    """
+    Model, max_tokens and temperature per prompt type, plus call counts,
+    latency and tokens per route over the last `hours` (from api_logs)
+    """
+    return {
+        "routes": claude_service.routes(),
+        "window_hours": hours,
+        "usage": api_call_log.summary(db, hours),
+        "log_rows_dropped": api_call_log.dropped
+    }
+
 @router.get("/scholarships")
 async def get_scholarships(db: Session = Depends(get_db)):
     """
@@ -87,6 +137,71 @@ async def get_scholarships(db: Session = Depends(get_db)):
         "scholarships": MOCK_SCHOLARSHIPS
     }
 
+@router.get("/scholarships/{scholarship_id}/similar")
+async def get_similar_scholarships(
+    scholarship_id: int,
+    limit: int = 5,
+    db: Session = Depends(get_db)
+):
+    """
+    Get scholarships similar to the given one ("more like this")
+
+    Uses a local hashed TF-IDF index over description + criteria,
+    so it works offline and without any Claude call.
+    """
+    limit = max(1, min(limit, 50))
+    # ID -> version, so edited scholarships get re-embedded and deleted ones dropped
+    catalog = {
+        row.id: str(row.updated_at)
+        for row in db.query(Scholarship.id, Scholarship.updated_at).all()
+    }
+
+    if catalog:
+        source = "database"
+
+        def fetch(ids):
+            rows = db.query(Scholarship).filter(Scholarship.id.in_(ids)).all()
+            return [{"id": s.id, "description": s.description, "criteria": s.criteria} for s in rows]
+    else:
+        source = "mock_data"
+        mock_by_id = {s["id"]: s for s in MOCK_SCHOLARSHIPS}
+        catalog = {i: similarity_service.document_version(s) for i, s in mock_by_id.items()}
+
+        def fetch(ids):
+            return [mock_by_id[i] for i in ids]
+
+    if scholarship_id not in catalog:
+        raise HTTPException(status_code=404, detail=f"Scholarship {scholarship_id} not found")
+
+    similarity_service.sync(source, catalog, fetch)
+    neighbours = similarity_service.similar(source, scholarship_id, k=limit) or []
+
+    # Only fetch display fields for the hits
+    hit_ids = [i for i, _ in neighbours]
+    if source == "database":
+        details = {
+            s.id: {"id": s.id, "name": s.name, "organization": s.organization}
+            for s in db.query(Scholarship).filter(Scholarship.id.in_(hit_ids)).all()
+        }
+    else:
+        details = {
+            i: {"id": i, "name": mock_by_id[i]["name"], "organization": mock_by_id[i].get("organization")}
+            for i in hit_ids
+        }
+
+    similar = [
+        {**details[i], "score": round(score, 4)}
+        for i, score in neighbours
+        if i in details
+    ]
+
+    return {
+        "source": source,
+        "scholarship_id": scholarship_id,
+        "count": len(similar),
+        "similar": similar
+    }
+
 @router.get("/students")
 async def get_students():
     """
@@ -101,6 +216,7 @@ async def get_students():
 @router.post("/analyze-scholarship")
 async def analyze_scholarship(
     scholarship_id: int,
+    http_request: Request,
     db: Session = Depends(get_db)
 ):
     """
@@ -111,6 +227,8 @@ async def analyze_scholarship(
     2. Call Claude to analyze
     3. Save persona to DB
     4. Return persona
+
+    The Claude call is cancelled if the client disconnects.
     """
     # Get scholarship
     scholarship = None
@@ -154,10 +272,13 @@ async def analyze_scholarship(
         }
 
     # Analyze with Claude
-    persona_result = claude_service.analyze_persona(scholarship["description"])
+    persona_result = await cancellation_monitor.run(
+        http_request, "analyze-scholarship", claude_service.analyze_persona, scholarship["description"]
+    )
 
-    # Save to database if we have a DB scholarship
-    if db_scholarship:
+    # Save to database if we have a DB scholarship (a degraded persona is not
+    # cached, so the next request asks Claude again)
+    if db_scholarship and not persona_result.get("degraded"):
         new_persona = Persona(
             scholarship_id=scholarship_id,
             persona_name=persona_result["persona_name"],
@@ -184,6 +305,7 @@ async def analyze_scholarship(
 @router.post("/generate-essay")
 async def generate_essay(
     request: Dict[str, Any],
+    http_request: Request,
     db: Session = Depends(get_db)
 ):
     """
@@ -195,6 +317,8 @@ async def generate_essay(
         "student_id": int,
         "essay_type": "adaptive" or "baseline"
     }
+
+    Claude calls are cancelled if the client disconnects.
     """
     scholarship_id = request.get("scholarship_id")
     student_id = request.get("student_id")
@@ -214,7 +338,9 @@ async def generate_essay(
                 break
 
         if scholarship:
-            persona_result = claude_service.analyze_persona(scholarship["description"])
+            persona_result = await cancellation_monitor.run(
+                http_request, "generate-essay", claude_service.analyze_persona, scholarship["description"]
+            )
             persona_dict = {
                 "persona_name": persona_result["persona_name"],
                 "tone": persona_result["tone"],
@@ -254,15 +380,19 @@ async def generate_essay(
         raise HTTPException(status_code=404, detail="Student not found")
 
     # Generate essay
-    if essay_type == "adaptive":
-        essay_result = claude_service.generate_essay(persona_dict, student)
-    else:
+    essay_result = await cancellation_monitor.run(
+        http_request, "generate-essay", claude_service.generate_essay, persona_dict, student
+    )
+    if essay_type != "adaptive":
         # For baseline, use generic approach
-        essay_result = claude_service.generate_essay(persona_dict, student)
         essay_result["tone_used"] = "Generic Academic"
 
-    # Optionally save to database
-    if persona and student:
+    # Tag with the closest winner essay archetype (local, no LLM call)
+    archetype_matcher.refresh_if_changed(db)
+    essay_result["archetype"] = archetype_matcher.match(essay_result.get("essay", []))
+
+    # Optionally save to database (not the canned essay of a degraded response)
+    if persona and student and not essay_result.get("degraded"):
         # Get or create student profile in DB
         db_student = db.query(StudentProfile).filter(
             StudentProfile.email == student["email"]
@@ -289,7 +419,9 @@ async def generate_essay(
             paragraphs=essay_result["essay"],
             tone_used=essay_result["tone_used"],
             overall_alignment=essay_result["overall_alignment"],
-            summary=essay_result["summary"]
+            summary=essay_result["summary"],
+            archetype_cluster_id=essay_result["archetype"]["cluster_id"] if essay_result["archetype"] else None,
+            archetype_similarity=essay_result["archetype"]["similarity"] if essay_result["archetype"] else None
         )
 
         db.add(new_essay)
@@ -308,6 +440,7 @@ async def generate_essay(
 @router.post("/compare-essays")
 async def compare_essays(
     request: Dict[str, Any],
+    http_request: Request,
     db: Session = Depends(get_db)
 ):
     """
@@ -317,12 +450,18 @@ async def compare_essays(
     {
         "scholarship_id": int,
         "adaptive_essay": [...],  # Array of paragraphs or essay_id
-        "baseline_essay": [...]   # Array of paragraphs or essay_id
+        "baseline_essay": [...],  # Array of paragraphs or essay_id
+        "mode": "fast" or "deep"  # fast = local scorer, deep = Claude evaluation
     }
+
+    Claude calls are cancelled if the client disconnects.
     """
     scholarship_id = request.get("scholarship_id")
     adaptive_input = request.get("adaptive_essay")
     baseline_input = request.get("baseline_essay")
+    mode = request.get("mode", DEFAULT_EVALUATION_MODE)
+    if mode not in ("fast", "deep"):
+        raise HTTPException(status_code=400, detail="mode must be 'fast' or 'deep'")
 
     # Get persona
     persona = db.query(Persona).filter(
@@ -338,7 +477,9 @@ async def compare_essays(
                 break
 
         if scholarship:
-            persona_result = claude_service.analyze_persona(scholarship["description"])
+            persona_result = await cancellation_monitor.run(
+                http_request, "compare-essays", claude_service.analyze_persona, scholarship["description"]
+            )
             persona_dict = {
                 "persona_name": persona_result["persona_name"],
                 "tone": persona_result["tone"],
@@ -354,32 +495,51 @@ async def compare_essays(
         }
 
     # Handle essay inputs (could be arrays or IDs)
+    # Items keep focus/alignment_score when available; the local scorer uses them
     if isinstance(adaptive_input, int):
         # It's an essay ID
         adaptive_essay = db.query(Essay).filter(Essay.id == adaptive_input).first()
         if adaptive_essay:
-            adaptive_paragraphs = [p["paragraph"] for p in adaptive_essay.paragraphs]
+            adaptive_items = adaptive_essay.paragraphs
         else:
             raise HTTPException(status_code=404, detail="Adaptive essay not found")
     else:
         # It's already an array
-        adaptive_paragraphs = adaptive_input
+        adaptive_items = adaptive_input or []
 
     if isinstance(baseline_input, int):
         baseline_essay = db.query(Essay).filter(Essay.id == baseline_input).first()
         if baseline_essay:
-            baseline_paragraphs = [p["paragraph"] for p in baseline_essay.paragraphs]
+            baseline_items = baseline_essay.paragraphs
         else:
             raise HTTPException(status_code=404, detail="Baseline essay not found")
     else:
-        baseline_paragraphs = baseline_input
+        baseline_items = baseline_input or []
+
+    adaptive_paragraphs = [local_evaluator.paragraph_text(p) for p in adaptive_items]
+    baseline_paragraphs = [local_evaluator.paragraph_text(p) for p in baseline_items]
 
     # Compare essays
-    evaluation_result = claude_service.compare_essays(
-        persona_dict,
-        adaptive_paragraphs,
-        baseline_paragraphs
-    )
+    if mode == "deep":
+        evaluation_result = await cancellation_monitor.run(
+            http_request,
+            "compare-essays",
+            claude_service.compare_essays,
+            persona_dict,
+            adaptive_paragraphs,
+            baseline_paragraphs
+        )
+        # Degraded results were scored locally and say so
+        evaluation_result.setdefault("scorer", "llm")
+    else:
+        evaluation_result = local_evaluator.compare(persona_dict, adaptive_items, baseline_items)
+
+    # Tag both essays with their closest winner essay archetype
+    archetype_matcher.refresh_if_changed(db)
+    evaluation_result["archetypes"] = {
+        "adaptive": archetype_matcher.match(adaptive_paragraphs or []),
+        "baseline": archetype_matcher.match(baseline_paragraphs or [])
+    }
 
     # Optionally save evaluation to DB
     if persona:
@@ -392,7 +552,8 @@ async def compare_essays(
             alignment_gain=evaluation_result["alignment_gain"],
             tone_consistency_score=evaluation_result["tone_consistency_score"],
             summary=evaluation_result["summary"],
-            recommendation=evaluation_result["recommendation"]
+            recommendation=evaluation_result["recommendation"],
+            scorer=evaluation_result["scorer"]
         )
 
         db.add(new_evaluation)
@@ -410,19 +571,25 @@ async def compare_essays(
 @router.get("/test-flow/{scholarship_id}")
 async def test_complete_flow(
     scholarship_id: int,
+    http_request: Request,
     student_id: int = 1,
     db: Session = Depends(get_db)
 ):
     """
     Test complete flow: Scholarship → Persona → Essay → Evaluation
     Quick way to test everything works
+
+    If the client disconnects, the running stage's Claude call is cancelled
+    and later stages are skipped (stages already done keep their results).
     """
     results = {}
 
     # Step 1: Analyze scholarship
     try:
-        persona_response = await analyze_scholarship(scholarship_id, db)
+        persona_response = await analyze_scholarship(scholarship_id, http_request, db)
         results["persona"] = persona_response
+    except ClientDisconnected:
+        raise
     except Exception as e:
         results["persona_error"] = str(e)
         return results
@@ -434,8 +601,10 @@ async def test_complete_flow(
             "student_id": student_id,
             "essay_type": "adaptive"
         }
-        adaptive_response = await generate_essay(adaptive_request, db)
+        adaptive_response = await generate_essay(adaptive_request, http_request, db)
         results["adaptive_essay"] = adaptive_response
+    except ClientDisconnected:
+        raise
     except Exception as e:
         results["adaptive_essay_error"] = str(e)
         return results
@@ -447,8 +616,10 @@ async def test_complete_flow(
             "student_id": student_id,
             "essay_type": "baseline"
         }
-        baseline_response = await generate_essay(baseline_request, db)
+        baseline_response = await generate_essay(baseline_request, http_request, db)
         results["baseline_essay"] = baseline_response
+    except ClientDisconnected:
+        raise
     except Exception as e:
         results["baseline_essay_error"] = str(e)
         return results
@@ -457,11 +628,13 @@ async def test_complete_flow(
     try:
         compare_request = {
             "scholarship_id": scholarship_id,
-            "adaptive_essay": [p["paragraph"] for p in adaptive_response["essay"]["essay"]],
-            "baseline_essay": [p["paragraph"] for p in baseline_response["essay"]["essay"]]
+            "adaptive_essay": adaptive_response["essay"]["essay"],
+            "baseline_essay": baseline_response["essay"]["essay"]
         }
-        evaluation_response = await compare_essays(compare_request, db)
+        evaluation_response = await compare_essays(compare_request, http_request, db)
         results["evaluation"] = evaluation_response
+    except ClientDisconnected:
+        raise
     except Exception as e:
         results["evaluation_error"] = str(e)
 
@@ -3,17 +3,26 @@ Profile management routes
 Handles resume upload, AI extraction, and profile CRUD operations
 """
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional, Tuple
+import json
 import logging
-from datetime import datetime
+import time
 from pathlib import Path
 
 from config.database import get_db
 from db.models.student_profile import StudentProfile
 from api.services.file_service import file_service
-from api.services.pdf_parser import pdf_parser
+from api.services.pdf_parser import RESUME_MAX_CHARS, RESUME_MAX_PAGES
+from api.services.pdf_worker_pool import pdf_worker_pool, PoolSaturatedError
+from api.services.parse_cache import parse_cache
+from api.services.blob_sweeper import blob_sweeper
 from api.services.ai_extractor import ai_extractor
+from api.services.extraction_cache import extraction_cache
+from api.services.batch_extraction import batch_extractor
+from api.services.resume_pipeline import resume_pipeline, extraction_summary
+from api.services.persona_matching import persona_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -48,12 +57,20 @@ async def upload_resume(
         if not is_valid:
             raise HTTPException(status_code=400, detail="Invalid file. Must be PDF under 10MB")
 
-        # Save file
-        filename, file_path = await file_service.save_upload(file, student_id)
-
-        # Extract text from PDF
-        full_path = str(file_service.UPLOAD_DIR / file_path)
-        resume_text = pdf_parser.extract_text(full_path)
+        # Save file (streamed to disk and hashed on the way)
+        upload = await file_service.save_upload(file, student_id)
+        filename, file_path = file.filename, upload.filename
+
+        # Extract text from PDF (in the worker pool - keeps the event loop free)
+        try:
+            resume_text = await pdf_worker_pool.extract_text(
+                upload.file_path,
+                digest=upload.sha256,
+                max_pages=RESUME_MAX_PAGES,
+                max_chars=RESUME_MAX_CHARS
+            )
+        except PoolSaturatedError:
+            raise HTTPException(status_code=503, detail="Resume parser is busy, please retry shortly")
 
         if not resume_text:
             raise HTTPException(status_code=422, detail="Could not extract text from PDF")
@@ -61,7 +78,8 @@ async def upload_resume(
         # Update student profile with resume info
         student.resume_filename = filename
         student.resume_file_path = file_path
-        student.raw_resume_text = resume_text[:50000]  # Limit to 50k chars
+        student.resume_sha256 = upload.sha256
+        student.raw_resume_text = resume_text
         student.profile_source = 'resume'
 
         db.commit()
@@ -86,17 +104,134 @@ async def upload_resume(
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 
+async def _sse(events: AsyncIterator[Tuple[str, Dict[str, Any]]]) -> AsyncIterator[str]:
+    """Format (event, data) pairs as server-sent events"""
+    async for event, data in events:
+        yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/profiles/upload-and-extract")
+async def upload_and_extract(
+    student_id: int,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db)
+) -> StreamingResponse:
+    """
+    Upload a resume and extract the profile in one request
+
+    Streams server-sent events as stages finish: "uploaded", "parsed" and
+    "extracted" (same data as extract-from-resume), or "error" with
+    status_code and detail. The parsed text goes straight to the extractor,
+    and the resume is saved to the profile while extraction runs.
+
+    Args:
+        student_id: Student profile ID
+        file: PDF file upload
+        db: Database session
+
+    Returns:
+        text/event-stream response
+    """
+    started_at = time.perf_counter()
+
+    # Verify student exists
+    student = db.query(StudentProfile).filter(StudentProfile.id == student_id).first()
+    if not student:
+        raise HTTPException(status_code=404, detail="Student profile not found")
+
+    # Save before streaming: the upload is closed once the endpoint returns
+    await file_service.validate_file(file)
+    upload = await file_service.save_upload(file, student_id)
+
+    return StreamingResponse(
+        _sse(resume_pipeline.run(student_id, file.filename, upload, started_at)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/profiles/parse-cache/stats")
+def get_parse_cache_stats() -> Dict[str, Any]:
+    """
+    Resume parse cache counters (hit rate, bytes saved, size)
+
+    Returns:
+        Cache statistics
+    """
+    return {
+        "success": True,
+        "data": parse_cache.stats()
+    }
+
+
+@router.post("/profiles/extract-batch")
+def start_batch_extraction(
+    limit: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    batch_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Start extracting every profile with resume text that was never extracted
+
+    Runs in the background; poll /profiles/extract-batch/{job_id} for progress.
+
+    Args:
+        limit: Extract at most this many profiles
+        concurrency: Concurrent extractions (capped server-side)
+        batch_size: Profiles per page and per commit
+
+    Returns:
+        Job id and initial progress
+    """
+    try:
+        progress = batch_extractor.start(limit=limit, concurrency=concurrency, batch_size=batch_size)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return {
+        "success": True,
+        "message": "Batch extraction started",
+        "data": progress.to_dict()
+    }
+
+
+@router.get("/profiles/extract-batch/{job_id}")
+def get_batch_extraction(job_id: str) -> Dict[str, Any]:
+    """
+    Progress and throughput of a batch extraction job
+
+    Args:
+        job_id: Id returned by POST /profiles/extract-batch
+
+    Returns:
+        Counters, profiles/s and ETA
+    """
+    progress = batch_extractor.get(job_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Batch extraction job not found")
+
+    return {
+        "success": True,
+        "data": progress.to_dict()
+    }
+
+
 @router.post("/profiles/extract-from-resume/{student_id}")
 async def extract_profile_from_resume(
     student_id: int,
+    force: bool = False,
     db: Session = Depends(get_db),
     background_tasks: BackgroundTasks = BackgroundTasks()
 ) -> Dict[str, Any]:
     """
     Extract structured profile data from uploaded resume using AI
 
+    Unchanged resumes are not re-extracted, and resumes identical to one
+    extracted before (on any profile) reuse that result.
+
     Args:
         student_id: Student profile ID
+        force: Re-run extraction even if a memoized result exists
         db: Database session
         background_tasks: Background task runner
 
@@ -115,34 +250,12 @@ async def extract_profile_from_resume(
                 detail="No resume text found. Please upload a resume first"
             )
 
-        # Extract profile using AI
-        extracted_data = ai_extractor.extract_profile_from_resume(student.raw_resume_text)
+        # Extract profile using AI (memoized by normalized resume text)
+        extracted_data, source = extraction_cache.extract_for_profile(db, student, force=force)
 
         # Update student profile with extracted data
-        if extracted_data.get("name"):
-            student.name = extracted_data["name"]
-        if extracted_data.get("email"):
-            student.email = extracted_data["email"]
-        if extracted_data.get("phone"):
-            student.phone = extracted_data["phone"]
-        if extracted_data.get("gpa") is not None:
-            student.gpa = extracted_data["gpa"]
-
-        # Update JSON fields
-        student.activities = extracted_data.get("activities", [])
-        student.achievements = extracted_data.get("achievements", [])
-        student.goals = extracted_data.get("goals", "")
-        student.skills = extracted_data.get("skills", [])
-        student.education = extracted_data.get("education", [])
-        student.work_experience = extracted_data.get("work_experience", [])
-        student.certifications = extracted_data.get("certifications", [])
-        student.languages = extracted_data.get("languages", [])
-        student.awards = extracted_data.get("awards", [])
-
-        # Update metadata
-        student.extraction_confidence = extracted_data.get("extraction_confidence", 0.5)
-        student.last_extracted_at = datetime.utcnow()
-        student.profile_source = 'ai_extracted'
+        if source != "profile":
+            ai_extractor.apply_to_profile(student, extracted_data)
 
         db.commit()
         db.refresh(student)
@@ -150,18 +263,7 @@ async def extract_profile_from_resume(
         return {
             "success": True,
             "message": "Profile extracted successfully",
-            "data": {
-                "student_id": student_id,
-                "name": student.name,
-                "email": student.email,
-                "gpa": float(student.gpa) if student.gpa else None,
-                "skills": student.skills,
-                "education": student.education,
-                "work_experience": student.work_experience,
-                "activities": student.activities,
-                "achievements": student.achievements,
-                "extraction_confidence": float(student.extraction_confidence) if student.extraction_confidence else 0
-            }
+            "data": extraction_summary(student, extracted_data, source)
         }
 
     except HTTPException:
@@ -222,6 +324,57 @@ async def get_profile(
         raise HTTPException(status_code=500, detail=f"Failed to get profile: {str(e)}")
 
 
+@router.get("/profiles/{student_id}/matches")
+async def get_matching_scholarships(
+    student_id: int,
+    limit: int = 10,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Rank scholarship personas for a student profile
+
+    The student's trait vector is computed locally; the dot product with
+    persona weights, ordering and limit all run in the database.
+
+    Args:
+        student_id: Student profile ID
+        limit: Number of matches to return
+        db: Database session
+
+    Returns:
+        Student trait vector and top matching personas
+    """
+    try:
+        student = db.query(StudentProfile).filter(StudentProfile.id == student_id).first()
+        if not student:
+            raise HTTPException(status_code=404, detail="Student profile not found")
+
+        vector = persona_matcher.student_vector({
+            "goals": student.goals,
+            "activities": student.activities,
+            "achievements": student.achievements,
+            "skills": student.skills,
+            "awards": student.awards,
+            "work_experience": student.work_experience
+        })
+        matches = persona_matcher.top_personas(db, vector, limit=max(1, min(limit, 100)))
+
+        return {
+            "success": True,
+            "data": {
+                "student_id": student_id,
+                "trait_vector": {t: round(v, 3) for t, v in vector.items()},
+                "matches": matches
+            }
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error matching scholarships: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to match scholarships: {str(e)}")
+
+
 @router.put("/profiles/{student_id}")
 async def update_profile(
     student_id: int,
@@ -300,17 +453,20 @@ async def delete_resume(
         if not student:
             raise HTTPException(status_code=404, detail="Student profile not found")
 
-        # Delete physical file if exists
-        if student.resume_file_path:
+        # Legacy per-student files are removed inline; content-addressed blobs
+        # may be shared and are collected by the blob sweeper once unreferenced
+        if student.resume_file_path and not student.resume_sha256:
             full_path = str(file_service.UPLOAD_DIR / student.resume_file_path)
             file_service.delete_file(full_path)
 
         # Clear resume fields
         student.resume_filename = None
         student.resume_file_path = None
+        student.resume_sha256 = None
         student.raw_resume_text = None
 
         db.commit()
+        blob_sweeper.request_sweep()
 
         return {
             "success": True,
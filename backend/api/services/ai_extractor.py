@@ -2,122 +2,403 @@
 AI Extractor Service
 Uses Claude API to extract structured profile data from resume text
 """
-import json
-from typing import Dict, Any, Optional, List
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 import logging
 from api.services.claude_service import claude_service
+from api.services.local_extractor import local_extractor, LocalExtraction
+from api.services.section_segmenter import section_segmenter
 
 logger = logging.getLogger(__name__)
 
+# Bump when prompts or merge rules change so memoized extractions are redone
+EXTRACTOR_VERSION = 1
+
+# JSON schema line(s) per profile field, in prompt order
+FIELD_SCHEMAS = {
+    "name": '    "name": "string"',
+    "email": '    "email": "string or null"',
+    "phone": '    "phone": "string or null"',
+    "gpa": '    "gpa": float or null',
+    "activities": '    "activities": ["activity1", "activity2"]',
+    "achievements": '    "achievements": ["achievement1", "achievement2"]',
+    "goals": '    "goals": "string describing career goals or objectives"',
+    "skills": '    "skills": ["skill1", "skill2", "skill3"]',
+    "education": """    "education": [
+        {
+            "school": "string",
+            "degree": "string",
+            "field": "string",
+            "graduation_year": "string or null",
+            "gpa": float or null
+        }
+    ]""",
+    "work_experience": """    "work_experience": [
+        {
+            "company": "string",
+            "role": "string",
+            "duration": "string",
+            "description": "string",
+            "key_achievements": ["achievement1", "achievement2"]
+        }
+    ]""",
+    "certifications": '    "certifications": ["cert1", "cert2"]',
+    "languages": '    "languages": ["English (Native)", "Spanish (Fluent)"]',
+    "awards": '    "awards": ["award1", "award2"]',
+}
+PROFILE_FIELDS = list(FIELD_SCHEMAS)
+
+# Field-specific extraction rules, added when the field is requested
+FIELD_RULES = {
+    "gpa": "- For GPA, extract only if explicitly mentioned (0.0-4.0 scale)",
+    "activities": "- For activities, include clubs, organizations, volunteer work",
+    "achievements": "- For achievements, include quantifiable accomplishments",
+    "skills": "- For skills, include both technical and soft skills",
+    "goals": "- Goals can be extracted from objective, summary, or career goals sections",
+}
+
+# Sub-prompts for sectioned extraction. Each gets only the resume sections it
+# needs ("sections" from the segmenter, plus "other" headings by their first
+# word), cut to max_chars at a line break, and returns only its own fields.
+EXTRACTION_GROUPS = {
+    "profile": {
+        "title": "contact, education and summary sections",
+        "sections": ["contact", "education", "summary"],
+        "other": [],
+        "fields": ["name", "email", "phone", "gpa", "goals", "education"],
+        "max_tokens": 768,
+        "max_chars": 3000,
+    },
+    "experience": {
+        "title": "experience and activities sections",
+        "sections": ["experience"],
+        "other": ["activities", "leadership", "volunteer", "volunteering", "projects", "research", "publications"],
+        "fields": ["work_experience", "activities", "achievements"],
+        "max_tokens": 1536,
+        "max_chars": 8000,
+    },
+    "skills": {
+        "title": "skills, certifications and awards sections",
+        "sections": ["skills", "achievements"],
+        "other": ["certifications", "languages", "interests"],
+        "fields": ["skills", "certifications", "languages", "awards"],
+        "max_tokens": 768,
+        "max_chars": 3000,
+    },
+}
+# Below this many recognised section headings the resume is sent whole
+MIN_SECTIONS = 2
+# Shorter resumes go in one prompt: three sets of instructions would cost
+# more input tokens than the section budgets save
+SECTIONED_MIN_CHARS = int(os.getenv("RESUME_SECTIONED_MIN_CHARS", "12000"))
+# Overall confidence cap when some fields could only be filled locally
+DEGRADED_CONFIDENCE = 0.5
+
+
 class AIExtractor:
     """Service for AI-powered data extraction from resumes"""
 
+    # "sectioned": segment locally and send each section group to its own
+    # smaller prompt, concurrently; "full": one prompt with the whole resume
+    MODE = os.getenv("RESUME_EXTRACTION_MODE", "sectioned")
+    # Run the local extractor first and ask Claude only for fields it could
+    # not fill with at least LOCAL_CONFIDENCE
+    LOCAL_FIRST = os.getenv("RESUME_LOCAL_FIRST", "true").lower() == "true"
+    LOCAL_CONFIDENCE = float(os.getenv("RESUME_LOCAL_CONFIDENCE", "0.8"))
+
     def __init__(self):
         self.claude = claude_service
+        self._section_groups = {}
+        for group, spec in EXTRACTION_GROUPS.items():
+            for name in spec["sections"]:
+                self._section_groups[name] = group
+        self._other_groups = {
+            heading: group for group, spec in EXTRACTION_GROUPS.items() for heading in spec["other"]
+        }
 
-    def extract_profile_from_resume(self, resume_text: str) -> Dict[str, Any]:
+    @property
+    def version(self) -> str:
+        """Identifies everything that shapes extraction output (memoization key)"""
+        local = f"local{self.LOCAL_CONFIDENCE}" if self.LOCAL_FIRST else "llm"
+        return f"v{EXTRACTOR_VERSION}:{self.MODE}:{local}:{self.claude.route('resume_extraction').model}"[:64]
+
+    def extract_profile_from_resume(
+        self,
+        resume_text: str,
+        mode: Optional[str] = None,
+        local_first: Optional[bool] = None
+    ) -> Dict[str, Any]:
         """
         Extract structured profile data from resume text using Claude
 
         Args:
             resume_text: Plain text from resume
+            mode: "sectioned" or "full" (defaults to MODE)
+            local_first: Fill confident fields locally first (defaults to LOCAL_FIRST)
 
         Returns:
-            Dictionary with extracted profile data
+            Dictionary with extracted profile data. Local-first results also
+            carry "local_confidence" (per field) and "llm_fields" (fields
+            Claude was asked for); "degraded" is set when some or all fields
+            came from the local fallback because Claude failed.
         """
         if not resume_text:
             return self._empty_profile()
 
-        prompt = f"""You are analyzing a resume to extract structured information.
+        local = None
+        fields = PROFILE_FIELDS
+        if self.LOCAL_FIRST if local_first is None else local_first:
+            local = local_extractor.extract(resume_text)
+            fields = [field for field in PROFILE_FIELDS if local.confidence[field] < self.LOCAL_CONFIDENCE]
+            if not fields:
+                logger.info("All profile fields found locally, skipping Claude")
+                return self._merge(local, {}, fields)
+
+        try:
+            # Call Claude API
+            if not self.claude.client:
+                logger.warning("Claude API not available, using mock extraction")
+                return self._mock_extraction(resume_text)
+
+            mode = mode or self.MODE
+            if mode == "sectioned" and len(resume_text) >= SECTIONED_MIN_CHARS:
+                groups = self.group_sections(resume_text, fields)
+                if groups is not None:
+                    response, failed = self._extract_sectioned(groups, fields)
+                    return self._merge(local, response, fields, failed)
+
+            if local is None:
+                prompt = self._build_prompt("a resume", "Resume Text", resume_text, fields, with_confidence=True)
+                result = self._validate_extracted_data(self._request_json(prompt, max_tokens=2048))
+                logger.info(f"Successfully extracted profile with confidence: {result.get('extraction_confidence', 0)}")
+                return result
+
+            prompt = self._build_prompt("a resume", "Resume Text", resume_text, fields)
+            return self._merge(local, self._request_json(prompt, max_tokens=2048), fields)
+
+        except Exception as e:
+            logger.error(f"Error in AI extraction: {str(e)}")
+            return self._fallback_extraction(resume_text)
+
+    def _build_prompt(
+        self,
+        subject: str,
+        label: str,
+        text: str,
+        fields: List[str],
+        with_confidence: bool = False
+    ) -> str:
+        """Extraction prompt asking only for `fields`"""
+        schema = [FIELD_SCHEMAS[field] for field in fields]
+        rules = [FIELD_RULES[field] for field in fields if field in FIELD_RULES]
+        if with_confidence:
+            schema.append('    "extraction_confidence": float between 0.0 and 1.0')
+            rules.append(
+                "- Calculate extraction_confidence based on how much data was found "
+                "(0.0=no data, 1.0=all fields filled)"
+            )
+        schema_text = ",\n".join(schema)
+        rules_text = "\n".join(rules)
+        return f"""You are analyzing {subject} to extract structured information.
 Extract all relevant information and return JSON ONLY with this exact structure:
 {{
-    "name": "string",
-    "email": "string or null",
-    "phone": "string or null",
-    "gpa": float or null,
-    "activities": ["activity1", "activity2"],
-    "achievements": ["achievement1", "achievement2"],
-    "goals": "string describing career goals or objectives",
-    "skills": ["skill1", "skill2", "skill3"],
-    "education": [
-        {{
-            "school": "string",
-            "degree": "string",
-            "field": "string",
-            "graduation_year": "string or null",
-            "gpa": float or null
-        }}
-    ],
-    "work_experience": [
-        {{
-            "company": "string",
-            "role": "string",
-            "duration": "string",
-            "description": "string",
-            "key_achievements": ["achievement1", "achievement2"]
-        }}
-    ],
-    "certifications": ["cert1", "cert2"],
-    "languages": ["English (Native)", "Spanish (Fluent)"],
-    "awards": ["award1", "award2"],
-    "extraction_confidence": float between 0.0 and 1.0
+{schema_text}
 }}
 
 Important extraction rules:
 - Extract actual data from the resume, don't make up information
 - If a field is not found, use null or empty array
-- For GPA, extract only if explicitly mentioned (0.0-4.0 scale)
-- For activities, include clubs, organizations, volunteer work
-- For achievements, include quantifiable accomplishments
-- For skills, include both technical and soft skills
-- Calculate extraction_confidence based on how much data was found (0.0=no data, 1.0=all fields filled)
-- Goals can be extracted from objective, summary, or career goals sections
+{rules_text}
 
-Resume Text:
-{resume_text}
+{label}:
+{text}
 
 Return ONLY valid JSON, no markdown or commentary."""
 
-        try:
-            # Call Claude API
-            if not self.claude.client:
-                logger.warning("Claude API not available, using mock extraction")
-                return self._mock_extraction(resume_text)
+    def _merge(
+        self,
+        local: Optional[LocalExtraction],
+        response: Dict[str, Any],
+        fields: List[str],
+        failed: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Combine local fields with Claude's answers for the requested fields
 
-            message = self.claude.client.messages.create(
-                model=self.claude.model,
-                max_tokens=2048,
-                temperature=0.3,  # Lower temperature for more consistent extraction
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            )
+        Args:
+            local: Local extraction (None when Claude was asked for everything)
+            response: Parsed Claude output
+            fields: Fields Claude was asked for
+            failed: Requested fields Claude did not return (sub-prompt failed)
 
-            # Extract JSON from response
-            response_text = message.content[0].text
+        Returns:
+            Validated profile data
+        """
+        data = dict(local.data) if local is not None else {}
+        data.update({field: response[field] for field in fields if field in response})
+        result = self._validate_extracted_data(data)
+
+        result["extraction_confidence"] = self.calculate_confidence(result)
+        if failed:
+            result["extraction_confidence"] = min(result["extraction_confidence"], DEGRADED_CONFIDENCE)
+            result["degraded"] = True
+        if local is not None:
+            result["local_confidence"] = dict(local.confidence)
+            result["llm_fields"] = [field for field in fields if not failed or field not in failed]
+
+        logger.info(
+            f"Extracted profile ({len(fields)} fields from Claude) with confidence: {result['extraction_confidence']}"
+        )
+        return result
 
-            # Clean response - remove any markdown
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0]
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0]
+    def group_sections(self, resume_text: str, fields: List[str] = PROFILE_FIELDS) -> Optional[Dict[str, str]]:
+        """
+        Split a resume into the text each sub-prompt needs
 
-            # Parse JSON
-            result = json.loads(response_text.strip())
+        Args:
+            resume_text: Plain text from resume (line breaks preserved)
+            fields: Fields to extract; groups needing none of them are left out
 
-            # Validate and clean result
-            result = self._validate_extracted_data(result)
+        Returns:
+            Group name -> section text (groups without text omitted), or None
+            if too few section headings were found to trust the split
+        """
+        spans = section_segmenter.labelled(resume_text)
+        if sum(label in self._section_groups for label, _, _ in spans) < MIN_SECTIONS:
+            return None
+
+        wanted = {group for group, spec in EXTRACTION_GROUPS.items() if set(spec["fields"]) & set(fields)}
+        parts: Dict[str, List[str]] = {group: [] for group in EXTRACTION_GROUPS}
+        # The preamble before the first heading holds name and contact details
+        preamble = resume_text[:spans[0][1]].strip()
+        if preamble:
+            parts["profile"].append(preamble)
+        for label, start, end in spans:
+            group = self._section_groups.get(label) or self._other_groups.get(label)
+            # Headings no group asks for (references, hobbies) are not sent
+            if group is not None:
+                parts[group].append(resume_text[start:end].strip())
+
+        groups = {}
+        for group, chunks in parts.items():
+            if not chunks or group not in wanted:
+                continue
+            text = "\n".join(chunks)
+            max_chars = EXTRACTION_GROUPS[group]["max_chars"]
+            if len(text) > max_chars:
+                cut = text.rfind("\n", 0, max_chars)
+                text = text[:cut if cut > 0 else max_chars]
+            groups[group] = text
+        return groups
+
+    def _extract_sectioned(
+        self,
+        groups: Dict[str, str],
+        fields: List[str] = PROFILE_FIELDS
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Run one sub-prompt per section group concurrently
 
-            logger.info(f"Successfully extracted profile with confidence: {result.get('extraction_confidence', 0)}")
-            return result
+        Args:
+            groups: Group name -> section text (from group_sections)
+            fields: Fields to ask for
 
-        except Exception as e:
-            logger.error(f"Error in AI extraction: {str(e)}")
-            return self._fallback_extraction(resume_text)
+        Returns:
+            (merged responses, fields of groups whose request failed)
+
+        Raises:
+            RuntimeError if every sub-prompt failed
+        """
+        if not groups:
+            return {}, []
+        requested = {
+            group: [field for field in EXTRACTION_GROUPS[group]["fields"] if field in fields]
+            for group in groups
+        }
+        with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+            futures = {
+                group: executor.submit(
+                    self._request_json,
+                    self._build_prompt(
+                        f"the {EXTRACTION_GROUPS[group]['title']} of a resume",
+                        "Resume Sections",
+                        text,
+                        requested[group]
+                    ),
+                    EXTRACTION_GROUPS[group]["max_tokens"]
+                )
+                for group, text in groups.items()
+            }
+
+            merged: Dict[str, Any] = {}
+            failed: List[str] = []
+            for group, future in futures.items():
+                try:
+                    response = future.result()
+                except Exception as e:
+                    logger.error(f"Extraction sub-prompt '{group}' failed: {str(e)}")
+                    failed.extend(requested[group])
+                    continue
+                merged.update({field: response[field] for field in requested[group] if field in response})
+
+        if len(failed) == sum(map(len, requested.values())):
+            raise RuntimeError("all extraction sub-prompts failed")
+        return merged, failed
+
+    def _request_json(self, prompt: str, max_tokens: int) -> Dict[str, Any]:
+        """
+        Send one extraction prompt and parse the JSON reply
+
+        Args:
+            prompt: Prompt text
+            max_tokens: Output token limit
+
+        Returns:
+            Parsed JSON object
+        """
+        # Route (model, temperature), deadline and circuit breaker apply; an
+        # open circuit raises at once
+        response_text = self.claude.complete(
+            "resume_extraction",
+            prompt,
+            max_tokens=max_tokens
+        )
+        return self.claude.parse_json(response_text)
+
+    def apply_to_profile(self, student: Any, extracted_data: Dict[str, Any]) -> None:
+        """
+        Copy extracted fields onto a StudentProfile (caller commits)
+
+        Args:
+            student: StudentProfile row
+            extracted_data: Output of extract_profile_from_resume
+        """
+        if extracted_data.get("name"):
+            student.name = extracted_data["name"]
+        if extracted_data.get("email"):
+            student.email = extracted_data["email"]
+        if extracted_data.get("phone"):
+            student.phone = extracted_data["phone"]
+        if extracted_data.get("gpa") is not None:
+            student.gpa = extracted_data["gpa"]
+
+        # Update JSON fields
+        student.activities = extracted_data.get("activities", [])
+        student.achievements = extracted_data.get("achievements", [])
+        student.goals = extracted_data.get("goals", "")
+        student.skills = extracted_data.get("skills", [])
+        student.education = extracted_data.get("education", [])
+        student.work_experience = extracted_data.get("work_experience", [])
+        student.certifications = extracted_data.get("certifications", [])
+        student.languages = extracted_data.get("languages", [])
+        student.awards = extracted_data.get("awards", [])
+
+        # Update metadata
+        student.extraction_confidence = extracted_data.get("extraction_confidence", 0.5)
+        student.last_extracted_at = datetime.utcnow()
+        student.profile_source = 'ai_extracted'
 
     def _validate_extracted_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -180,7 +461,7 @@ Return ONLY valid JSON, no markdown or commentary."""
 
     def _fallback_extraction(self, resume_text: str) -> Dict[str, Any]:
         """
-        Fallback extraction using regex patterns when AI fails
+        Fallback extraction using local rules when AI fails
 
         Args:
             resume_text: Resume text
@@ -188,44 +469,11 @@ Return ONLY valid JSON, no markdown or commentary."""
         Returns:
             Basic extracted data
         """
-        from api.services.pdf_parser import pdf_parser
-
-        result = self._empty_profile()
-
-        # Try to extract basic information
-        email = pdf_parser.extract_email(resume_text)
-        if email:
-            result["email"] = email
-
-        phone = pdf_parser.extract_phone(resume_text)
-        if phone:
-            result["phone"] = phone
-
-        gpa = pdf_parser.extract_gpa(resume_text)
-        if gpa:
-            result["gpa"] = gpa
-
-        # Extract name (usually at the beginning)
-        lines = resume_text.split('\n')
-        if lines:
-            # First non-empty line is often the name
-            for line in lines[:5]:
-                line = line.strip()
-                if line and len(line) < 50 and not any(char in line for char in ['@', '|', '•']):
-                    result["name"] = line
-                    break
-
-        # Look for skills section
-        skills_keywords = ["Python", "Java", "JavaScript", "React", "SQL", "Machine Learning",
-                          "Leadership", "Communication", "Problem Solving", "Teamwork"]
-        found_skills = []
-        text_lower = resume_text.lower()
-        for skill in skills_keywords:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
-        result["skills"] = found_skills[:10]  # Limit to 10 skills
+        # Same rules the local-first pass uses, without per-field thresholds
+        result = self._validate_extracted_data(local_extractor.extract(resume_text).data)
 
         result["extraction_confidence"] = 0.3  # Low confidence for fallback
+        result["degraded"] = True
 
         return result
 
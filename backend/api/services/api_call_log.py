@@ -0,0 +1,184 @@
+"""
+API Call Log Service
+Records every Claude call (prompt type, model, latency, tokens, status) in
+api_logs and summarizes them per route.
+
+Rows are queued by the calling thread and written in batches by a background
+thread with its own session, so logging adds no database round trip to a
+call. A failed write is logged and its batch dropped; telemetry never fails
+a call.
+"""
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import logging
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from config.database import SessionLocal
+from db.models.api_log import APILog
+
+logger = logging.getLogger(__name__)
+
+
+class APICallLog:
+    """Batched, best-effort writer of APILog rows"""
+
+    ENABLED = os.getenv("CLAUDE_API_LOG", "true").lower() == "true"
+    FLUSH_INTERVAL = float(os.getenv("CLAUDE_API_LOG_FLUSH_SECONDS", "2.0"))
+    BATCH_SIZE = 50
+    # Rows waiting to be written; beyond this new rows are dropped (and counted)
+    MAX_PENDING = 1000
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=self.MAX_PENDING)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0
+
+    def record(
+        self,
+        prompt_type: str,
+        model: str,
+        endpoint: str,
+        latency_ms: int,
+        status: str,
+        input_tokens: Optional[int] = None,
+        output_tokens: Optional[int] = None,
+        request_payload: Optional[Dict[str, Any]] = None,
+        error_message: Optional[str] = None
+    ) -> None:
+        """
+        Queue one call for writing
+
+        Args:
+            prompt_type: Prompt name (the route)
+            model: Model the call went to
+            endpoint: Upstream endpoint ("messages.create" or "messages.stream")
+            latency_ms: Wall time of the call
+            status: "success", "error", "timeout" or "cancelled"
+            input_tokens: Billed input tokens (None if unknown)
+            output_tokens: Billed output tokens (None if unknown)
+            request_payload: Call parameters worth keeping (not the prompt)
+            error_message: Error text for failed calls
+        """
+        if not self.ENABLED:
+            return
+        tokens_used = None
+        if input_tokens is not None or output_tokens is not None:
+            tokens_used = (input_tokens or 0) + (output_tokens or 0)
+        row = {
+            "endpoint": endpoint,
+            "prompt_type": prompt_type,
+            "model": model,
+            "request_payload": request_payload,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "tokens_used": tokens_used,
+            "latency_ms": latency_ms,
+            "status": status,
+            "error_message": error_message[:1000] if error_message else None
+        }
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _ensure_writer(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="api-call-log", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            rows = [self._queue.get()]
+            # Let a batch build up unless a full one is already waiting
+            if self._queue.qsize() < self.BATCH_SIZE - 1:
+                time.sleep(self.FLUSH_INTERVAL)
+            rows.extend(self._drain(self.BATCH_SIZE - 1))
+            self._write(rows)
+
+    def _drain(self, limit: int) -> List[Dict[str, Any]]:
+        rows = []
+        while len(rows) < limit:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def flush(self) -> None:
+        """Write every queued row now (called at exit; scripts may call it too)"""
+        while True:
+            rows = self._drain(self.BATCH_SIZE)
+            if not rows:
+                return
+            self._write(rows)
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        db = self.session_factory()
+        try:
+            db.add_all([APILog(**row) for row in rows])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Dropped {len(rows)} API log rows: {str(e)}")
+        finally:
+            db.close()
+
+    @staticmethod
+    def summary(db: Session, hours: float = 24.0) -> List[Dict[str, Any]]:
+        """
+        Per-route call counts, latency and tokens over a recent window
+
+        Args:
+            db: Database session
+            hours: Window length
+
+        Returns:
+            One entry per (prompt_type, model), busiest first
+        """
+        since = datetime.utcnow() - timedelta(hours=hours)
+        rows = (
+            db.query(
+                APILog.prompt_type,
+                APILog.model,
+                func.count(APILog.id),
+                func.avg(APILog.latency_ms),
+                func.max(APILog.latency_ms),
+                func.sum(APILog.input_tokens),
+                func.sum(APILog.output_tokens),
+                func.sum(case((APILog.status != "success", 1), else_=0))
+            )
+            .filter(APILog.created_at >= since)
+            .group_by(APILog.prompt_type, APILog.model)
+            .order_by(func.count(APILog.id).desc())
+            .all()
+        )
+        return [
+            {
+                "prompt_type": prompt_type,
+                "model": model,
+                "calls": calls,
+                "avg_latency_ms": round(float(avg_latency)) if avg_latency is not None else None,
+                "max_latency_ms": max_latency,
+                "input_tokens": int(input_tokens or 0),
+                "output_tokens": int(output_tokens or 0),
+                "failed": int(failed or 0)
+            }
+            for prompt_type, model, calls, avg_latency, max_latency, input_tokens, output_tokens, failed in rows
+        ]
+
+
+# Singleton instance
+api_call_log = APICallLog()
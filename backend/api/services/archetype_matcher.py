@@ -0,0 +1,153 @@
+"""
+Archetype Matcher Service
+Tags essays with their closest WinnerEssayCluster archetype - no LLM call.
+All centroids live in one normalized matrix that is reloaded when the table changes;
+the idf comes from the same database state as the centroids.
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+import logging
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from api.services.text_vectorizer import HashedTfidfVectorizer
+from db.models.winner_cluster import WinnerClusterVectorizer, WinnerEssayCluster
+
+logger = logging.getLogger(__name__)
+
+
+class ArchetypeMatcher:
+    """Cosine nearest-centroid lookup against the winner essay clusters"""
+
+    # How often (seconds) to check whether the cluster table changed
+    REFRESH_INTERVAL = float(os.getenv("ARCHETYPE_REFRESH_SECONDS", "30"))
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fingerprint: Optional[Tuple[Any, ...]] = None
+        self._checked_at = 0.0
+        # Swapped as one tuple so readers never see a half-loaded state
+        self._state: Optional[Tuple[HashedTfidfVectorizer, np.ndarray, np.ndarray, List[Dict[str, Any]]]] = None
+
+    @staticmethod
+    def _table_fingerprint(db: Session) -> Tuple[Any, ...]:
+        count, last_updated, total_essays = db.query(
+            func.count(WinnerEssayCluster.id),
+            func.max(WinnerEssayCluster.updated_at),
+            func.sum(WinnerEssayCluster.essay_count)
+        ).one()
+        idf_updated = db.query(WinnerClusterVectorizer.updated_at).filter(WinnerClusterVectorizer.id == 1).scalar()
+        return count, last_updated, total_essays, idf_updated
+
+    @staticmethod
+    def _load_vectorizer(db: Session, n_features: int) -> HashedTfidfVectorizer:
+        state = db.query(WinnerClusterVectorizer).filter(WinnerClusterVectorizer.id == 1).first()
+        if state is not None:
+            if state.n_features == n_features:
+                vectorizer = HashedTfidfVectorizer(n_features=state.n_features, signed=bool(state.signed))
+                vectorizer.doc_freq = np.frombuffer(state.doc_freq, dtype=np.int64).copy()
+                vectorizer.n_docs = state.n_docs
+                return vectorizer
+            logger.warning(f"Stored cluster vectorizer has {state.n_features} features, expected {n_features}")
+        # No idf available: plain sublinear TF still ranks archetypes sensibly
+        return HashedTfidfVectorizer(n_features=n_features)
+
+    def load(self, db: Session) -> int:
+        """
+        Load every cluster centroid into one matrix
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of archetypes loaded
+        """
+        fingerprint = self._table_fingerprint(db)
+        clusters = db.query(WinnerEssayCluster).filter(
+            WinnerEssayCluster.centroid.isnot(None)
+        ).order_by(WinnerEssayCluster.cluster_id).all()
+
+        vectors = [np.frombuffer(c.centroid, dtype=np.float32) for c in clusters]
+        dims = {len(v) for v in vectors}
+        if len(dims) > 1:
+            logger.error(f"Winner clusters have mixed centroid sizes {sorted(dims)}; archetype tagging disabled")
+            vectors, clusters = [], []
+        vectorizer = self._load_vectorizer(db, len(vectors[0])) if vectors else None
+
+        with self._lock:
+            self._fingerprint = fingerprint
+            self._checked_at = time.monotonic()
+            if not vectors:
+                self._state = None
+                return 0
+
+            matrix = np.vstack(vectors)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            # Transposed (n_features, k) so a sparse essay is one row gather + matmul
+            centroids_t = np.ascontiguousarray((matrix / norms).T)
+            meta = [{"cluster_id": c.cluster_id, "archetype_name": c.archetype_name} for c in clusters]
+            self._state = (vectorizer, vectorizer.idf, centroids_t, meta)
+
+        logger.info(f"Loaded {len(meta)} winner essay archetypes")
+        return len(meta)
+
+    def refresh_if_changed(self, db: Session) -> None:
+        """
+        Reload centroids if the cluster table changed (checked at most every REFRESH_INTERVAL)
+
+        Args:
+            db: Database session
+        """
+        if time.monotonic() - self._checked_at < self.REFRESH_INTERVAL:
+            return
+        try:
+            fingerprint = self._table_fingerprint(db)
+            if fingerprint != self._fingerprint:
+                self.load(db)
+            else:
+                self._checked_at = time.monotonic()
+        except Exception as e:
+            # Don't leave the caller's session in a failed transaction
+            db.rollback()
+            logger.error(f"Failed to refresh archetypes: {e}")
+            self._checked_at = time.monotonic()
+
+    def match(self, essay: Union[str, List[Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Closest archetype for an essay
+
+        Args:
+            essay: Essay text, list of paragraph strings, or list of
+                {"paragraph": ...} dicts as produced by generate_essay
+
+        Returns:
+            {"cluster_id", "archetype_name", "similarity"} or None if no clusters are loaded
+        """
+        state = self._state
+        if state is None:
+            return None
+        vectorizer, idf, centroids_t, meta = state
+
+        if isinstance(essay, list):
+            essay = "\n".join(p.get("paragraph", "") if isinstance(p, dict) else str(p) for p in essay)
+
+        indices, values = vectorizer.transform_sparse(essay, idf)
+        if len(indices) == 0:
+            return None
+
+        similarities = values @ centroids_t[indices]
+        best = int(similarities.argmax())
+        return {
+            "cluster_id": meta[best]["cluster_id"],
+            "archetype_name": meta[best]["archetype_name"],
+            "similarity": round(float(similarities[best]), 3)
+        }
+
+
+# Singleton instance
+archetype_matcher = ArchetypeMatcher()
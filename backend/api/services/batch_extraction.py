@@ -0,0 +1,286 @@
+"""
+Batch Extraction Service
+Runs resume extraction over many student profiles: pending profiles are read
+with keyset pagination, extractions run on a bounded thread pool, and results
+are committed in batches. Identical resume texts are extracted once and the
+shared extraction cache is consulted first.
+
+Progress survives interruption: every committed profile has last_extracted_at
+set, so a rerun only sees what is still pending. Only a full extraction marks
+the profile current (extraction_text_sha256); degraded results (Claude down,
+local fields only) are applied but leave the profile pending for the next run.
+"""
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import logging
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from config.database import SessionLocal
+from db.models.student_profile import StudentProfile
+from api.services.ai_extractor import ai_extractor
+from api.services.extraction_cache import extraction_cache, text_hash
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchProgress:
+    """Counters for one batch run"""
+    job_id: str
+    status: str = "pending"  # pending, running, completed, failed
+    total: int = 0  # Profiles selected (upper bound when a limit applies)
+    processed: int = 0  # Profiles committed
+    extracted: int = 0  # Extractor calls made
+    reused: int = 0  # Profiles filled from the cache or a duplicate resume
+    failed: int = 0  # Profiles whose extraction raised
+    degraded: int = 0  # Profiles given a degraded (local-only) result; still pending
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        elapsed = ((self.finished_at or time.time()) - self.started_at) if self.started_at else 0.0
+        data["elapsed_seconds"] = round(elapsed, 1)
+        data["profiles_per_second"] = round(self.processed / elapsed, 2) if elapsed > 0 else 0.0
+        remaining = max(self.total - self.processed - self.failed, 0)
+        rate = data["profiles_per_second"]
+        data["eta_seconds"] = round(remaining / rate) if rate and self.status == "running" else None
+        return data
+
+
+class BatchExtractor:
+    """Bounded-concurrency extraction over pending or given student profiles"""
+
+    # Concurrent extractor calls
+    CONCURRENCY = int(os.getenv("EXTRACT_BATCH_CONCURRENCY", "4"))
+    MAX_CONCURRENCY = int(os.getenv("EXTRACT_BATCH_MAX_CONCURRENCY", "16"))
+    # Profiles per page read and per commit
+    BATCH_SIZE = int(os.getenv("EXTRACT_BATCH_SIZE", "50"))
+
+    def __init__(self):
+        self._jobs: Dict[str, BatchProgress] = {}
+        self._lock = threading.Lock()
+        self._active: Optional[str] = None
+
+    @staticmethod
+    def _pending(db: Session):
+        return db.query(StudentProfile.id, StudentProfile.raw_resume_text).filter(
+            StudentProfile.raw_resume_text.isnot(None),
+            # Never extracted, or only degraded results (see extraction_cache.mark_current)
+            or_(StudentProfile.last_extracted_at.is_(None), StudentProfile.extraction_text_sha256.is_(None))
+        )
+
+    def count_pending(self, db: Session) -> int:
+        """Profiles with resume text and no full extraction of it"""
+        return self._pending(db).count()
+
+    def iter_pending(self, db: Session, page_size: int) -> Iterator[List[Tuple[int, str]]]:
+        """
+        Pages of (id, raw_resume_text) for pending profiles, by ascending id
+
+        Keyset pagination (id > last seen id): each page is an index range
+        scan, and rows committed meanwhile cannot shift later pages.
+        """
+        last_id = 0
+        while True:
+            page = self._pending(db).filter(StudentProfile.id > last_id).order_by(
+                StudentProfile.id
+            ).limit(page_size).all()
+            if not page:
+                return
+            yield page
+            last_id = page[-1][0]
+
+    @staticmethod
+    def iter_ids(db: Session, student_ids: List[int], page_size: int) -> Iterator[List[Tuple[int, str]]]:
+        """Pages of (id, raw_resume_text) for the given profiles"""
+        student_ids = sorted(set(student_ids))
+        for start in range(0, len(student_ids), page_size):
+            yield db.query(StudentProfile.id, StudentProfile.raw_resume_text).filter(
+                StudentProfile.id.in_(student_ids[start:start + page_size]),
+                StudentProfile.raw_resume_text.isnot(None)
+            ).order_by(StudentProfile.id).all()
+
+    def run(
+        self,
+        student_ids: Optional[List[int]] = None,
+        limit: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        progress: Optional[BatchProgress] = None,
+        on_progress: Optional[Callable[[BatchProgress], None]] = None
+    ) -> BatchProgress:
+        """
+        Extract profiles and commit results in batches (blocking)
+
+        Args:
+            student_ids: Profiles to extract (default: every pending profile)
+            limit: Stop after selecting this many profiles
+            concurrency: Concurrent extractor calls
+            batch_size: Profiles per page and per commit
+            progress: Counters to update (a new BatchProgress if omitted)
+            on_progress: Called after every completed extraction and commit
+
+        Returns:
+            Final BatchProgress
+        """
+        concurrency = max(1, min(concurrency or self.CONCURRENCY, self.MAX_CONCURRENCY))
+        batch_size = max(1, batch_size or self.BATCH_SIZE)
+        progress = progress or BatchProgress(job_id=uuid.uuid4().hex)
+        notify = on_progress or (lambda _: None)
+        version = ai_extractor.version
+
+        db = SessionLocal()
+        progress.status = "running"
+        progress.started_at = time.time()
+        try:
+            if student_ids is not None:
+                progress.total = len(set(student_ids))
+                pages = self.iter_ids(db, student_ids, batch_size)
+            else:
+                progress.total = self.count_pending(db)
+                pages = self.iter_pending(db, batch_size)
+            if limit is not None:
+                progress.total = min(progress.total, limit)
+
+            waiting: Dict[str, List[int]] = {}  # digest -> profiles awaiting its result
+            ready: Dict[str, Dict[str, Any]] = {}  # digest -> result not yet committed
+            in_flight: Dict[Future, str] = {}
+            fresh = set()  # digests in `ready` that were extracted (not reused) this run
+
+            def commit() -> None:
+                if not ready:
+                    return
+                ids = {student_id: digest for digest in ready for student_id in waiting[digest]}
+                for student in db.query(StudentProfile).filter(StudentProfile.id.in_(list(ids))):
+                    result = ready[ids[student.id]]
+                    ai_extractor.apply_to_profile(student, result)
+                    if result.get("degraded"):
+                        # Leave it pending so a run after the outage redoes it
+                        student.extraction_text_sha256 = None
+                        progress.degraded += 1
+                    else:
+                        extraction_cache.mark_current(student, ids[student.id], version)
+                db.commit()
+                for digest in ready:
+                    progress.reused += len(waiting.pop(digest)) - (digest in fresh)
+                    fresh.discard(digest)
+                progress.processed += len(ids)
+                ready.clear()
+                notify(progress)
+
+            def collect(block: bool) -> None:
+                done, _ = wait(list(in_flight), timeout=None if block else 0, return_when=FIRST_COMPLETED)
+                for future in done:
+                    digest = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Extraction failed for students {waiting[digest]}: {e}")
+                        progress.failed += len(waiting.pop(digest))
+                        continue
+                    progress.extracted += 1
+                    fresh.add(digest)
+                    extraction_cache.put(db, digest, version, result)
+                    ready[digest] = result
+                    notify(progress)
+
+            selected = 0
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                for page in pages:
+                    if limit is not None:
+                        page = page[:limit - selected]
+                    selected += len(page)
+
+                    new: Dict[str, str] = {}
+                    for student_id, text in page:
+                        digest = text_hash(text)
+                        if digest in waiting:
+                            # Same text already queued: share its result
+                            waiting[digest].append(student_id)
+                            continue
+                        waiting[digest] = [student_id]
+                        new[digest] = text
+
+                    cached = extraction_cache.get_many(db, new, version)
+                    ready.update(cached)
+
+                    for digest, text in new.items():
+                        if digest in cached:
+                            continue
+                        # Bounded queue: the pool never holds more than 2x its size
+                        while len(in_flight) >= concurrency * 2:
+                            collect(block=True)
+                        in_flight[executor.submit(ai_extractor.extract_profile_from_resume, text)] = digest
+
+                    collect(block=False)
+                    if len(ready) >= batch_size:
+                        commit()
+                    if limit is not None and selected >= limit:
+                        break
+
+                while in_flight:
+                    collect(block=True)
+                    if len(ready) >= batch_size:
+                        commit()
+            commit()
+            progress.status = "completed"
+        except Exception as e:
+            db.rollback()
+            progress.status = "failed"
+            progress.error = str(e)
+            logger.error(f"Batch extraction {progress.job_id} failed: {e}")
+        finally:
+            progress.finished_at = time.time()
+            db.close()
+            notify(progress)
+
+        logger.info(f"Batch extraction {progress.job_id} {progress.status}: {progress.to_dict()}")
+        return progress
+
+    def start(
+        self,
+        limit: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ) -> BatchProgress:
+        """
+        Start a background run over pending profiles
+
+        Returns:
+            The new job's BatchProgress
+
+        Raises:
+            RuntimeError if a batch job is already running
+        """
+        with self._lock:
+            if self._active is not None and self._jobs[self._active].status in ("pending", "running"):
+                raise RuntimeError(f"Batch extraction {self._active} is already running")
+            progress = BatchProgress(job_id=uuid.uuid4().hex)
+            self._jobs[progress.job_id] = progress
+            self._active = progress.job_id
+
+        thread = threading.Thread(
+            target=self.run,
+            kwargs={"limit": limit, "concurrency": concurrency, "batch_size": batch_size, "progress": progress},
+            name=f"batch-extract-{progress.job_id[:8]}",
+            daemon=True
+        )
+        thread.start()
+        return progress
+
+    def get(self, job_id: str) -> Optional[BatchProgress]:
+        """Progress of a job started in this process"""
+        return self._jobs.get(job_id)
+
+
+# Singleton instance
+batch_extractor = BatchExtractor()
@@ -0,0 +1,143 @@
+"""
+Blob Sweeper Service
+Background task that deletes resume blobs no profile references any more.
+Runs off the request path, at a bounded delete rate, and only touches blobs
+older than a grace period so in-flight uploads are never collected.
+"""
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional, Set
+import logging
+
+from config.database import SessionLocal
+from db.models.student_profile import StudentProfile
+from api.services.file_service import file_service
+
+logger = logging.getLogger(__name__)
+
+
+class BlobSweeper:
+    """Periodic orphan collection for content-addressed uploads"""
+
+    # Seconds between sweeps
+    INTERVAL = float(os.getenv("BLOB_SWEEP_INTERVAL_SECONDS", "600"))
+    # Blobs and temp files younger than this are never deleted
+    GRACE_SECONDS = float(os.getenv("BLOB_SWEEP_GRACE_SECONDS", "3600"))
+    # Upper bound on unlinks per second
+    MAX_DELETES_PER_SECOND = float(os.getenv("BLOB_SWEEP_DELETES_PER_SECOND", "20"))
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.last_sweep: Dict[str, Any] = {}
+
+    @staticmethod
+    def referenced_digests() -> Set[str]:
+        """Content hashes referenced by any student profile"""
+        db = SessionLocal()
+        try:
+            rows = db.query(StudentProfile.resume_sha256).filter(
+                StudentProfile.resume_sha256.isnot(None)
+            ).distinct().all()
+            return {row[0] for row in rows}
+        finally:
+            db.close()
+
+    def _find_orphans(self, referenced: Set[str]) -> list:
+        cutoff = time.time() - self.GRACE_SECONDS
+        orphans = []
+        candidates = [path for digest, path in file_service.iter_blobs() if digest not in referenced]
+        candidates.extend(file_service.TMP_DIR.glob("*.part"))
+        for path in candidates:
+            try:
+                if path.stat().st_mtime < cutoff:
+                    orphans.append(path)
+            except FileNotFoundError:
+                continue
+        return orphans
+
+    def _delete_if_stale(self, path) -> int:
+        # Re-check age right before unlinking: a duplicate upload may have just
+        # refreshed the blob's mtime and is about to reference it
+        try:
+            stat = path.stat()
+            if stat.st_mtime >= time.time() - self.GRACE_SECONDS:
+                return 0
+            path.unlink()
+            return stat.st_size
+        except FileNotFoundError:
+            return 0
+
+    async def sweep_once(self) -> Dict[str, Any]:
+        """
+        Delete unreferenced blobs and abandoned temp files
+
+        Returns:
+            {"scanned_orphans", "deleted", "bytes_freed", "seconds"}
+        """
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+
+        referenced = await loop.run_in_executor(None, self.referenced_digests)
+        orphans = await loop.run_in_executor(None, self._find_orphans, referenced)
+
+        deleted = 0
+        bytes_freed = 0
+        delay = 1.0 / self.MAX_DELETES_PER_SECOND if self.MAX_DELETES_PER_SECOND > 0 else 0.0
+        for path in orphans:
+            freed = await loop.run_in_executor(None, self._delete_if_stale, path)
+            if freed:
+                deleted += 1
+                bytes_freed += freed
+            if delay:
+                await asyncio.sleep(delay)
+
+        self.last_sweep = {
+            "scanned_orphans": len(orphans),
+            "deleted": deleted,
+            "bytes_freed": bytes_freed,
+            "seconds": round(time.monotonic() - started, 2)
+        }
+        if deleted:
+            logger.info(f"Blob sweep removed {deleted} files ({bytes_freed / 1024:.0f}KB)")
+        return self.last_sweep
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.sweep_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Blob sweep failed: {e}")
+
+    def start(self) -> None:
+        """Start the background sweep loop (call from a running event loop)"""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._loop())
+
+    def request_sweep(self) -> None:
+        """Ask for a sweep soon instead of waiting for the next interval"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def stop(self) -> None:
+        """Cancel the background sweep loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Singleton instance
+blob_sweeper = BlobSweeper()
@@ -0,0 +1,140 @@
+"""
+Circuit Breaker Service
+Stops calling an upstream that is failing or slow, so requests fall back to
+local results at once instead of each waiting out a timeout.
+
+Closed: calls pass, outcomes go into a sliding window. When the window has
+enough calls and the error rate or slow-call rate reaches its threshold the
+circuit opens. Open: calls are refused for OPEN_SECONDS. Half-open: one probe
+call is let through; success closes the circuit, failure opens it again.
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the circuit is open"""
+
+
+class CircuitBreaker:
+    """Error-rate and slow-call-rate circuit breaker over a sliding window of calls"""
+
+    WINDOW = int(os.getenv("CLAUDE_BREAKER_WINDOW", "20"))
+    MIN_CALLS = int(os.getenv("CLAUDE_BREAKER_MIN_CALLS", "10"))
+    ERROR_RATE = float(os.getenv("CLAUDE_BREAKER_ERROR_RATE", "0.5"))
+    SLOW_RATE = float(os.getenv("CLAUDE_BREAKER_SLOW_RATE", "0.5"))
+    OPEN_SECONDS = float(os.getenv("CLAUDE_BREAKER_OPEN_SECONDS", "30"))
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=self.WINDOW)  # (success, slow)
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._counters = dict.fromkeys(("calls", "failures", "slow_calls", "rejected", "opened"), 0)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        Whether a call may go upstream now (a True in half-open state is the probe)
+
+        Returns:
+            False if the circuit is open
+        """
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.OPEN_SECONDS:
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._counters["rejected"] += 1
+            return False
+
+    def record(self, success: bool, slow: bool = False) -> None:
+        """
+        Record the outcome of an allowed call
+
+        Args:
+            success: The call returned a response
+            slow: The call took longer than its slow-call threshold
+        """
+        with self._lock:
+            self._counters["calls"] += 1
+            self._counters["failures"] += not success
+            self._counters["slow_calls"] += slow
+
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+                if success and not slow:
+                    logger.info(f"Circuit '{self.name}' closed after a successful probe")
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open("probe failed")
+                return
+
+            self._outcomes.append((success, slow))
+            if self._state != CLOSED or len(self._outcomes) < self.MIN_CALLS:
+                return
+            n = len(self._outcomes)
+            error_rate = sum(not ok for ok, _ in self._outcomes) / n
+            slow_rate = sum(is_slow for _, is_slow in self._outcomes) / n
+            if error_rate >= self.ERROR_RATE:
+                self._open(f"error rate {error_rate:.0%}")
+            elif slow_rate >= self.SLOW_RATE:
+                self._open(f"slow-call rate {slow_rate:.0%}")
+
+    def release(self) -> None:
+        """Forget an allowed call that ended without an outcome (cancelled by its caller)"""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def _open(self, reason: str) -> None:
+        # Caller holds the lock
+        logger.warning(f"Circuit '{self.name}' opened ({reason}) for {self.OPEN_SECONDS:.0f}s")
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self._counters["opened"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Current state and counters
+
+        Returns:
+            state, seconds until a probe is allowed (when open) and call counters
+        """
+        with self._lock:
+            retry_in = None
+            if self._state == OPEN:
+                retry_in = round(max(self.OPEN_SECONDS - (time.monotonic() - self._opened_at), 0.0), 1)
+            return {
+                "name": self.name,
+                "state": self._state,
+                "retry_in_seconds": retry_in,
+                "window_calls": len(self._outcomes),
+                **self._counters
+            }
+
+
+# Singleton instance (the Claude API)
+claude_breaker = CircuitBreaker("claude")
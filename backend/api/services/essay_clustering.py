@@ -0,0 +1,462 @@
+"""
+Essay Clustering Service
+Mini-batch spherical k-means over sparse hashed TF-IDF vectors of winner essays.
+Produces the archetypes stored in WinnerEssayCluster.
+"""
+import heapq
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from api.services.text_vectorizer import HashedTfidfVectorizer
+from api.services.trait_scorer import TRAITS, trait_scorer
+from db.models.winner_cluster import WinnerClusterVectorizer, WinnerEssayCluster
+
+logger = logging.getLogger(__name__)
+
+ARCHETYPE_NAMES = {
+    "Academics": "The Scholar",
+    "Leadership": "The Leader",
+    "Community": "The Community Builder",
+    "Innovation": "The Innovator",
+    "FinancialNeed": "The Resilient Striver",
+    "Research": "The Researcher",
+}
+
+
+def iter_corpus(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream essays from disk without loading the corpus into memory
+
+    Accepts either a JSONL file ({"text": ..., optional "traits": {...}} per
+    line) or a directory of .txt files, one essay per file.
+
+    Args:
+        path: Corpus file or directory
+
+    Yields:
+        Essay records with at least a "text" key
+    """
+    path = Path(path)
+    if path.is_dir():
+        for txt_file in sorted(path.glob("*.txt")):
+            yield {"text": txt_file.read_text(encoding="utf-8", errors="ignore")}
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping malformed corpus line {line_number}")
+                continue
+            if record.get("text"):
+                yield record
+
+
+def iter_batches(records: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Group a record stream into lists of at most batch_size"""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class SparseBatch:
+    """CSR-style batch of L2-normalized sparse vectors"""
+
+    def __init__(self, rows: List[Tuple[np.ndarray, np.ndarray]]):
+        lengths = [len(indices) for indices, _ in rows]
+        self.indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.indptr[1:])
+        self.indices = np.concatenate([r[0] for r in rows]) if rows else np.zeros(0, dtype=np.int64)
+        self.data = np.concatenate([r[1] for r in rows]) if rows else np.zeros(0, dtype=np.float32)
+        # Row number of every stored value
+        self.row_of = np.repeat(np.arange(len(rows)), lengths)
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def dot(self, dense: np.ndarray) -> np.ndarray:
+        """
+        Similarities against dense row vectors
+
+        Args:
+            dense: Matrix of shape (k, n_features)
+
+        Returns:
+            Matrix of shape (len(self), k)
+        """
+        products = dense[:, self.indices] * self.data  # (k, nnz)
+        return np.add.reduceat(products, self.indptr[:-1], axis=1).T
+
+
+class EssayClusterer:
+    """
+    Incremental clustering of winner essays
+
+    State (document frequencies, centroids, per-cluster counts, trait sums and
+    sample essays) round-trips through a single .npz file, so new winners can
+    be folded in with partial_fit() long after the initial fit.
+    """
+
+    N_SAMPLES = 3
+    SAMPLE_CHARS = 2000
+
+    def __init__(self, n_clusters: int = 8, n_features: int = 2 ** 15, seed: int = 42):
+        self.n_clusters = n_clusters
+        self.vectorizer = HashedTfidfVectorizer(n_features=n_features)
+        self.centroids: Optional[np.ndarray] = None  # (k, n_features), running means
+        self.counts = np.zeros(n_clusters, dtype=np.int64)
+        self.trait_sums = np.zeros((n_clusters, len(TRAITS)), dtype=np.float64)
+        # Per cluster: min-heap of (similarity, text) for the most typical essays
+        self.samples: List[List[Tuple[float, str]]] = [[] for _ in range(n_clusters)]
+        self.rng = np.random.default_rng(seed)
+
+    # ------------------------------------------------------------------
+    # Fitting
+    # ------------------------------------------------------------------
+
+    def fit_idf(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        First streaming pass: document frequencies only
+
+        Args:
+            records: Essay records
+
+        Returns:
+            Number of essays counted
+        """
+        before = self.vectorizer.n_docs
+        self.vectorizer.partial_fit(record["text"] for record in records)
+        return self.vectorizer.n_docs - before
+
+    def _vectorize(self, batch: List[Dict[str, Any]], idf: np.ndarray) -> Tuple[SparseBatch, List[int]]:
+        rows = []
+        kept = []
+        for i, record in enumerate(batch):
+            indices, values = self.vectorizer.transform_sparse(record["text"], idf)
+            if len(indices):
+                rows.append((indices, values))
+                kept.append(i)
+        return SparseBatch(rows), kept
+
+    def _seed_centroids(self, vectors: SparseBatch) -> None:
+        """
+        k-means++ seeding of every empty centroid from a batch
+
+        On the first batch this seeds all k centroids. If that batch had
+        fewer distinct essays than clusters, later batches seed the rest,
+        continuing from the centroids that already exist.
+        """
+        if self.centroids is None:
+            self.centroids = np.zeros((self.n_clusters, self.vectorizer.n_features), dtype=np.float32)
+        seeded = self.centroids.any(axis=1)
+        empty = np.flatnonzero(~seeded)
+        if not len(empty):
+            return
+        n = len(vectors)
+
+        def densify(row: int) -> np.ndarray:
+            start, end = vectors.indptr[row], vectors.indptr[row + 1]
+            dense = np.zeros(self.vectorizer.n_features, dtype=np.float32)
+            dense[vectors.indices[start:end]] = vectors.data[start:end]
+            return dense
+
+        best_sim = vectors.dot(self._normalized_centroids()[seeded]).max(axis=1) if seeded.any() else None
+        for c in empty:
+            if best_sim is None:
+                row = int(self.rng.integers(n))
+            else:
+                distance = np.clip(1.0 - best_sim, 0.0, None) ** 2
+                total = distance.sum()
+                if total <= 0:
+                    # Every essay in the batch already has its centroid
+                    break
+                row = int(self.rng.choice(n, p=distance / total))
+            self.centroids[c] = densify(row)
+            similarity = vectors.dot(self.centroids[c:c + 1])[:, 0]
+            best_sim = similarity if best_sim is None else np.maximum(best_sim, similarity)
+
+    def _normalized_centroids(self) -> np.ndarray:
+        norms = np.linalg.norm(self.centroids, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return self.centroids / norms
+
+    def partial_fit(self, batch: List[Dict[str, Any]], update_idf: bool = True) -> np.ndarray:
+        """
+        One mini-batch k-means step
+
+        Each centroid moves to the running mean of every essay ever assigned
+        to it (per-center learning rate 1/count), applied per cluster in one
+        vectorized update instead of one essay at a time.
+
+        Args:
+            batch: Essay records
+            update_idf: Also count the batch into document frequencies
+                (needed when folding in new winners after the initial fit)
+
+        Returns:
+            Cluster assignment per record (-1 for essays with no tokens)
+        """
+        if update_idf:
+            self.vectorizer.partial_fit(record["text"] for record in batch)
+
+        vectors, kept = self._vectorize(batch, self.vectorizer.idf)
+        assignments = np.full(len(batch), -1, dtype=np.int64)
+        if len(vectors) == 0:
+            return assignments
+
+        # Seeds all centroids on the first batch, and any still empty later
+        # (when earlier batches had fewer essays than clusters)
+        self._seed_centroids(vectors)
+
+        similarities = vectors.dot(self._normalized_centroids())
+        # Clusters still empty (corpus smaller than k so far) must not win
+        similarities[:, ~self.centroids.any(axis=1)] = -np.inf
+        labels = similarities.argmax(axis=1)
+        best = similarities[np.arange(len(labels)), labels]
+        assignments[kept] = labels
+
+        label_of_value = labels[vectors.row_of]
+        for cluster in np.unique(labels):
+            members = labels == cluster
+            new_count = self.counts[cluster] + members.sum()
+            mask = label_of_value == cluster
+            added = np.bincount(
+                vectors.indices[mask],
+                weights=vectors.data[mask],
+                minlength=self.vectorizer.n_features
+            )
+            self.centroids[cluster] *= self.counts[cluster] / new_count
+            self.centroids[cluster] += (added / new_count).astype(np.float32)
+            self.counts[cluster] = new_count
+
+        for row, cluster, similarity in zip(kept, labels, best):
+            record = batch[row]
+            traits = record.get("traits") or trait_scorer.score(record["text"])
+            self.trait_sums[cluster] += [float(traits.get(t, 0.0)) for t in TRAITS]
+
+            sample = (float(similarity), record["text"][:self.SAMPLE_CHARS])
+            heap = self.samples[cluster]
+            if len(heap) < self.N_SAMPLES:
+                heapq.heappush(heap, sample)
+            elif sample[0] > heap[0][0]:
+                heapq.heapreplace(heap, sample)
+
+        return assignments
+
+    def fit_stream(self, corpus_path: Path, batch_size: int = 1024) -> Dict[str, float]:
+        """
+        Two streaming passes over a corpus on disk: idf, then clustering
+
+        Args:
+            corpus_path: JSONL file or directory of .txt essays
+            batch_size: Essays per mini-batch
+
+        Returns:
+            Essay count per pass
+        """
+        n_idf = self.fit_idf(iter_corpus(corpus_path))
+        n_clustered = 0
+        for batch in iter_batches(iter_corpus(corpus_path), batch_size):
+            self.partial_fit(batch, update_idf=False)
+            n_clustered += len(batch)
+        return {"idf_essays": n_idf, "clustered_essays": n_clustered}
+
+    def predict(self, texts: List[str]) -> np.ndarray:
+        """Nearest cluster per text (-1 for texts with no tokens)"""
+        vectors, kept = self._vectorize([{"text": t} for t in texts], self.vectorizer.idf)
+        labels = np.full(len(texts), -1, dtype=np.int64)
+        if len(vectors) and self.centroids is not None:
+            labels[kept] = vectors.dot(self._normalized_centroids()).argmax(axis=1)
+        return labels
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+
+    def top_keywords(self, cluster: int, n: int = 10) -> List[str]:
+        """Terms with the heaviest centroid weight in a cluster"""
+        if self.centroids is None:
+            return []
+        keywords = []
+        for bucket in np.argsort(-self.centroids[cluster]):
+            if self.centroids[cluster, bucket] <= 0:
+                break
+            term = self.vectorizer.bucket_terms.get(int(bucket))
+            if term:
+                keywords.append(term)
+                if len(keywords) >= n:
+                    break
+        return keywords
+
+    def trait_weights(self, cluster: int) -> Dict[str, float]:
+        """Average trait distribution of the essays in a cluster"""
+        total = self.trait_sums[cluster].sum()
+        if total == 0:
+            return dict.fromkeys(TRAITS, 0.0)
+        return {t: round(float(v / total), 3) for t, v in zip(TRAITS, self.trait_sums[cluster])}
+
+    def cluster_rows(self) -> List[Dict[str, Any]]:
+        """
+        Cluster summaries shaped like WinnerEssayCluster columns
+
+        Returns:
+            One dict per non-empty cluster
+        """
+        rows = []
+        used_names = set()
+        normalized = self._normalized_centroids() if self.centroids is not None else None
+
+        for cluster in range(self.n_clusters):
+            if self.counts[cluster] == 0:
+                continue
+
+            weights = self.trait_weights(cluster)
+            keywords = self.top_keywords(cluster)
+            ranked = sorted(weights, key=weights.get, reverse=True)
+            name = ARCHETYPE_NAMES[ranked[0]]
+            if name in used_names and keywords:
+                name = f"{name} ({keywords[0]})"
+            used_names.add(name)
+
+            rows.append({
+                "cluster_id": cluster,
+                "archetype_name": name[:100],
+                "style_summary": (
+                    f"Essays emphasizing {ranked[0]} and {ranked[1]}; "
+                    f"recurring themes: {', '.join(keywords[:5])}."
+                ),
+                "weights": weights,
+                "keywords": keywords,
+                "sample_essays": [text for _, text in sorted(self.samples[cluster], reverse=True)],
+                "centroid": normalized[cluster].astype(np.float32).tobytes(),
+                "essay_count": int(self.counts[cluster]),
+            })
+        return rows
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: Path) -> None:
+        """
+        Persist the full clustering state
+
+        Args:
+            path: Target .npz path (vectorizer state goes next to it)
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.vectorizer.save(vectorizer_path(path))
+
+        sample_meta = [[[sim, text] for sim, text in heap] for heap in self.samples]
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                centroids=self.centroids if self.centroids is not None else np.zeros((0, 0), dtype=np.float32),
+                counts=self.counts,
+                trait_sums=self.trait_sums,
+                samples=np.array(json.dumps(sample_meta)),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "EssayClusterer":
+        """Restore a clusterer saved with save()"""
+        path = Path(path)
+        vectorizer = HashedTfidfVectorizer.load(vectorizer_path(path))
+        with np.load(path) as data:
+            counts = data["counts"]
+            clusterer = cls(n_clusters=len(counts), n_features=vectorizer.n_features)
+            clusterer.vectorizer = vectorizer
+            clusterer.counts = counts.astype(np.int64)
+            clusterer.trait_sums = data["trait_sums"]
+            if data["centroids"].size:
+                clusterer.centroids = data["centroids"].astype(np.float32)
+            clusterer.samples = [
+                [(float(sim), text) for sim, text in heap]
+                for heap in json.loads(str(data["samples"]))
+            ]
+            for heap in clusterer.samples:
+                heapq.heapify(heap)
+        return clusterer
+
+
+def vectorizer_path(state_path: Path) -> Path:
+    """Where the vectorizer state for a clustering state file lives"""
+    state_path = Path(state_path)
+    return state_path.with_name(f"{state_path.stem}_idf.npz")
+
+
+def upsert_clusters(
+    db: Session,
+    rows: List[Dict[str, Any]],
+    vectorizer: Optional[HashedTfidfVectorizer] = None
+) -> int:
+    """
+    Replace the WinnerEssayCluster rows in one transaction
+
+    Clusters missing from `rows` (a refit with fewer clusters) are deleted:
+    their centroids belong to the previous vocabulary and idf.
+
+    Args:
+        db: Database session
+        rows: Output of EssayClusterer.cluster_rows()
+        vectorizer: Vectorizer the centroids were built with; its document
+            frequencies are stored alongside so matching uses the same idf
+
+    Returns:
+        Number of rows written
+    """
+    if not rows:
+        return 0
+
+    cluster_ids = [row["cluster_id"] for row in rows]
+    stale = db.query(WinnerEssayCluster).filter(
+        WinnerEssayCluster.cluster_id.notin_(cluster_ids)
+    ).delete(synchronize_session=False)
+    if stale:
+        logger.info(f"Deleting {stale} winner essay clusters not in the new fit")
+
+    existing = {
+        cluster.cluster_id: cluster
+        for cluster in db.query(WinnerEssayCluster).filter(
+            WinnerEssayCluster.cluster_id.in_(cluster_ids)
+        )
+    }
+
+    for row in rows:
+        cluster = existing.get(row["cluster_id"])
+        if cluster is None:
+            db.add(WinnerEssayCluster(**row))
+        else:
+            for field, value in row.items():
+                setattr(cluster, field, value)
+
+    if vectorizer is not None:
+        state = db.query(WinnerClusterVectorizer).filter(WinnerClusterVectorizer.id == 1).first()
+        if state is None:
+            state = WinnerClusterVectorizer(id=1)
+            db.add(state)
+        state.n_features = vectorizer.n_features
+        state.n_docs = vectorizer.n_docs
+        state.signed = vectorizer.signed
+        state.doc_freq = vectorizer.doc_freq.astype(np.int64).tobytes()
+
+    db.commit()
+    return len(rows)
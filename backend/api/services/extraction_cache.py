@@ -0,0 +1,183 @@
+"""
+Extraction Cache Service
+Memoizes resume extraction by normalized text hash and extractor version.
+
+A profile remembers the hash and version its extraction was made from, so
+re-extracting an unchanged resume is a no-op. Results are also stored in the
+shared extraction_results table, so identical resumes on different profiles
+(re-uploads, bulk imports) are extracted once.
+"""
+import hashlib
+import unicodedata
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+import logging
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from db.models.extraction_result import ExtractionResult
+from api.services.ai_extractor import ai_extractor
+
+logger = logging.getLogger(__name__)
+
+# Keys of an extraction result that are not worth storing
+TRANSIENT_KEYS = ("degraded",)
+
+
+def normalize_resume_text(text: str) -> str:
+    """Unicode-normalized text with all whitespace runs collapsed to one space"""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 of the normalized resume text"""
+    return hashlib.sha256(normalize_resume_text(text).encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """Shared extraction results keyed by (normalized text hash, extractor version)"""
+
+    def get(self, db: Session, text_sha256: str, version: str) -> Optional[Dict[str, Any]]:
+        """
+        Stored extraction for a resume text
+
+        Args:
+            db: Database session
+            text_sha256: text_hash of the resume
+            version: Extractor version
+
+        Returns:
+            Extraction result, or None on a miss
+        """
+        row = db.query(ExtractionResult).filter(
+            ExtractionResult.text_sha256 == text_sha256,
+            ExtractionResult.extractor_version == version
+        ).first()
+        if row is None:
+            return None
+        row.hit_count = (row.hit_count or 0) + 1
+        row.last_used_at = datetime.utcnow()
+        return row.result
+
+    def get_many(self, db: Session, text_hashes: Iterable[str], version: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Stored extractions for several resume texts in one query
+
+        Returns:
+            text hash -> extraction result, for hits only
+        """
+        hashes = set(text_hashes)
+        if not hashes:
+            return {}
+        hits = {}
+        for row in db.query(ExtractionResult).filter(
+            ExtractionResult.text_sha256.in_(hashes),
+            ExtractionResult.extractor_version == version
+        ):
+            row.hit_count = (row.hit_count or 0) + 1
+            row.last_used_at = datetime.utcnow()
+            hits[row.text_sha256] = row.result
+        return hits
+
+    def put(self, db: Session, text_sha256: str, version: str, result: Dict[str, Any]) -> None:
+        """
+        Store or replace an extraction (caller commits); degraded results are not stored
+
+        Args:
+            db: Database session
+            text_sha256: text_hash of the resume
+            version: Extractor version
+            result: extract_profile_from_resume output
+        """
+        if result.get("degraded"):
+            return
+        stored = {key: value for key, value in result.items() if key not in TRANSIENT_KEYS}
+        row = db.query(ExtractionResult).filter(
+            ExtractionResult.text_sha256 == text_sha256,
+            ExtractionResult.extractor_version == version
+        ).first()
+        if row is not None:
+            # Forced re-extraction replaces the shared result
+            row.result = stored
+            return
+        try:
+            # Savepoint: a concurrent request may store the same text first
+            with db.begin_nested():
+                db.add(ExtractionResult(
+                    text_sha256=text_sha256,
+                    extractor_version=version,
+                    result=stored,
+                    hit_count=0
+                ))
+        except IntegrityError:
+            logger.info(f"Extraction for {text_sha256[:12]} already stored")
+
+    def extract_for_profile(self, db: Session, student: Any, force: bool = False) -> Tuple[Dict[str, Any], str]:
+        """
+        Extract a profile's resume, reusing earlier work where possible
+
+        Args:
+            db: Database session
+            student: StudentProfile with raw_resume_text
+            force: Ignore memoized results and call the extractor
+
+        Returns:
+            (extraction result, source) where source is "profile" (the
+            profile's stored extraction is current - nothing to apply),
+            "cache" (shared result from an identical resume) or "extracted"
+        """
+        digest = text_hash(student.raw_resume_text)
+        version = ai_extractor.version
+
+        if not force:
+            memoized = self.lookup(db, student, digest, version)
+            if memoized is not None:
+                return memoized
+
+        result = ai_extractor.extract_profile_from_resume(student.raw_resume_text)
+        self.put(db, digest, version, result)
+        if not result.get("degraded"):
+            self.mark_current(student, digest, version)
+        return result, "extracted"
+
+    def lookup(
+        self,
+        db: Session,
+        student: Any,
+        digest: str,
+        version: str
+    ) -> Optional[Tuple[Dict[str, Any], str]]:
+        """
+        Memoized extraction for a profile's resume text, without extracting
+
+        Args:
+            db: Database session
+            student: StudentProfile
+            digest: text_hash of the resume text
+            version: Extractor version
+
+        Returns:
+            (result, source) as from extract_for_profile, or None if the
+            extractor has to run
+        """
+        if (student.extraction_text_sha256 == digest and student.extractor_version == version
+                and student.last_extracted_at is not None):
+            logger.info(f"Extraction for student {student.id} is current, skipping")
+            return {}, "profile"
+        cached = self.get(db, digest, version)
+        if cached is not None:
+            logger.info(f"Reusing stored extraction {digest[:12]} for student {student.id}")
+            self.mark_current(student, digest, version)
+            return cached, "cache"
+        return None
+
+    @staticmethod
+    def mark_current(student: Any, digest: str, version: str) -> None:
+        """Record which resume text and extractor the profile's extraction came from"""
+        student.extraction_text_sha256 = digest
+        student.extractor_version = version
+
+
+# Singleton instance
+extraction_cache = ExtractionCache()
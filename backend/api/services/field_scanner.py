@@ -0,0 +1,136 @@
+"""
+Field Scanner Service
+Finds email, phone and GPA candidates in one pass over resume text with a
+single precompiled pattern. Every candidate carries its position and a
+confidence score so callers can pick the best one or show alternatives.
+"""
+import re
+from typing import Any, Dict, List, NamedTuple, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FieldCandidate(NamedTuple):
+    """One field match"""
+    field: str  # "email", "phone" or "gpa"
+    value: Any  # str for email/phone, float for gpa
+    start: int
+    end: int
+    confidence: float
+
+
+# One alternation; named groups tell which field matched. The leading
+# lookahead lets the regex engine skip straight to the few characters a field
+# can start with (@, G/g, digits, "(", "+") instead of trying every branch at
+# every position. Emails are matched from the "@" and their local part is
+# recovered by walking back, so they need no letter-triggered branch.
+FIELD_PATTERN = re.compile(
+    r"(?=[@Gg(+0-9])(?:"
+    r"(?P<email>@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)"
+    r"|(?P<gpa_label>(?:[Gg][Pp][Aa]|[Gg]rade\s+[Pp]oint\s+[Aa]verage)[:\s]+"
+    r"(?P<gpa_value>[0-4]\.[0-9]{1,2})(?:\s*/\s*(?P<gpa_scale>[0-9]{1,2}(?:\.[0-9]{1,2})?))?)"
+    r"|(?P<gpa_ratio>(?P<gpa_ratio_value>[0-4]\.[0-9]{1,2})[/\s]+4\.0)"
+    r"|(?P<phone>(?:\+?1[-.\s]?)?(?P<phone_area>\(\d{3}\)|\d{3})(?P<phone_sep>[-.\s]?)\d{3}[-.\s]?\d{4}(?!\d))"
+    r")"
+)
+EMAIL_LOCAL_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._%+-")
+
+# Label words that make a nearby number more likely to be a phone number
+PHONE_LABEL = re.compile(r"(?i)(?:phone|tel|cell|mobile|ph)\.?\s*[:#]?\s*$")
+PHONE_LABEL_WINDOW = 16
+
+EMAIL_CONFIDENCE = 0.95
+GPA_LABELED_CONFIDENCE = 0.95
+GPA_RESCALED_CONFIDENCE = 0.7  # "GPA: 3.2/5.0" converted to the 4.0 scale
+GPA_RATIO_CONFIDENCE = 0.75  # "3.85/4.0" without a GPA label
+PHONE_FORMATTED_CONFIDENCE = 0.85  # (555) 123-4567, 555-123-4567
+PHONE_BARE_CONFIDENCE = 0.5  # 5551234567 could be any ID
+PHONE_LABEL_BONUS = 0.1
+
+
+class FieldScanner:
+    """Single-pass email/phone/GPA extraction with positions and confidence"""
+
+    def scan(self, text: str) -> List[FieldCandidate]:
+        """
+        Every field candidate in text order
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            List of FieldCandidate
+        """
+        candidates = []
+        for match in FIELD_PATTERN.finditer(text):
+            kind = match.lastgroup
+            start, end = match.span()
+            if kind == "email":
+                local_start = start
+                while local_start > 0 and text[local_start - 1] in EMAIL_LOCAL_CHARS:
+                    local_start -= 1
+                if local_start < start:
+                    candidates.append(FieldCandidate("email", text[local_start:end], local_start, end, EMAIL_CONFIDENCE))
+
+            elif kind == "gpa_label":
+                gpa = float(match.group("gpa_value"))
+                confidence = GPA_LABELED_CONFIDENCE
+                scale = match.group("gpa_scale")
+                if scale and float(scale) > 0 and float(scale) != 4.0:
+                    gpa = gpa / float(scale) * 4.0
+                    confidence = GPA_RESCALED_CONFIDENCE
+                if 0 <= gpa <= 4.0:
+                    candidates.append(FieldCandidate("gpa", round(gpa, 2), start, end, confidence))
+
+            elif kind == "gpa_ratio":
+                # Not the tail of a longer number ("13.5 4.0")
+                if start and (text[start - 1].isdigit() or text[start - 1] == "."):
+                    continue
+                gpa = float(match.group("gpa_ratio_value"))
+                if 0 <= gpa <= 4.0:
+                    candidates.append(FieldCandidate("gpa", gpa, start, end, GPA_RATIO_CONFIDENCE))
+
+            else:
+                # Not the tail of a longer number or identifier
+                if start and text[start - 1].isalnum():
+                    continue
+                formatted = match.group("phone_area").startswith("(") or bool(match.group("phone_sep"))
+                confidence = PHONE_FORMATTED_CONFIDENCE if formatted else PHONE_BARE_CONFIDENCE
+                if PHONE_LABEL.search(text, max(0, start - PHONE_LABEL_WINDOW), start):
+                    confidence += PHONE_LABEL_BONUS
+                candidates.append(FieldCandidate("phone", match.group(), start, end, round(confidence, 2)))
+        return candidates
+
+    def best(self, text: str) -> Dict[str, Optional[FieldCandidate]]:
+        """
+        Highest-confidence candidate per field (earliest wins ties)
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            {"email": ..., "phone": ..., "gpa": ...}, None where nothing matched
+        """
+        best: Dict[str, Optional[FieldCandidate]] = {"email": None, "phone": None, "gpa": None}
+        for candidate in self.scan(text):
+            current = best[candidate.field]
+            if current is None or candidate.confidence > current.confidence:
+                best[candidate.field] = candidate
+        return best
+
+    def extract(self, text: str) -> Dict[str, Any]:
+        """
+        Best value per field
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            {"email", "phone", "gpa"} values (None if not found)
+        """
+        return {field: candidate.value if candidate else None for field, candidate in self.best(text).items()}
+
+
+# Singleton instance
+field_scanner = FieldScanner()
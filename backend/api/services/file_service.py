@@ -1,59 +1,157 @@
 """
 File Upload Service
-Handles resume upload, validation, and storage
+Handles resume upload, validation, and storage.
+Resumes are stored once per unique content under uploads/blobs/<aa>/<bb>/<sha256>.pdf;
+profiles reference blobs by hash and unreferenced blobs are removed by the blob sweeper.
 """
 import os
+import hashlib
+import shutil
+import uuid
 import aiofiles
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, NamedTuple, Optional, Tuple
 from fastapi import UploadFile, HTTPException
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+class SavedUpload(NamedTuple):
+    """Result of a streamed upload"""
+    file_path: str  # Absolute path on disk
+    filename: str  # Stored blob path (relative to UPLOAD_DIR)
+    sha256: str  # Hex digest of the file bytes
+    size: int  # Bytes written
+
+
 class FileService:
     """Service for handling file uploads and storage"""
 
     UPLOAD_DIR = Path(__file__).parent.parent.parent / "uploads"
+    BLOB_DIR = UPLOAD_DIR / "blobs"
+    TMP_DIR = UPLOAD_DIR / "tmp"
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
     ALLOWED_EXTENSIONS = {'.pdf', '.PDF'}
+    CHUNK_SIZE = 64 * 1024
+    PDF_MAGIC = b'%PDF-'
 
     def __init__(self):
-        # Create upload directory if it doesn't exist
+        # Create upload directories if they don't exist
         self.UPLOAD_DIR.mkdir(exist_ok=True)
+        self.BLOB_DIR.mkdir(exist_ok=True)
+        self.TMP_DIR.mkdir(exist_ok=True)
+
+    def blob_relpath(self, digest: str) -> str:
+        """Blob path (relative to UPLOAD_DIR) for a content hash"""
+        return f"blobs/{digest[:2]}/{digest[2:4]}/{digest}.pdf"
+
+    def iter_blobs(self) -> Iterator[Tuple[str, Path]]:
+        """Yield (digest, path) for every stored blob"""
+        for path in self.BLOB_DIR.glob("*/*/*.pdf"):
+            yield path.stem, path
 
-    async def save_upload(self, file: UploadFile, student_id: int) -> tuple[str, str]:
+    async def save_upload(self, file: UploadFile, student_id: int) -> SavedUpload:
         """
-        Save uploaded file to disk
+        Stream an uploaded file into content-addressed storage
+
+        Copies fixed-size chunks into a temp file while hashing them, so memory
+        use does not grow with the file. The temp file is then renamed to its
+        content address; if that blob already exists the copy is dropped.
 
         Args:
             file: The uploaded file
             student_id: ID of the student profile
 
         Returns:
-            Tuple of (file_path, filename)
+            SavedUpload with blob path, SHA-256 and size
+
+        Raises:
+            HTTPException if the file is not a PDF or is too large
         """
         # Validate file
         await self.validate_file(file)
 
-        # Create unique filename
-        file_extension = Path(file.filename).suffix
-        safe_filename = f"resume_{student_id}_{file.filename.replace(' ', '_')}"
-        file_path = self.UPLOAD_DIR / safe_filename
+        tmp_path = self.TMP_DIR / f"{uuid.uuid4().hex}.part"
 
-        # Save file asynchronously
+        digest = hashlib.sha256()
+        size = 0
         try:
-            async with aiofiles.open(file_path, 'wb') as f:
-                content = await file.read()
-                await f.write(content)
-
-            logger.info(f"Saved file: {file_path}")
-            return str(file_path), safe_filename
-
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                while True:
+                    chunk = await file.read(self.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    if size == 0 and not chunk.startswith(self.PDF_MAGIC):
+                        raise HTTPException(status_code=400, detail="Invalid file. Not a PDF document")
+                    size += len(chunk)
+                    if size > self.MAX_FILE_SIZE:
+                        raise HTTPException(
+                            status_code=400,
+                            detail=f"File too large. Maximum size is {self.MAX_FILE_SIZE / 1024 / 1024}MB"
+                        )
+                    digest.update(chunk)
+                    await f.write(chunk)
+
+            if size == 0:
+                raise HTTPException(status_code=400, detail="Uploaded file is empty")
+
+            sha256 = digest.hexdigest()
+            relpath = self.blob_relpath(sha256)
+            file_path = self.UPLOAD_DIR / relpath
+            try:
+                # Duplicate content - keep the existing blob, refresh its mtime so
+                # the sweeper's grace period covers this new reference
+                os.utime(file_path)
+                self._discard(tmp_path)
+                logger.info(f"Resume for student {student_id} deduplicated to {relpath}")
+            except FileNotFoundError:
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_path, file_path)
+                logger.info(f"Saved file: {file_path} ({size} bytes)")
+            return SavedUpload(str(file_path), relpath, sha256, size)
+
+        except HTTPException:
+            self._discard(tmp_path)
+            raise
         except Exception as e:
+            self._discard(tmp_path)
             logger.error(f"Failed to save file: {e}")
             raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
 
+    def store_local_file(self, source_path: str, sha256: str) -> str:
+        """
+        Copy a local PDF into content-addressed storage (bulk ingestion)
+
+        Args:
+            source_path: Path of the PDF to store
+            sha256: Hex digest of its bytes
+
+        Returns:
+            Blob path relative to UPLOAD_DIR
+        """
+        relpath = self.blob_relpath(sha256)
+        file_path = self.UPLOAD_DIR / relpath
+        try:
+            # Already stored: refresh mtime so the sweeper's grace period covers it
+            os.utime(file_path)
+        except FileNotFoundError:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.TMP_DIR / f"{uuid.uuid4().hex}.part"
+            try:
+                shutil.copyfile(source_path, tmp_path)
+                os.replace(tmp_path, file_path)
+            finally:
+                self._discard(tmp_path)
+        return relpath
+
+    @staticmethod
+    def _discard(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
     async def validate_file(self, file: UploadFile) -> bool:
         """
         Validate uploaded file
@@ -79,12 +177,10 @@ class FileService:
                 detail=f"Invalid file type. Only PDF files are allowed. Got: {file_extension}"
             )
 
-        # Check file size
-        file.file.seek(0, 2)  # Move to end
-        file_size = file.file.tell()
-        file.file.seek(0)  # Reset to beginning
-
-        if file_size > self.MAX_FILE_SIZE:
+        # Reject early when the client declared the size; save_upload enforces
+        # the limit on the actual bytes while streaming
+        file_size = getattr(file, "size", None)
+        if file_size is not None and file_size > self.MAX_FILE_SIZE:
             raise HTTPException(
                 status_code=400,
                 detail=f"File too large. Maximum size is {self.MAX_FILE_SIZE / 1024 / 1024}MB"
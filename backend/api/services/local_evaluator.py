@@ -0,0 +1,202 @@
+"""
+Local Evaluator Service
+Deterministic essay comparison from trait lexicon hits and paragraph focus tags.
+Same output shape as the Claude evaluation_agent prompt, in milliseconds.
+"""
+from collections import Counter
+from typing import Any, Dict, List, Union
+import logging
+
+from api.services.text_vectorizer import tokenize
+from api.services.trait_scorer import TRAITS, trait_scorer
+
+logger = logging.getLogger(__name__)
+
+Paragraph = Union[str, Dict[str, Any]]
+
+# Marker words for common persona tone descriptors
+TONE_LEXICON: Dict[str, List[str]] = {
+    "ambitious": ["goal", "goals", "aim", "achieve", "achieved", "future", "vision", "drive", "driven", "strive"],
+    "visionary": ["vision", "future", "imagine", "transform", "reimagine", "possibility", "possibilities"],
+    "forward": ["future", "next", "tomorrow", "ahead", "aspire", "pursue", "plan"],
+    "compassionate": ["care", "cared", "empathy", "compassion", "kindness", "listen", "support", "helped"],
+    "empathetic": ["empathy", "understand", "listen", "listened", "feel", "felt", "support"],
+    "warm": ["family", "friends", "together", "grateful", "love", "home", "kindness"],
+    "academic": ["study", "research", "analysis", "theory", "course", "coursework", "learning"],
+    "professional": ["developed", "managed", "delivered", "organized", "results", "responsibility"],
+    "analytical": ["data", "analysis", "analyzed", "measured", "evidence", "results", "percent"],
+    "inspirational": ["inspire", "inspired", "hope", "dream", "believe", "empower", "empowered"],
+    "humble": ["learned", "grateful", "thankful", "mistake", "mistakes", "humbled", "lesson"],
+    "resilient": ["overcame", "despite", "persevered", "persist", "setback", "struggle", "challenge"],
+    "confident": ["led", "built", "created", "launched", "achieved", "proved", "succeeded"],
+    "innovative": ["built", "designed", "created", "invented", "prototype", "new", "novel"],
+    "authentic": ["honest", "myself", "realized", "felt", "genuine", "truth"],
+}
+
+# Blend of lexicon evidence vs the generator's own paragraph focus tag
+LEXICON_WEIGHT = 0.6
+FOCUS_WEIGHT = 0.4
+
+
+class LocalEvaluator:
+    """Scores essays against a persona without calling Claude"""
+
+    def __init__(self):
+        self.tone_markers = {tone: set(words) for tone, words in TONE_LEXICON.items()}
+
+    @staticmethod
+    def paragraph_text(paragraph: Paragraph) -> str:
+        """Text of a paragraph given as a string or a generator dict"""
+        if isinstance(paragraph, dict):
+            return str(paragraph.get("paragraph", ""))
+        return str(paragraph)
+
+    def paragraph_traits(self, paragraph: Paragraph) -> Dict[str, float]:
+        """
+        Trait emphasis of one paragraph (sums to <= 1.0)
+
+        Args:
+            paragraph: Paragraph text, or a dict with paragraph/focus/alignment_score
+
+        Returns:
+            Dictionary of trait -> emphasis
+        """
+        emphasis = trait_scorer.score(self.paragraph_text(paragraph))
+        focus = paragraph.get("focus") if isinstance(paragraph, dict) else None
+        if focus not in TRAITS:
+            return emphasis
+
+        try:
+            focus_strength = float(paragraph.get("alignment_score", 1.0))
+        except (TypeError, ValueError):
+            focus_strength = 1.0
+        focus_strength = max(0.0, min(1.0, focus_strength))
+
+        lexicon_weight = LEXICON_WEIGHT if any(emphasis.values()) else 0.0
+        blended = {t: lexicon_weight * emphasis[t] for t in TRAITS}
+        blended[focus] += (1.0 - lexicon_weight) * focus_strength
+        return blended
+
+    def essay_emphasis(self, paragraphs: List[Paragraph]) -> Dict[str, float]:
+        """Trait distribution of a whole essay (sums to 1.0, or all zeros)"""
+        totals = dict.fromkeys(TRAITS, 0.0)
+        for paragraph in paragraphs:
+            for trait, value in self.paragraph_traits(paragraph).items():
+                totals[trait] += value
+        total = sum(totals.values())
+        if total == 0:
+            return totals
+        return {t: v / total for t, v in totals.items()}
+
+    @staticmethod
+    def trait_alignment(emphasis: Dict[str, float], weights: Dict[str, float]) -> Dict[str, float]:
+        """
+        Per-trait alignment: how much of the persona's desired weight the essay covers
+
+        Traits the persona does not weight report the essay's raw emphasis.
+        """
+        alignment = {}
+        for trait in TRAITS:
+            weight = float(weights.get(trait, 0.0) or 0.0)
+            value = emphasis.get(trait, 0.0)
+            alignment[trait] = round(min(1.0, value / weight) if weight > 0 else value, 2)
+        return alignment
+
+    @staticmethod
+    def overall_alignment(emphasis: Dict[str, float], weights: Dict[str, float]) -> float:
+        """
+        Histogram intersection of essay emphasis and persona weights (0-1)
+        """
+        total_weight = sum(float(weights.get(t, 0.0) or 0.0) for t in TRAITS) or 1.0
+        return sum(min(emphasis.get(t, 0.0), float(weights.get(t, 0.0) or 0.0) / total_weight) for t in TRAITS)
+
+    def tone_consistency(self, persona_tone: str, paragraphs: List[Paragraph]) -> float:
+        """
+        How well and how evenly the essay carries the persona's tone (0-1)
+
+        Combines the share of the persona's tone descriptors that have marker
+        words in the essay with how evenly marker words spread across paragraphs.
+        """
+        descriptors = [t for t in tokenize(persona_tone or "") if t in self.tone_markers]
+        paragraph_tokens = [Counter(tokenize(self.paragraph_text(p))) for p in paragraphs]
+        if not paragraph_tokens:
+            return 0.0
+
+        markers = set().union(*(self.tone_markers[d] for d in descriptors)) if descriptors else \
+            set().union(*self.tone_markers.values())
+        hits = [sum(n for token, n in tokens.items() if token in markers) for tokens in paragraph_tokens]
+
+        # Evenness: share of paragraphs that carry any tone marker
+        evenness = sum(1 for h in hits if h > 0) / len(hits)
+        if not descriptors:
+            return round(evenness, 2)
+
+        essay_tokens = set().union(*paragraph_tokens)
+        covered = sum(1 for d in descriptors if self.tone_markers[d] & essay_tokens) / len(descriptors)
+        return round(0.6 * covered + 0.4 * evenness, 2)
+
+    def compare(
+        self,
+        persona: Dict[str, Any],
+        adaptive_essay: List[Paragraph],
+        baseline_essay: List[Paragraph]
+    ) -> Dict[str, Any]:
+        """
+        Compare adaptive vs baseline essays against a persona
+
+        Args:
+            persona: Dict with persona_name, tone and weights
+            adaptive_essay: Paragraph strings or generator paragraph dicts
+            baseline_essay: Paragraph strings or generator paragraph dicts
+
+        Returns:
+            Evaluation dict in the evaluation_agent shape, plus "scorer": "local"
+        """
+        weights = persona.get("weights") or {}
+        adaptive_emphasis = self.essay_emphasis(adaptive_essay or [])
+        baseline_emphasis = self.essay_emphasis(baseline_essay or [])
+
+        adaptive_overall = self.overall_alignment(adaptive_emphasis, weights)
+        baseline_overall = self.overall_alignment(baseline_emphasis, weights)
+        gain = round(adaptive_overall - baseline_overall, 3)
+
+        trait_alignment = self.trait_alignment(adaptive_emphasis, weights)
+        baseline_alignment = self.trait_alignment(baseline_emphasis, weights)
+
+        top_traits = sorted(weights, key=lambda t: float(weights.get(t) or 0.0), reverse=True)[:2]
+        gaps = sorted(
+            (t for t in TRAITS if float(weights.get(t) or 0.0) > 0),
+            key=lambda t: trait_alignment[t]
+        )
+
+        if gain > 0.02:
+            summary = (
+                f"The adaptive essay aligns {gain:.0%} better with the persona's weights, "
+                f"led by {' and '.join(top_traits)} coverage."
+            )
+            recommendation = "Use the adaptive essay"
+        elif gain < -0.02:
+            summary = f"The baseline essay aligns {-gain:.0%} better with the persona's weights."
+            recommendation = "Revise the adaptive essay"
+        else:
+            summary = "Both essays align with the persona's weights about equally."
+            recommendation = "Strengthen the adaptive essay"
+        if gaps and trait_alignment[gaps[0]] < 0.7:
+            recommendation += f" - add more {gaps[0]} evidence to close the largest gap."
+        else:
+            recommendation += "."
+
+        return {
+            "persona_name": persona.get("persona_name", ""),
+            "trait_alignment": trait_alignment,
+            "baseline_alignment": baseline_alignment,
+            "alignment_gain": gain,
+            "tone_consistency_score": self.tone_consistency(persona.get("tone", ""), adaptive_essay or []),
+            "summary": summary,
+            "recommendation": recommendation,
+            "scorer": "local"
+        }
+
+
+# Singleton instance
+local_evaluator = LocalEvaluator()
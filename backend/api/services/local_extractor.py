@@ -0,0 +1,271 @@
+"""
+Local Extractor Service
+Fills as many profile fields as possible without an LLM call: contact fields
+from the field scanner, list fields from the lines under their headings, and
+a rough education parse. Every field gets a confidence so AIExtractor can ask
+Claude only for what is missing or uncertain.
+
+A field whose section is absent from the resume is returned empty with high
+confidence: there is nothing there for the LLM to find either.
+"""
+import re
+from typing import Any, Dict, List, NamedTuple, Optional
+import logging
+
+from api.services.field_scanner import field_scanner
+from api.services.section_segmenter import section_segmenter, LEADING_CHARS
+from api.services.skill_taxonomy import skill_taxonomy
+
+logger = logging.getLogger(__name__)
+
+
+class LocalExtraction(NamedTuple):
+    """Locally extracted profile with a confidence per field"""
+    data: Dict[str, Any]  # Same shape as AIExtractor._empty_profile
+    confidence: Dict[str, float]  # field -> 0.0-1.0
+
+
+# Heading labels (section name or other heading word) feeding each list field
+LIST_FIELD_LABELS = {
+    "activities": ["activities", "leadership", "volunteer", "volunteering"],
+    "certifications": ["certifications"],
+    "awards": ["achievements"],
+    "languages": ["languages"],
+}
+
+# Spoken languages recognized in "Languages" lists; anything else there (Python,
+# Java) is a programming language and belongs to skills
+SPOKEN_LANGUAGES = {
+    "english", "spanish", "french", "german", "italian", "portuguese", "dutch", "swedish",
+    "norwegian", "danish", "finnish", "polish", "czech", "slovak", "hungarian", "romanian",
+    "greek", "turkish", "russian", "ukrainian", "serbian", "croatian", "bulgarian", "hebrew",
+    "arabic", "persian", "farsi", "urdu", "hindi", "bengali", "punjabi", "gujarati", "marathi",
+    "tamil", "telugu", "kannada", "malayalam", "nepali", "sinhala", "chinese", "mandarin",
+    "cantonese", "japanese", "korean", "vietnamese", "thai", "indonesian", "malay", "tagalog",
+    "filipino", "swahili", "amharic", "yoruba", "igbo", "hausa", "zulu", "somali", "latin",
+    "asl", "sign language", "american sign language", "haitian creole", "catalan", "basque",
+    "irish", "welsh", "icelandic", "lithuanian", "latvian", "estonian", "armenian", "georgian",
+    "khmer", "lao", "burmese", "mongolian", "pashto", "kurdish", "yiddish", "mandarin chinese",
+    "brazilian portuguese",
+}
+# Proficiency notes after a language name: "(Native)", "- fluent", "conversational"
+LANGUAGE_QUALIFIER = re.compile(
+    r"\s*(?:[(\-–:].*|\b(?:native|fluent|bilingual|conversational|basic|intermediate|advanced|"
+    r"proficient|professional|working|elementary|limited)\b.*)$",
+    re.IGNORECASE
+)
+
+SCHOOL_PATTERN = re.compile(r"\b(?:University|College|Institute|School|Academy)\b")
+DEGREE_PATTERN = re.compile(
+    r"\b(?P<degree>B\.?S\.?|B\.?A\.?|M\.?S\.?|M\.?A\.?|MBA|Ph\.?D\.?|Bachelor(?:'s)?(?: of \w+)?|"
+    r"Master(?:'s)?(?: of \w+)?|Associate(?:'s)?|High School Diploma)(?:\s+(?:in\s+)?(?P<field>[A-Z][\w &]+))?"
+)
+YEAR_PATTERN = re.compile(r"\b(?:19|20)\d{2}\b")
+NAME_PATTERN = re.compile(r"^[A-Za-z][A-Za-z.'-]*(?: [A-Za-z][A-Za-z.'-]*){1,3}$")
+ITEM_SPLIT = re.compile(r"\s*[,;|•·]\s*")
+LABEL_PREFIX = re.compile(r"^[A-Za-z ]{2,30}:\s*")
+
+MAX_ITEMS = 25
+MAX_GOALS_CHARS = 500
+
+# Confidence levels
+SECTION_LIST_CONFIDENCE = 0.85  # lines under a matching heading
+ABSENT_CONFIDENCE = 0.85  # no heading for the field, nothing to find
+NAME_CONFIDENCE = 0.85  # first line looks like a personal name
+NAME_GUESS_CONFIDENCE = 0.4
+EDUCATION_CONFIDENCE = 0.6  # school/degree regexes miss too much to skip the LLM
+TAXONOMY_SKILLS_CONFIDENCE = 0.4  # taxonomy skills found anywhere in the text
+SUMMARY_GOALS_CONFIDENCE = 0.8
+MIXED_LANGUAGES_CONFIDENCE = 0.5  # "Languages" list mixing spoken and programming languages
+MISSING_HINTED_CONFIDENCE = 0.5  # field not found but the text mentions it
+
+
+class LocalExtractor:
+    """Rule-based profile extraction with per-field confidence"""
+
+    def extract(self, text: str) -> LocalExtraction:
+        """
+        Extract profile fields locally
+
+        Args:
+            text: Resume text (line breaks preserved)
+
+        Returns:
+            LocalExtraction with data and per-field confidence
+        """
+        data: Dict[str, Any] = {}
+        confidence: Dict[str, float] = {}
+
+        spans = section_segmenter.labelled(text)
+        bodies: Dict[str, List[str]] = {}
+        for label, start, end in spans:
+            # Drop the heading line itself
+            body = text[start:end].split("\n", 1)
+            bodies.setdefault(label, []).append(body[1] if len(body) > 1 else "")
+        preamble = text[:spans[0][1]] if spans else text
+
+        self._contact_fields(text, preamble, data, confidence)
+
+        # Goals from the summary/objective section
+        summary = " ".join(" ".join(bodies.get("summary", [])).split())
+        data["goals"] = summary[:MAX_GOALS_CHARS]
+        if "summary" not in bodies:
+            confidence["goals"] = ABSENT_CONFIDENCE
+        else:
+            confidence["goals"] = SUMMARY_GOALS_CONFIDENCE if summary else 0.0
+
+        # Education entries from the education section
+        if "education" in bodies:
+            data["education"] = self._education(bodies["education"])
+            confidence["education"] = EDUCATION_CONFIDENCE if data["education"] else 0.0
+        else:
+            data["education"] = []
+            confidence["education"] = ABSENT_CONFIDENCE
+
+        # Skills; an inline "Languages: ..." line under a skills heading lists
+        # spoken languages only if every item is one (usually it is "Python, Java")
+        skill_lines, language_lines = [], list(bodies.get("languages", []))
+        for body in bodies.get("skills", []):
+            for line in body.split("\n"):
+                items = self._items([line])
+                if line.strip().lower().startswith("languages") and items and all(map(self._is_spoken_language, items)):
+                    language_lines.append(line)
+                else:
+                    skill_lines.append(line)
+        if skill_lines:
+            data["skills"] = self._items(skill_lines)
+            confidence["skills"] = SECTION_LIST_CONFIDENCE if data["skills"] else 0.0
+        else:
+            data["skills"] = self._taxonomy_skills(text, data["name"])
+            confidence["skills"] = TAXONOMY_SKILLS_CONFIDENCE
+
+        for field, labels in LIST_FIELD_LABELS.items():
+            lines = language_lines if field == "languages" else [
+                body for label in labels for body in bodies.get(label, [])
+            ]
+            data[field] = self._items(lines, split=field == "languages")
+            if field == "languages" and data[field]:
+                # A "Languages" heading may list programming languages
+                spoken = [item for item in data[field] if self._is_spoken_language(item)]
+                other = [item for item in data[field] if not self._is_spoken_language(item)]
+                if other:
+                    data["skills"] = self._merge_items(data["skills"], other)
+                    data[field] = spoken
+                    # Not sure how to read the list: let the LLM check it
+                    confidence[field] = MIXED_LANGUAGES_CONFIDENCE if spoken else 0.0
+                    continue
+            if data[field]:
+                confidence[field] = SECTION_LIST_CONFIDENCE
+            elif lines:
+                confidence[field] = 0.0
+            else:
+                confidence[field] = ABSENT_CONFIDENCE
+
+        # Structured experience and "quantifiable accomplishments" need the LLM
+        has_experience = "experience" in bodies
+        data["work_experience"] = []
+        confidence["work_experience"] = 0.0 if has_experience else ABSENT_CONFIDENCE
+        data["achievements"] = []
+        has_activities = any(label in bodies for label in LIST_FIELD_LABELS["activities"])
+        confidence["achievements"] = 0.0 if has_experience or has_activities else ABSENT_CONFIDENCE
+        if has_experience and not has_activities:
+            # Activities are often listed under experience
+            confidence["activities"] = min(confidence["activities"], MISSING_HINTED_CONFIDENCE)
+
+        return LocalExtraction(data, confidence)
+
+    def _contact_fields(
+        self,
+        text: str,
+        preamble: str,
+        data: Dict[str, Any],
+        confidence: Dict[str, float]
+    ) -> None:
+        """Name from the first preamble line, email/phone/GPA from the field scanner"""
+        data["name"] = ""
+        confidence["name"] = 0.0
+        for line in preamble.split("\n")[:5]:
+            line = line.strip()
+            if line and len(line) < 50 and not any(char in line for char in ['@', '|', '•']):
+                looks_like_name = NAME_PATTERN.match(line) is not None
+                data["name"] = line.title() if looks_like_name and line.isupper() else line
+                confidence["name"] = NAME_CONFIDENCE if looks_like_name else NAME_GUESS_CONFIDENCE
+                break
+
+        text_lower = text.lower()
+        hints = {"email": "email", "phone": "phone", "gpa": "gpa"}
+        for field, candidate in field_scanner.best(text).items():
+            if candidate is not None:
+                data[field] = candidate.value
+                confidence[field] = candidate.confidence
+            else:
+                data[field] = None
+                # The scanner covers the usual formats; only a mention of the
+                # field without a match is worth asking the LLM about
+                confidence[field] = MISSING_HINTED_CONFIDENCE if hints[field] in text_lower else ABSENT_CONFIDENCE
+
+    @staticmethod
+    def _taxonomy_skills(text: str, name: str) -> List[str]:
+        """Known skills mentioned anywhere in the text, ignoring the candidate's own name"""
+        name_words = set(name.lower().split())
+        skills: Dict[str, None] = {}
+        for match in skill_taxonomy.scan(text):
+            # "Julia Chen" is a person, not the Julia language
+            if text[match.start:match.end].lower() not in name_words:
+                skills.setdefault(match.skill)
+                if len(skills) >= MAX_ITEMS:
+                    break
+        return list(skills)
+
+    @staticmethod
+    def _is_spoken_language(item: str) -> bool:
+        """Whether a list item names a spoken language ("English (Native)", "Spanish - fluent")"""
+        return LANGUAGE_QUALIFIER.sub("", item).strip().lower() in SPOKEN_LANGUAGES
+
+    @staticmethod
+    def _merge_items(items: List[str], extra: List[str]) -> List[str]:
+        seen = {item.lower() for item in items}
+        return (items + [item for item in extra if item.lower() not in seen])[:MAX_ITEMS]
+
+    @staticmethod
+    def _items(bodies: List[str], split: bool = True) -> List[str]:
+        """List items from section bodies: one per bullet line, comma-split if `split`"""
+        items = []
+        seen = set()
+        for body in bodies:
+            for line in body.split("\n"):
+                line = LABEL_PREFIX.sub("", line.strip(LEADING_CHARS + " "))
+                parts = ITEM_SPLIT.split(line) if split else [line]
+                for part in parts:
+                    part = part.strip(LEADING_CHARS + " .")
+                    if part and part.lower() not in seen:
+                        seen.add(part.lower())
+                        items.append(part)
+        return items[:MAX_ITEMS]
+
+    @staticmethod
+    def _education(bodies: List[str]) -> List[Dict[str, Optional[Any]]]:
+        """One entry per line naming a school"""
+        entries = []
+        lines = [line.strip(LEADING_CHARS + " ") for body in bodies for line in body.split("\n")]
+        for index, line in enumerate(lines):
+            school = SCHOOL_PATTERN.search(line)
+            if not school:
+                continue
+            # The degree and year may sit on the school line or the next one
+            context = " ".join(lines[index:index + 2])
+            degree = DEGREE_PATTERN.search(context)
+            year = YEAR_PATTERN.findall(context)
+            gpa = field_scanner.best(context)["gpa"]
+            entries.append({
+                "school": re.split(r"\s+[-–|,]\s+", line)[0].strip(),
+                "degree": degree.group("degree") if degree else "",
+                "field": (degree.group("field") or "").strip() if degree else "",
+                "graduation_year": year[-1] if year else None,
+                "gpa": gpa.value if gpa else None
+            })
+        return entries
+
+
+# Singleton instance
+local_extractor = LocalExtractor()
@@ -0,0 +1,192 @@
+"""
+Parse Cache Service
+Persistent cache of parsed resume documents keyed by SHA-256 of the PDF bytes.
+Entries are zlib-compressed JSON on disk, evicted least-recently-used once the
+cache grows past its size bound.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+import logging
+
+from api.services.pdf_parser import ParsedDocument
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: str) -> str:
+    """
+    SHA-256 hex digest of a file, read in chunks
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Size-bounded LRU cache of ParsedDocuments on disk"""
+
+    CACHE_DIR = Path(os.getenv(
+        "PARSE_CACHE_DIR",
+        str(Path(__file__).parent.parent.parent / "indexes" / "parse_cache")
+    ))
+    MAX_BYTES = int(float(os.getenv("PARSE_CACHE_MAX_MB", "256")) * 1024 * 1024)
+    SUFFIX = ".json.z"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # digest -> compressed entry size, least recently used first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.bytes_saved = 0  # PDF bytes that did not need parsing
+
+    def _path(self, digest: str) -> Path:
+        # Two-level sharding keeps directories small
+        return self.CACHE_DIR / digest[:2] / f"{digest}{self.SUFFIX}"
+
+    def _ensure_loaded(self) -> None:
+        """Rebuild the LRU order from file mtimes (called with the lock held)"""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.CACHE_DIR.exists():
+            return
+        found = []
+        for path in self.CACHE_DIR.glob(f"*/*{self.SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            found.append((stat.st_mtime, path.name[:-len(self.SUFFIX)], stat.st_size))
+        for _, digest, size in sorted(found):
+            self._entries[digest] = size
+            self._total_bytes += size
+        logger.info(f"Parse cache: {len(self._entries)} entries, {self._total_bytes / 1024 / 1024:.1f}MB")
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under MAX_BYTES (lock held)"""
+        while self._entries and self._total_bytes > self.MAX_BYTES:
+            digest, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                self._path(digest).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _forget(self, digest: str) -> None:
+        size = self._entries.pop(digest, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def get(self, digest: str, source_bytes: int = 0) -> Optional[ParsedDocument]:
+        """
+        Look up a parsed document
+
+        Args:
+            digest: SHA-256 hex digest of the PDF bytes
+            source_bytes: Size of the PDF, counted in bytes_saved on a hit
+
+        Returns:
+            ParsedDocument, or None on a miss
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if digest not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+
+        path = self._path(digest)
+        try:
+            document = ParsedDocument.from_dict(json.loads(zlib.decompress(path.read_bytes())))
+            # Persist recency so the LRU order survives restarts
+            os.utime(path)
+        except (OSError, ValueError, TypeError, zlib.error) as e:
+            logger.warning(f"Dropping unreadable parse cache entry {digest[:12]}: {e}")
+            with self._lock:
+                self._forget(digest)
+                self.misses += 1
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += source_bytes
+        return document
+
+    def put(self, digest: str, document: ParsedDocument) -> None:
+        """
+        Store a parsed document, evicting old entries if over the size bound
+
+        Args:
+            digest: SHA-256 hex digest of the PDF bytes
+            document: Parsed document
+        """
+        payload = zlib.compress(json.dumps(document.to_dict(), separators=(",", ":")).encode("utf-8"), 6)
+        if len(payload) > self.MAX_BYTES:
+            return
+
+        path = self._path(digest)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write parse cache entry {digest[:12]}: {e}")
+            return
+
+        with self._lock:
+            self._ensure_loaded()
+            self._forget(digest)
+            self._entries[digest] = len(payload)
+            self._total_bytes += len(payload)
+            self.stores += 1
+            self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate, bytes saved and current size"""
+        with self._lock:
+            self._ensure_loaded()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "bytes_saved": self.bytes_saved,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size_bytes": self._total_bytes,
+                "max_bytes": self.MAX_BYTES
+            }
+
+
+# Singleton instance
+parse_cache = ParseCache()
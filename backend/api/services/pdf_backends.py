@@ -0,0 +1,281 @@
+"""
+PDF Text Backends
+Interchangeable page -> line extractors for PDFParser, plus a quick probe that
+picks the fast backend for plain text-layer resumes and pdfplumber otherwise.
+
+Every backend yields lines as (text, font_size, bold); font_size 0.0 means unknown.
+"""
+import ctypes
+import os
+from abc import ABC, abstractmethod
+from statistics import median
+from typing import Dict, Iterator, List, Optional, Tuple
+import logging
+
+import pdfplumber
+
+try:
+    import pypdfium2 as pdfium
+    import pypdfium2.raw as pdfium_raw
+except ImportError:  # pragma: no cover - pypdfium2 ships with pdfplumber>=0.10
+    pdfium = None
+    pdfium_raw = None
+
+try:
+    from pdfminer.converter import PDFPageAggregator
+    from pdfminer.layout import LAParams, LTChar, LTTextContainer, LTTextLine
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+except ImportError:  # pragma: no cover - pdfminer.six ships with pdfplumber
+    PDFPage = None
+
+logger = logging.getLogger(__name__)
+
+Line = Tuple[str, float, bool]
+# (page_number, lines, is_last_page_of_document)
+PageLines = Tuple[int, List[Line], bool]
+
+# PDF font descriptor flag for synthetic bold
+FORCE_BOLD_FLAG = 1 << 18
+
+# Probe thresholds
+PROBE_MIN_CHARS = int(os.getenv("PDF_PROBE_MIN_CHARS", "50"))
+PROBE_COLUMN_GAP = 24.0  # points between segments on one row
+PROBE_MAX_SIDE_BY_SIDE = 0.1  # share of segments that may sit beside another
+
+
+def _line_style(chars) -> Tuple[float, bool]:
+    """Median font size and majority-bold of a line's visible chars"""
+    if not chars:
+        return 0.0, False
+    size = median(size for size, _ in chars)
+    bold = sum("Bold" in fontname for _, fontname in chars) * 2 > len(chars)
+    return round(float(size), 2), bold
+
+
+class PDFBackend(ABC):
+    """Base class: extract styled lines page by page"""
+
+    name = ""
+
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def count_pages(self, pdf_path: str) -> int:
+        """Number of pages in the document"""
+
+    @abstractmethod
+    def iter_pages(self, pdf_path: str, first_page: int = 0, last_page: Optional[int] = None) -> Iterator[PageLines]:
+        """
+        Yield (page_number, lines, is_last_page) for a page range
+
+        Args:
+            pdf_path: Path to the PDF file
+            first_page: First page index (0-based, inclusive)
+            last_page: Last page index (exclusive), None for the end
+        """
+
+
+class PdfplumberBackend(PDFBackend):
+    """Layout-aware extraction: lines rebuilt from char geometry (slowest, most robust)"""
+
+    name = "pdfplumber"
+
+    def count_pages(self, pdf_path: str) -> int:
+        with pdfplumber.open(pdf_path) as pdf:
+            return len(pdf.pages)
+
+    def iter_pages(self, pdf_path: str, first_page: int = 0, last_page: Optional[int] = None) -> Iterator[PageLines]:
+        with pdfplumber.open(pdf_path) as pdf:
+            n_pages = len(pdf.pages)
+            end = n_pages if last_page is None else min(last_page, n_pages)
+            for page_number in range(first_page, end):
+                page = pdf.pages[page_number]
+                try:
+                    text_lines = page.extract_text_lines(return_chars=True)
+                finally:
+                    # Release per-page layout caches as we go
+                    page.close()
+                lines = []
+                for line in text_lines:
+                    chars = [(c["size"], c.get("fontname", "")) for c in line["chars"] if c["text"].strip()]
+                    lines.append((line["text"], *_line_style(chars)))
+                yield page_number, lines, page_number == n_pages - 1
+
+
+class PdfminerBackend(PDFBackend):
+    """pdfminer.six layout analysis without pdfplumber's char tables (text + fonts)"""
+
+    name = "pdfminer"
+
+    def available(self) -> bool:
+        return PDFPage is not None
+
+    def count_pages(self, pdf_path: str) -> int:
+        with open(pdf_path, "rb") as f:
+            return sum(1 for _ in PDFPage.get_pages(f))
+
+    def iter_pages(self, pdf_path: str, first_page: int = 0, last_page: Optional[int] = None) -> Iterator[PageLines]:
+        n_pages = self.count_pages(pdf_path)
+        end = n_pages if last_page is None else min(last_page, n_pages)
+        resources = PDFResourceManager(caching=True)
+        device = PDFPageAggregator(resources, laparams=LAParams())
+        interpreter = PDFPageInterpreter(resources, device)
+        with open(pdf_path, "rb") as f:
+            for page_number, page in enumerate(PDFPage.get_pages(f, pagenos=set(range(first_page, end)))):
+                page_number += first_page
+                interpreter.process_page(page)
+                lines = []
+                for box in device.get_result():
+                    if not isinstance(box, LTTextContainer):
+                        continue
+                    for text_line in box:
+                        if not isinstance(text_line, LTTextLine):
+                            continue
+                        text = text_line.get_text().rstrip("\n")
+                        if not text.strip():
+                            continue
+                        chars = [(c.size, c.fontname) for c in text_line if isinstance(c, LTChar) and c.get_text().strip()]
+                        lines.append((text, *_line_style(chars)))
+                yield page_number, lines, page_number == n_pages - 1
+
+
+class PdfiumBackend(PDFBackend):
+    """PDFium text layer in content-stream order (fastest; fonts sampled per line)"""
+
+    name = "pdfium"
+
+    def available(self) -> bool:
+        return pdfium is not None
+
+    def count_pages(self, pdf_path: str) -> int:
+        doc = pdfium.PdfDocument(pdf_path)
+        try:
+            return len(doc)
+        finally:
+            doc.close()
+
+    @staticmethod
+    def _style_at(textpage, index: int, font_buffer) -> Tuple[float, bool]:
+        size = pdfium_raw.FPDFText_GetFontSize(textpage.raw, index)
+        flags = ctypes.c_int(0)
+        pdfium_raw.FPDFText_GetFontInfo(textpage.raw, index, font_buffer, len(font_buffer), ctypes.byref(flags))
+        bold = b"Bold" in font_buffer.value or bool(flags.value & FORCE_BOLD_FLAG)
+        return round(float(size), 2), bold
+
+    def iter_pages(self, pdf_path: str, first_page: int = 0, last_page: Optional[int] = None) -> Iterator[PageLines]:
+        doc = pdfium.PdfDocument(pdf_path)
+        font_buffer = ctypes.create_string_buffer(128)
+        try:
+            n_pages = len(doc)
+            end = n_pages if last_page is None else min(last_page, n_pages)
+            for page_number in range(first_page, end):
+                page = doc[page_number]
+                textpage = page.get_textpage()
+                try:
+                    text = textpage.get_text_range()
+                    lines = []
+                    # Text indices map 1:1 to pdfium char indices, so the first
+                    # visible char of each line gives its font
+                    offset = 0
+                    for raw_line in text.split("\r\n"):
+                        line = raw_line.rstrip("\r\n")
+                        stripped = line.lstrip()
+                        if stripped:
+                            lines.append((line, *self._style_at(textpage, offset + len(line) - len(stripped), font_buffer)))
+                        offset += len(raw_line) + 2
+                finally:
+                    textpage.close()
+                    page.close()
+                yield page_number, lines, page_number == n_pages - 1
+        finally:
+            doc.close()
+
+    def probe(self, pdf_path: str) -> Tuple[int, Optional[str]]:
+        """
+        Page count and, if the first page looks complex, the reason
+
+        Complex means: almost no text layer, text segments side by side
+        (columns, tables), or a content stream that jumps back up the page
+        (reading order would depend on geometry, which only pdfplumber rebuilds).
+        """
+        doc = pdfium.PdfDocument(pdf_path)
+        try:
+            n_pages = len(doc)
+            if n_pages == 0:
+                return 0, "empty"
+            page = doc[0]
+            textpage = page.get_textpage()
+            try:
+                if textpage.count_chars() < PROBE_MIN_CHARS:
+                    return n_pages, "little text"
+                rects = [textpage.get_rect(i) for i in range(textpage.count_rects())]
+            finally:
+                textpage.close()
+                page.close()
+        finally:
+            doc.close()
+
+        # rects are (left, bottom, right, top) in stream order
+        side_by_side = 0
+        backtracks = 0
+        for prev, cur in zip(rects, rects[1:]):
+            same_row = abs(prev[1] - cur[1]) < 2 and abs(prev[3] - cur[3]) < 2
+            if same_row and cur[0] - prev[2] > PROBE_COLUMN_GAP:
+                side_by_side += 1
+            elif cur[1] > prev[3] + 1:
+                backtracks += 1
+        if side_by_side > len(rects) * PROBE_MAX_SIDE_BY_SIDE:
+            return n_pages, "columns"
+        if backtracks > 1:
+            return n_pages, "out-of-order text"
+        return n_pages, None
+
+
+BACKENDS: Dict[str, PDFBackend] = {
+    backend.name: backend for backend in (PdfiumBackend(), PdfminerBackend(), PdfplumberBackend())
+}
+# Fast backends in order of preference
+FAST_BACKENDS = ["pdfium", "pdfminer"]
+DEFAULT_BACKEND = "pdfplumber"
+
+
+def get_backend(name: str) -> PDFBackend:
+    """Backend by name, falling back to pdfplumber if it is unknown or not installed"""
+    backend = BACKENDS.get(name)
+    if backend is None or not backend.available():
+        logger.warning(f"PDF backend '{name}' not available, using {DEFAULT_BACKEND}")
+        return BACKENDS[DEFAULT_BACKEND]
+    return backend
+
+
+def choose_backend(pdf_path: str, preference: str = "auto") -> Tuple[int, str]:
+    """
+    Page count and backend to use for a document
+
+    Args:
+        pdf_path: Path to the PDF file
+        preference: "auto" to probe, or a backend name to force it
+
+    Returns:
+        (page_count, backend_name)
+    """
+    if preference != "auto":
+        backend = get_backend(preference)
+        return backend.count_pages(pdf_path), backend.name
+
+    fast = next((name for name in FAST_BACKENDS if BACKENDS[name].available()), None)
+    pdfium_backend = BACKENDS["pdfium"]
+    if fast is None or not pdfium_backend.available():
+        return BACKENDS[DEFAULT_BACKEND].count_pages(pdf_path), DEFAULT_BACKEND
+
+    try:
+        n_pages, reason = pdfium_backend.probe(pdf_path)
+    except Exception as e:
+        logger.warning(f"PDF probe failed ({e}); using {DEFAULT_BACKEND}")
+        return BACKENDS[DEFAULT_BACKEND].count_pages(pdf_path), DEFAULT_BACKEND
+    if reason:
+        logger.info(f"PDF probe chose {DEFAULT_BACKEND}: {reason}")
+        return n_pages, DEFAULT_BACKEND
+    return n_pages, fast
@@ -1,17 +1,266 @@
 """
 PDF Parser Service
-Extracts text from PDF files using pdfplumber
+Extracts text from PDF files (pdfplumber, or a faster backend for plain text PDFs)
 """
-import pdfplumber
-from typing import Optional, Dict, Any
+import os
+from dataclasses import dataclass, field, asdict
+from statistics import median
+from typing import Optional, Dict, Any, List, Tuple
 import logging
-import re
+
+from api.services.pdf_backends import choose_backend, get_backend
+from api.services.section_segmenter import section_segmenter
+from api.services.field_scanner import field_scanner
 
 logger = logging.getLogger(__name__)
 
+# Bump when parse output changes so cached documents are not reused
+PARSE_VERSION = 3
+
+# Parse budget for resumes: text past this is never stored, so don't parse it
+RESUME_MAX_CHARS = 50000
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "30"))
+
+# A line is a header if its font is this much larger than the body text
+HEADER_FONT_RATIO = 1.15
+
+
+@dataclass
+class ParsedDocument:
+    """Everything one pass over a PDF produces"""
+    text: str  # Cleaned text, whitespace collapsed within each line
+    raw_text: str  # Page texts joined with newlines
+    page_count: int
+    page_offsets: List[Tuple[int, int]] = field(default_factory=list)  # (start, end) of each page in raw_text
+    sections: Dict[str, str] = field(default_factory=dict)
+    headers: List[Dict[str, Any]] = field(default_factory=list)  # {text, page, offset, font_size, bold}
+    truncated: bool = False  # Parsing stopped at a page or character budget
+    backend: str = ""  # Text backend that produced the lines
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ParsedDocument":
+        data = dict(data)
+        data["page_offsets"] = [tuple(offsets) for offsets in data.get("page_offsets", [])]
+        return cls(**data)
+
+
 class PDFParser:
     """Service for extracting text and data from PDF files"""
 
+    # "auto" probes each document; or force pdfium / pdfminer / pdfplumber
+    BACKEND = os.getenv("PDF_BACKEND", "auto")
+
+    def parse(
+        self,
+        pdf_path: str,
+        max_pages: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        backend: Optional[str] = None
+    ) -> ParsedDocument:
+        """
+        Parse a PDF once into text, sections and layout hints
+
+        With budgets, parsing stops as soon as max_pages pages have been read or
+        the cleaned text has reached max_chars characters; the document is then
+        marked truncated. text[:max_chars] is the same as for a full parse.
+
+        Args:
+            pdf_path: Path to the PDF file
+            max_pages: Stop after this many pages (None for no limit)
+            max_chars: Stop once this much cleaned text is collected (None for no limit)
+            backend: Text backend name (None to probe, see BACKEND)
+
+        Returns:
+            ParsedDocument
+
+        Raises:
+            Any backend error for unreadable files
+        """
+        if backend is None:
+            _, backend = self.probe(pdf_path)
+        pages = self.parse_pages(pdf_path, 0, max_pages, max_chars, backend)
+        return self.build_document(pages, max_chars, backend)
+
+    def probe(self, pdf_path: str) -> Tuple[int, str]:
+        """
+        Page count and the backend to parse this document with
+
+        Args:
+            pdf_path: Path to the PDF file
+
+        Returns:
+            (page_count, backend_name)
+        """
+        return choose_backend(pdf_path, self.BACKEND)
+
+    def count_pages(self, pdf_path: str) -> int:
+        """
+        Count pages without running layout analysis
+
+        Args:
+            pdf_path: Path to the PDF file
+
+        Returns:
+            Number of pages
+        """
+        return self.probe(pdf_path)[0]
+
+    def parse_pages(
+        self,
+        pdf_path: str,
+        first_page: int = 0,
+        last_page: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        backend: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Walk a page range once, collecting line text and font styles
+
+        Backends release per-page caches as they go, so memory stays flat
+        however long the document is.
+
+        Args:
+            pdf_path: Path to the PDF file
+            first_page: First page index (0-based, inclusive)
+            last_page: Last page index (exclusive), None for the end
+            max_chars: Stop once this much cleaned text is collected (None for no limit)
+            backend: Text backend name (None to probe)
+
+        Returns:
+            One dict per page: {page_number, lines: [(text, font_size, bold)]}.
+            The last page has "more": True if the document continues past it.
+        """
+        if backend is None:
+            _, backend = self.probe(pdf_path)
+
+        pages = []
+        budget = max_chars
+        more = False
+        page_iter = get_backend(backend).iter_pages(pdf_path, first_page, last_page)
+        try:
+            for page_number, page_lines, is_last in page_iter:
+                lines = page_lines
+                if budget is not None:
+                    for i, line in enumerate(page_lines):
+                        budget -= self._clean_length(line[0])
+                        if budget <= 0:
+                            lines = page_lines[:i + 1]
+                            break
+                pages.append({"page_number": page_number, "lines": lines})
+                more = len(lines) < len(page_lines) or not is_last
+                if budget is not None and budget <= 0:
+                    break
+        finally:
+            # Stops the backend (and closes the file) on an early exit
+            page_iter.close()
+        if pages:
+            pages[-1]["more"] = more
+        return pages
+
+    @staticmethod
+    def _clean_length(line_text: str) -> int:
+        """Characters a line contributes to the cleaned text (words plus one separator)"""
+        return len(" ".join(line_text.split())) + 1
+
+    def build_document(
+        self,
+        pages: List[Dict[str, Any]],
+        max_chars: Optional[int] = None,
+        backend: str = ""
+    ) -> ParsedDocument:
+        """
+        Assemble parse_pages() output (possibly from several workers) into a document
+
+        Args:
+            pages: Page dicts in page order
+            max_chars: Drop lines past this much cleaned text (None for no limit)
+            backend: Backend that produced the pages
+
+        Returns:
+            ParsedDocument
+        """
+        # Apply the character budget across all pages (workers each stop on
+        # their own budget, so later chunks can overshoot)
+        truncated = bool(pages) and pages[-1].get("more", False)
+        if max_chars is not None:
+            budget = max_chars
+            kept = []
+            for page in pages:
+                if budget <= 0:
+                    truncated = True
+                    break
+                lines = []
+                for line in page["lines"]:
+                    if budget <= 0:
+                        truncated = True
+                        break
+                    lines.append(line)
+                    budget -= self._clean_length(line[0])
+                kept.append({"page_number": page["page_number"], "lines": lines})
+            pages = kept
+
+        sizes = [size for page in pages for _, size, _ in page["lines"] if size > 0]
+        body_size = median(sizes) if sizes else 0.0
+
+        parts = []
+        page_offsets = []
+        headers = []
+        offset = 0
+        for page in pages:
+            if not page["lines"]:
+                # Empty pages contribute nothing, as in extract_text
+                page_offsets.append((offset, offset))
+                continue
+            if parts:
+                parts.append("\n")
+                offset += 1
+            page_start = offset
+            for i, (line_text, size, bold) in enumerate(page["lines"]):
+                if i:
+                    parts.append("\n")
+                    offset += 1
+                stripped = line_text.strip()
+                is_larger = body_size and size >= body_size * HEADER_FONT_RATIO
+                is_bold_heading = bold and stripped and len(stripped) <= 60 and not stripped.endswith(".")
+                if stripped and (is_larger or is_bold_heading):
+                    headers.append({
+                        "text": stripped,
+                        "page": page["page_number"],
+                        "offset": offset,
+                        "font_size": size,
+                        "bold": bold
+                    })
+                parts.append(line_text)
+                offset += len(line_text)
+            page_offsets.append((page_start, offset))
+
+        raw_text = "".join(parts)
+        return ParsedDocument(
+            text=self._clean_text(raw_text),
+            raw_text=raw_text,
+            page_count=len(pages),
+            page_offsets=page_offsets,
+            sections=self.extract_sections(raw_text),
+            headers=headers,
+            truncated=truncated,
+            backend=backend
+        )
+
+    def extract_sections(self, text: str) -> Dict[str, str]:
+        """
+        Identify resume sections in raw text
+
+        Args:
+            text: Raw (uncleaned) resume text
+
+        Returns:
+            Dictionary of section name -> section text
+        """
+        return section_segmenter.sections(text)
+
     def extract_text(self, pdf_path: str) -> str:
         """
         Extract plain text from PDF file
@@ -23,15 +272,7 @@ class PDFParser:
             Extracted text as string
         """
         try:
-            text = ""
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-
-            # Clean up text
-            text = self._clean_text(text)
+            text = self.parse(pdf_path).text
             logger.info(f"Extracted {len(text)} characters from PDF")
             return text
 
@@ -50,40 +291,8 @@ class PDFParser:
             Dictionary with identified sections
         """
         try:
-            sections = {
-                "full_text": "",
-                "contact": "",
-                "education": "",
-                "experience": "",
-                "skills": "",
-                "achievements": "",
-                "summary": ""
-            }
-
-            with pdfplumber.open(pdf_path) as pdf:
-                full_text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        full_text += page_text + "\n"
-
-                sections["full_text"] = full_text
-
-                # Try to identify sections using common headers
-                sections["contact"] = self._extract_section(full_text,
-                    ["contact", "email", "phone", "address"])
-                sections["education"] = self._extract_section(full_text,
-                    ["education", "academic", "university", "college", "degree"])
-                sections["experience"] = self._extract_section(full_text,
-                    ["experience", "work", "employment", "professional"])
-                sections["skills"] = self._extract_section(full_text,
-                    ["skills", "technical", "competencies", "technologies"])
-                sections["achievements"] = self._extract_section(full_text,
-                    ["achievements", "awards", "honors", "accomplishments"])
-                sections["summary"] = self._extract_section(full_text,
-                    ["summary", "objective", "profile", "about"])
-
-            return sections
+            document = self.parse(pdf_path)
+            return {"full_text": document.raw_text, **document.sections}
 
         except Exception as e:
             logger.error(f"Failed to extract structured data: {e}")
@@ -99,8 +308,9 @@ class PDFParser:
         Returns:
             Cleaned text
         """
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        # Collapse whitespace within lines and drop blank lines; line breaks
+        # are kept so section headings can still be found in stored text
+        text = "\n".join(" ".join(line.split()) for line in text.splitlines() if line.strip())
 
         # Remove special characters that might break parsing
         text = text.replace('\x00', '')
@@ -114,46 +324,6 @@ class PDFParser:
 
         return text
 
-    def _extract_section(self, text: str, keywords: list) -> str:
-        """
-        Try to extract a specific section from the text
-
-        Args:
-            text: Full text
-            keywords: Keywords that might indicate the section
-
-        Returns:
-            Extracted section text
-        """
-        text_lower = text.lower()
-
-        # Find the earliest keyword match
-        start_pos = -1
-        for keyword in keywords:
-            pos = text_lower.find(keyword.lower())
-            if pos != -1 and (start_pos == -1 or pos < start_pos):
-                start_pos = pos
-
-        if start_pos == -1:
-            return ""
-
-        # Extract text from that position
-        # Try to find the next section header or take next 500 chars
-        section_text = text[start_pos:start_pos + 500]
-
-        # Try to find natural break points
-        next_sections = ["education", "experience", "skills", "achievements",
-                        "references", "contact", "summary", "objective"]
-
-        for next_section in next_sections:
-            if next_section not in keywords:
-                next_pos = text_lower.find(next_section, start_pos + len(keywords[0]))
-                if next_pos != -1:
-                    section_text = text[start_pos:next_pos]
-                    break
-
-        return section_text.strip()
-
     def extract_email(self, text: str) -> Optional[str]:
         """
         Extract email from text
@@ -164,9 +334,7 @@ class PDFParser:
         Returns:
             Email if found, None otherwise
         """
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        match = re.search(email_pattern, text)
-        return match.group(0) if match else None
+        return field_scanner.extract(text)["email"]
 
     def extract_phone(self, text: str) -> Optional[str]:
         """
@@ -178,19 +346,7 @@ class PDFParser:
         Returns:
             Phone number if found, None otherwise
         """
-        # US phone number patterns
-        phone_patterns = [
-            r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-            r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',
-            r'\d{10}'
-        ]
-
-        for pattern in phone_patterns:
-            match = re.search(pattern, text)
-            if match:
-                return match.group(0)
-
-        return None
+        return field_scanner.extract(text)["phone"]
 
     def extract_gpa(self, text: str) -> Optional[float]:
         """
@@ -202,24 +358,7 @@ class PDFParser:
         Returns:
             GPA if found, None otherwise
         """
-        # Look for GPA patterns like "GPA: 3.85" or "3.85/4.0"
-        gpa_patterns = [
-            r'GPA[:\s]+([0-4]\.[0-9]{1,2})',
-            r'([0-4]\.[0-9]{1,2})[/\s]+4\.0',
-            r'Grade Point Average[:\s]+([0-4]\.[0-9]{1,2})'
-        ]
-
-        for pattern in gpa_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                try:
-                    gpa = float(match.group(1))
-                    if 0 <= gpa <= 4.0:
-                        return gpa
-                except:
-                    continue
-
-        return None
+        return field_scanner.extract(text)["gpa"]
 
 # Singleton instance
 pdf_parser = PDFParser()
\ No newline at end of file
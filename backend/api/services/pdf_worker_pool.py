@@ -0,0 +1,199 @@
+"""
+PDF Worker Pool Service
+Runs pdfplumber parsing in a managed process pool so CPU-heavy layout
+analysis never blocks the event loop. Large PDFs are split by page range
+across workers and reassembled in order.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from api.services.pdf_parser import pdf_parser, ParsedDocument, PARSE_VERSION
+from api.services.parse_cache import parse_cache, hash_file
+
+logger = logging.getLogger(__name__)
+
+
+class PoolSaturatedError(Exception):
+    """Raised when the parse queue is full"""
+
+
+def parse_cache_key(digest: str, max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> str:
+    """Parse cache key for a document hash, the configured backend and parse budget"""
+    # Switching PDF_BACKEND must not serve documents parsed by the previous one;
+    # budgeted parses are cached separately from full ones
+    cache_key = f"{digest}.v{PARSE_VERSION}.{pdf_parser.BACKEND}"
+    if max_pages is not None or max_chars is not None:
+        cache_key += f".p{max_pages}.c{max_chars}"
+    return cache_key
+
+
+def _probe(pdf_path: str) -> Tuple[int, str]:
+    return pdf_parser.probe(pdf_path)
+
+
+def _parse_page_range(
+    pdf_path: str,
+    first_page: int,
+    last_page: Optional[int],
+    max_chars: Optional[int],
+    backend: str
+) -> List[Dict[str, Any]]:
+    return pdf_parser.parse_pages(pdf_path, first_page, last_page, max_chars, backend)
+
+
+class PDFWorkerPool:
+    """Process pool for PDF text extraction with a bounded job queue"""
+
+    # Worker processes (defaults to one per core)
+    MAX_WORKERS = int(os.getenv("PDF_POOL_WORKERS", str(os.cpu_count() or 2)))
+    # Documents allowed in flight (parsing + waiting) before new uploads are rejected
+    MAX_QUEUE = int(os.getenv("PDF_POOL_MAX_QUEUE", "32"))
+    # Documents up to this many pages are parsed by a single worker
+    PAGES_PER_CHUNK = int(os.getenv("PDF_POOL_PAGES_PER_CHUNK", "4"))
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.MAX_QUEUE)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.MAX_WORKERS)
+                logger.info(f"Started PDF worker pool with {self.MAX_WORKERS} processes")
+            return self._executor
+
+    def _reset_executor(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a hostile PDF) - start a fresh pool for later jobs
+            logger.error("PDF worker pool broke; restarting it")
+            self._reset_executor()
+            raise
+
+    def page_ranges(self, n_pages: int) -> List[tuple]:
+        """
+        Split a document into contiguous page ranges, one per job
+
+        Args:
+            n_pages: Page count
+
+        Returns:
+            List of (first_page, last_page) tuples, last_page exclusive
+        """
+        if n_pages <= self.PAGES_PER_CHUNK:
+            return [(0, None)]
+        # Enough chunks to use every worker, but never smaller than PAGES_PER_CHUNK
+        n_chunks = min(self.MAX_WORKERS, -(-n_pages // self.PAGES_PER_CHUNK))
+        size = -(-n_pages // n_chunks)
+        return [(start, min(start + size, n_pages)) for start in range(0, n_pages, size)]
+
+    async def parse(
+        self,
+        pdf_path: str,
+        digest: Optional[str] = None,
+        max_pages: Optional[int] = None,
+        max_chars: Optional[int] = None
+    ) -> ParsedDocument:
+        """
+        Parse a PDF in the pool (same result as PDFParser.parse)
+
+        Documents already in the parse cache are returned without parsing.
+
+        Args:
+            pdf_path: Path to the PDF file
+            digest: SHA-256 of the file, if the caller already has it
+            max_pages: Stop after this many pages (None for no limit)
+            max_chars: Stop once this much cleaned text is collected (None for no limit)
+
+        Returns:
+            ParsedDocument
+
+        Raises:
+            PoolSaturatedError if MAX_QUEUE documents are already in flight
+        """
+        loop = asyncio.get_running_loop()
+        if digest is None:
+            digest = await loop.run_in_executor(None, hash_file, pdf_path)
+        cache_key = parse_cache_key(digest, max_pages, max_chars)
+        cached = await loop.run_in_executor(None, parse_cache.get, cache_key, os.path.getsize(pdf_path))
+        if cached is not None:
+            return cached
+
+        if not self._slots.acquire(blocking=False):
+            raise PoolSaturatedError(f"PDF parse queue is full ({self.MAX_QUEUE} documents in flight)")
+        try:
+            # One probe per document: every chunk must use the same backend
+            n_pages, backend = await self._run(_probe, pdf_path)
+            if max_pages is not None:
+                n_pages = min(n_pages, max_pages)
+            ranges = [(first, n_pages if last is None else last) for first, last in self.page_ranges(n_pages)]
+            chunks = await asyncio.gather(*(
+                self._run(_parse_page_range, pdf_path, first, last, max_chars, backend) for first, last in ranges
+            ))
+            document = pdf_parser.build_document([page for chunk in chunks for page in chunk], max_chars, backend)
+        finally:
+            self._slots.release()
+
+        await loop.run_in_executor(None, parse_cache.put, cache_key, document)
+        return document
+
+    async def extract_text(
+        self,
+        pdf_path: str,
+        digest: Optional[str] = None,
+        max_pages: Optional[int] = None,
+        max_chars: Optional[int] = None
+    ) -> str:
+        """
+        Cleaned plain text of a PDF, parsed in the pool
+
+        Same output as PDFParser.extract_text, without blocking the event loop.
+
+        Args:
+            pdf_path: Path to the PDF file
+            digest: SHA-256 of the file, if the caller already has it
+            max_pages: Stop after this many pages (None for no limit)
+            max_chars: Return at most this many characters, parsing no further than needed
+
+        Returns:
+            Extracted text ("" if the PDF could not be parsed)
+
+        Raises:
+            PoolSaturatedError if the parse queue is full
+        """
+        try:
+            document = await self.parse(pdf_path, digest, max_pages, max_chars)
+        except PoolSaturatedError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to extract text from PDF: {e}")
+            return ""
+
+        text = document.text if max_chars is None else document.text[:max_chars]
+        logger.info(f"Extracted {len(text)} characters from PDF in worker pool")
+        return text
+
+    def shutdown(self) -> None:
+        """Stop worker processes"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+# Singleton instance
+pdf_worker_pool = PDFWorkerPool()
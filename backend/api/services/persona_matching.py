@@ -0,0 +1,92 @@
+"""
+Persona Matching Service
+Ranks scholarship personas for a student inside the database:
+the dot product with the typed weight columns is computed, ordered and limited in SQL.
+"""
+import operator
+from functools import reduce
+from typing import Any, Dict, List
+import logging
+
+from sqlalchemy.orm import Session
+
+from api.services.trait_scorer import TRAITS, trait_scorer
+from db.models import Persona, Scholarship
+from db.models.persona import WEIGHT_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+class PersonaMatcher:
+    """Top-k persona matching against a student trait vector"""
+
+    @staticmethod
+    def student_vector(profile: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Trait vector of a student from their profile text
+
+        Args:
+            profile: Dict with activities, achievements, goals, skills, awards, work_experience
+
+        Returns:
+            Dictionary of trait -> weight (sums to 1.0; uniform if no evidence)
+        """
+        parts = [str(profile.get("goals") or "")]
+        for field in ("activities", "achievements", "skills", "awards"):
+            parts.extend(str(item) for item in profile.get(field) or [])
+        for job in profile.get("work_experience") or []:
+            if isinstance(job, dict):
+                parts.extend(str(job.get(k) or "") for k in ("role", "description"))
+
+        vector = trait_scorer.score("\n".join(parts))
+        if not any(vector.values()):
+            return {t: 1.0 / len(TRAITS) for t in TRAITS}
+        return vector
+
+    def top_personas(self, db: Session, vector: Dict[str, float], limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Highest dot-product personas for a trait vector
+
+        Args:
+            db: Database session
+            vector: Trait -> weight
+            limit: Number of results
+
+        Returns:
+            List of persona/scholarship dicts with match_score, best first
+        """
+        score = reduce(operator.add, [
+            getattr(Persona, column) * float(vector.get(trait, 0.0))
+            for trait, column in WEIGHT_COLUMNS.items()
+        ]).label("match_score")
+
+        rows = (
+            db.query(
+                Persona.id,
+                Persona.scholarship_id,
+                Persona.persona_name,
+                Persona.tone,
+                Scholarship.name,
+                score
+            )
+            .join(Scholarship, Scholarship.id == Persona.scholarship_id)
+            .order_by(score.desc(), Persona.id)
+            .limit(limit)
+            .all()
+        )
+
+        return [
+            {
+                "persona_id": row.id,
+                "scholarship_id": row.scholarship_id,
+                "scholarship_name": row.name,
+                "persona_name": row.persona_name,
+                "tone": row.tone,
+                "match_score": round(float(row.match_score or 0.0), 4)
+            }
+            for row in rows
+        ]
+
+
+# Singleton instance
+persona_matcher = PersonaMatcher()
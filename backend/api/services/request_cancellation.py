@@ -0,0 +1,160 @@
+"""
+Request Cancellation Service
+Stops LLM work whose HTTP client has gone away.
+
+Route handlers run the blocking Claude call on a worker thread and poll the
+connection meanwhile. When the client disconnects, the call's cancellation
+token fires: the upstream stream is closed, so no more tokens are generated
+or billed, and the handler gives up without waiting for the thread.
+"""
+import asyncio
+import functools
+import os
+import threading
+from collections import Counter
+from typing import Any, Callable, List, Optional
+import logging
+
+from fastapi import HTTPException, Request
+
+logger = logging.getLogger(__name__)
+
+
+class RequestCancelled(Exception):
+    """Raised by a cancellable call once its token fires"""
+
+    def __init__(self, message: str = "request cancelled", partial: str = ""):
+        super().__init__(message)
+        self.partial = partial  # Response text received before cancellation
+
+
+class ClientDisconnected(HTTPException):
+    """The HTTP client went away; nobody will read the response"""
+
+    def __init__(self):
+        super().__init__(status_code=499, detail="Client closed request")
+
+
+class CancellationToken:
+    """Thread-safe cancel flag that also runs registered callbacks (e.g. closing a stream)"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], Any]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.debug(f"Cancel callback failed: {e}")
+
+    def on_cancel(self, callback: Callable[[], Any]) -> Callable[[], None]:
+        """
+        Run `callback` on cancellation (at once if already cancelled)
+
+        Returns:
+            Function that unregisters the callback
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+
+                def remove() -> None:
+                    with self._lock:
+                        if callback in self._callbacks:
+                            self._callbacks.remove(callback)
+                return remove
+        callback()
+        return lambda: None
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise RequestCancelled()
+
+
+class CancellationMonitor:
+    """Runs blocking LLM calls off the event loop and cancels them on client disconnect"""
+
+    # Seconds between connection checks
+    POLL_INTERVAL = float(os.getenv("DISCONNECT_POLL_INTERVAL", "0.25"))
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancelled: Counter = Counter()
+        self._partials: Counter = Counter()
+
+    async def run(
+        self,
+        request: Optional[Request],
+        endpoint: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Call fn(*args, cancel=token, **kwargs) on a worker thread
+
+        Args:
+            request: Incoming request to watch (None: run without watching)
+            endpoint: Name for the cancellation counters
+            fn: Blocking function accepting a `cancel` CancellationToken
+
+        Returns:
+            fn's result
+
+        Raises:
+            ClientDisconnected if the client went away first
+        """
+        token = CancellationToken()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, functools.partial(fn, *args, cancel=token, **kwargs))
+        if request is None:
+            return await future
+
+        while True:
+            done, _ = await asyncio.wait({future}, timeout=self.POLL_INTERVAL)
+            if done:
+                return future.result()
+            if await request.is_disconnected():
+                token.cancel()
+                # The worker finishes on its own; don't leave its error unretrieved
+                future.add_done_callback(lambda f: f.cancelled() or f.exception())
+                with self._lock:
+                    self._cancelled[endpoint] += 1
+                logger.info(f"Client disconnected from {endpoint}, cancelled in-flight LLM work")
+                raise ClientDisconnected()
+
+    def count_partial(self, event: str) -> None:
+        """Count a partial response "saved" on cancellation or "resumed" by a retry"""
+        with self._lock:
+            self._partials[event] += 1
+
+    def stats(self) -> dict:
+        """
+        Cancellation counters
+
+        Returns:
+            Cancellations per endpoint and partial responses saved/resumed
+        """
+        with self._lock:
+            return {
+                "cancelled": dict(self._cancelled),
+                "total_cancelled": sum(self._cancelled.values()),
+                "partials_saved": self._partials["saved"],
+                "partials_resumed": self._partials["resumed"]
+            }
+
+
+# Singleton instance
+cancellation_monitor = CancellationMonitor()
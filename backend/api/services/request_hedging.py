@@ -0,0 +1,285 @@
+"""
+Request Hedging Service
+Cuts tail latency of interactive Claude calls by racing a duplicate request.
+
+The primary request is streamed so its first token can be seen. If none has
+arrived within the adaptive threshold (the recent p95 time-to-first-token for
+that prompt type), a second identical request is started; whichever completes
+first is used and the other stream is closed. Hedges draw on a budget that
+grows with ordinary traffic, so extra spend is capped at a fixed fraction of
+requests.
+"""
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import logging
+
+from api.services.request_cancellation import CancellationToken, RequestCancelled
+
+logger = logging.getLogger(__name__)
+
+
+# Rough characters per output token, for attempts cancelled before the final usage event
+CHARS_PER_TOKEN = 4
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class _Attempt:
+    """One streamed request, run on its own thread"""
+
+    def __init__(self, client: Any, request: Dict[str, Any], finished: "queue.Queue[_Attempt]", hedge: bool):
+        self.client = client
+        self.request = request
+        self.finished = finished
+        self.hedge = hedge
+        self.first_token = threading.Event()
+        self.cancelled = False
+        self.stream = None
+        self.started = time.perf_counter()
+        self.ttft: Optional[float] = None
+        self.elapsed: Optional[float] = None
+        self.text: Optional[str] = None
+        self.parts: List[str] = []
+        self.error: Optional[Exception] = None
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.thread = threading.Thread(target=self._run, name="claude-hedge" if hedge else "claude-primary",
+                                       daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        try:
+            with self.client.messages.stream(**self.request) as stream:
+                self.stream = stream
+                if self.cancelled:
+                    return
+                for event in stream:
+                    if self.cancelled:
+                        # Leaving the block closes the HTTP response
+                        return
+                    if event.type == "message_start":
+                        self.input_tokens = event.message.usage.input_tokens
+                    elif event.type == "content_block_delta":
+                        text = getattr(event.delta, "text", None)
+                        if text:
+                            if self.ttft is None:
+                                self.ttft = time.perf_counter() - self.started
+                                self.first_token.set()
+                            self.parts.append(text)
+                    elif event.type == "message_delta":
+                        self.output_tokens = event.usage.output_tokens
+                self.text = "".join(self.parts)
+        except Exception as e:
+            self.error = e
+        finally:
+            if not self.output_tokens and self.parts:
+                # Cancelled before message_delta reported usage: estimate what was generated
+                self.output_tokens = max(len("".join(self.parts)) // CHARS_PER_TOKEN, len(self.parts))
+            self.elapsed = time.perf_counter() - self.started
+            self.first_token.set()
+            self.finished.put(self)
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        stream = self.stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    @property
+    def ok(self) -> bool:
+        return self.text is not None and not self.cancelled
+
+
+class RequestHedger:
+    """Hedged streaming calls with per-prompt-type adaptive thresholds and a spend budget"""
+
+    # Prompt types eligible for hedging (interactive calls)
+    PROMPT_TYPES = {
+        name.strip() for name in os.getenv("CLAUDE_HEDGE_PROMPT_TYPES", "essay_generator,evaluation_agent").split(",")
+        if name.strip()
+    }
+    ENABLED = os.getenv("CLAUDE_HEDGING", "false").lower() == "true"
+    # Hedge after this percentile of recent time-to-first-token
+    PERCENTILE = float(os.getenv("CLAUDE_HEDGE_PERCENTILE", "0.95"))
+    # Threshold used until MIN_SAMPLES first-token times are known, and its floor
+    DEFAULT_DELAY = float(os.getenv("CLAUDE_HEDGE_DEFAULT_DELAY", "4.0"))
+    MIN_DELAY = float(os.getenv("CLAUDE_HEDGE_MIN_DELAY", "0.5"))
+    MIN_SAMPLES = 20
+    WINDOW = 200
+    # Extra requests allowed per request (0.05 = at most 5% more calls), and burst size
+    BUDGET = float(os.getenv("CLAUDE_HEDGE_BUDGET", "0.05"))
+    MAX_CREDITS = 3.0
+    # Seconds to wait for cancelled attempts to wind down before counting their
+    # tokens (a closed stream ends at once; one still connecting may not)
+    LOSER_JOIN_TIMEOUT = 0.5
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ttft: Dict[str, Deque[float]] = {}
+        self._generation: Dict[str, Deque[float]] = {}  # completion time after first token
+        self._credits = 1.0
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def enabled_for(self, prompt_type: str) -> bool:
+        return self.ENABLED and prompt_type in self.PROMPT_TYPES
+
+    def threshold(self, prompt_type: str) -> float:
+        """Seconds to wait for the primary's first token before hedging"""
+        with self._lock:
+            samples = self._ttft.get(prompt_type)
+            if not samples or len(samples) < self.MIN_SAMPLES:
+                return self.DEFAULT_DELAY
+            return max(_percentile(list(samples), self.PERCENTILE), self.MIN_DELAY)
+
+    def _take_credit(self) -> bool:
+        with self._lock:
+            if self._credits >= 1.0:
+                self._credits -= 1.0
+                return True
+            return False
+
+    def call(
+        self,
+        client: Any,
+        prompt_type: str,
+        request: Dict[str, Any],
+        cancel: Optional[CancellationToken] = None
+    ) -> Tuple[str, int, int]:
+        """
+        Run a messages request, hedging it if the first token is slow
+
+        Args:
+            client: Anthropic client
+            prompt_type: Prompt name (thresholds and stats are kept per type)
+            request: Keyword arguments for client.messages.stream
+            cancel: Token that closes every attempt's stream when it fires
+
+        Returns:
+            (response text of the first attempt to complete, input tokens,
+            output tokens), tokens summed over all attempts
+
+        Raises:
+            RequestCancelled (with the longest partial text) if `cancel` fired,
+            else the error of the last attempt if every attempt failed
+        """
+        with self._lock:
+            self._credits = min(self._credits + self.BUDGET, self.MAX_CREDITS)
+
+        finished: "queue.Queue[_Attempt]" = queue.Queue()
+        delay = self.threshold(prompt_type)
+        attempts = [_Attempt(client, request, finished, hedge=False)]
+        remove = cancel.on_cancel(lambda: [attempt.cancel() for attempt in attempts]) if cancel else None
+        hedge_denied = False
+        if not attempts[0].first_token.wait(delay) and not (cancel and cancel.cancelled):
+            if self._take_credit():
+                logger.info(f"No first token for {prompt_type} after {delay:.2f}s, hedging")
+                attempts.append(_Attempt(client, request, finished, hedge=True))
+                if cancel and cancel.cancelled:
+                    attempts[-1].cancel()
+            else:
+                hedge_denied = True
+
+        winner = None
+        for _ in attempts:
+            attempt = finished.get()
+            if attempt.ok:
+                winner = attempt
+                break
+        cancelled_at = time.perf_counter()
+        for attempt in attempts:
+            if attempt is not winner:
+                attempt.cancel()
+        # Token counts are final only once an attempt's thread has ended
+        for attempt in attempts:
+            if attempt is not winner:
+                attempt.thread.join(self.LOSER_JOIN_TIMEOUT)
+
+        if remove:
+            remove()
+
+        self._record(prompt_type, attempts, winner, hedge_denied, cancelled_at)
+        if cancel and cancel.cancelled:
+            partial = max(("".join(attempt.parts) for attempt in attempts), key=len)
+            raise RequestCancelled(f"{prompt_type} cancelled", partial=partial)
+        if winner is None:
+            raise attempts[-1].error or RuntimeError("hedged request failed")
+        input_tokens = sum(attempt.input_tokens for attempt in attempts)
+        output_tokens = sum(attempt.output_tokens for attempt in attempts)
+        return winner.text, input_tokens, output_tokens
+
+    def _record(
+        self,
+        prompt_type: str,
+        attempts: List[_Attempt],
+        winner: Optional[_Attempt],
+        hedge_denied: bool,
+        cancelled_at: float
+    ) -> None:
+        primary = attempts[0]
+        with self._lock:
+            stats = self._stats.setdefault(prompt_type, dict.fromkeys(
+                ("requests", "hedged", "hedge_wins", "budget_denied", "latency_won_ms", "extra_tokens"), 0
+            ))
+            stats["requests"] += 1
+            stats["budget_denied"] += hedge_denied
+            ttft = self._ttft.setdefault(prompt_type, deque(maxlen=self.WINDOW))
+            generation = self._generation.setdefault(prompt_type, deque(maxlen=self.WINDOW))
+            for attempt in attempts:
+                if attempt.ttft is not None:
+                    ttft.append(attempt.ttft)
+                elif winner is not None and attempt.cancelled:
+                    # Lost the race before its first token: its TTFT is at
+                    # least this long (censored sample). Dropping it would leave
+                    # out exactly the slow tail and bias the threshold low.
+                    ttft.append(cancelled_at - attempt.started)
+            if winner is not None and winner.ttft is not None:
+                generation.append(winner.elapsed - winner.ttft)
+
+            if len(attempts) < 2:
+                return
+            stats["hedged"] += 1
+            loser = primary if winner is attempts[1] else attempts[1]
+            stats["extra_tokens"] += loser.input_tokens + loser.output_tokens
+            if winner is attempts[1]:
+                stats["hedge_wins"] += 1
+                # Lower bound: the cancelled primary still needed at least its
+                # first token plus a typical generation time
+                now = winner.started + winner.elapsed - primary.started
+                typical_generation = _percentile(list(generation), 0.5) if generation else 0.0
+                primary_finish = (primary.ttft if primary.ttft is not None else now) + typical_generation
+                stats["latency_won_ms"] += max(primary_finish - now, 0.0) * 1000
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hedging counters per prompt type
+
+        Returns:
+            requests, hedge_rate, hedge_wins, latency_won_ms (lower bound), extra
+            tokens spent on losing attempts, and the current threshold
+        """
+        with self._lock:
+            snapshot = {prompt_type: dict(stats) for prompt_type, stats in self._stats.items()}
+        report = {}
+        for prompt_type, stats in snapshot.items():
+            report[prompt_type] = {
+                **stats,
+                "latency_won_ms": round(stats["latency_won_ms"]),
+                "hedge_rate": round(stats["hedged"] / stats["requests"], 4) if stats["requests"] else 0.0,
+                "win_rate": round(stats["hedge_wins"] / stats["hedged"], 4) if stats["hedged"] else 0.0,
+                "threshold_ms": round(self.threshold(prompt_type) * 1000)
+            }
+        return {"enabled": self.ENABLED, "budget": self.BUDGET, "prompt_types": report}
+
+
+# Singleton instance
+request_hedger = RequestHedger()
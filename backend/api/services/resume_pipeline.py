@@ -0,0 +1,168 @@
+"""
+Resume Pipeline Service
+Parses and extracts an uploaded resume in one request, reporting each stage
+as an event as soon as it finishes.
+
+Compared with upload-resume followed by extract-from-resume, the text goes
+straight from the parser to the extractor instead of through the database,
+and the profile's resume fields are committed while the extractor runs.
+"""
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+import logging
+
+from config.database import SessionLocal
+from db.models.student_profile import StudentProfile
+from api.services.file_service import SavedUpload
+from api.services.pdf_parser import RESUME_MAX_CHARS, RESUME_MAX_PAGES
+from api.services.pdf_worker_pool import pdf_worker_pool, PoolSaturatedError
+from api.services.ai_extractor import ai_extractor
+from api.services.extraction_cache import extraction_cache, text_hash
+
+logger = logging.getLogger(__name__)
+
+TEXT_PREVIEW_CHARS = 500
+
+
+def extraction_summary(student: Any, extracted_data: Dict[str, Any], source: str) -> Dict[str, Any]:
+    """
+    Response payload for an extracted profile
+
+    Args:
+        student: StudentProfile after extraction was applied
+        extracted_data: Extraction result ({} when source is "profile")
+        source: "profile", "cache" or "extracted"
+
+    Returns:
+        Profile fields plus extraction metadata
+    """
+    return {
+        "student_id": student.id,
+        "name": student.name,
+        "email": student.email,
+        "gpa": float(student.gpa) if student.gpa else None,
+        "skills": student.skills,
+        "education": student.education,
+        "work_experience": student.work_experience,
+        "activities": student.activities,
+        "achievements": student.achievements,
+        "extraction_confidence": float(student.extraction_confidence) if student.extraction_confidence else 0,
+        "local_confidence": extracted_data.get("local_confidence"),
+        "llm_fields": extracted_data.get("llm_fields"),
+        "source": source
+    }
+
+
+class ResumePipeline:
+    """Parse -> extract for a saved upload, yielding (event, data) per stage"""
+
+    async def run(
+        self,
+        student_id: int,
+        filename: str,
+        upload: SavedUpload,
+        started_at: Optional[float] = None
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Run the pipeline for an upload already streamed to blob storage
+
+        Events, in order: "uploaded", "parsed", "extracted". A failing stage
+        yields ("error", {"status_code", "detail"}) and ends the pipeline.
+        Every event carries elapsed_ms since `started_at`.
+
+        Args:
+            student_id: Student profile ID
+            filename: Original file name
+            upload: Result of FileService.save_upload
+            started_at: time.perf_counter() at request start (default: now)
+
+        Yields:
+            (event name, event data)
+        """
+        started_at = started_at or time.perf_counter()
+
+        def event(name: str, data: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+            data["elapsed_ms"] = round((time.perf_counter() - started_at) * 1000)
+            return name, data
+
+        yield event("uploaded", {
+            "student_id": student_id,
+            "filename": filename,
+            "file_path": upload.filename,
+            "sha256": upload.sha256,
+            "size": upload.size
+        })
+
+        try:
+            resume_text = await pdf_worker_pool.extract_text(
+                upload.file_path,
+                digest=upload.sha256,
+                max_pages=RESUME_MAX_PAGES,
+                max_chars=RESUME_MAX_CHARS
+            )
+        except PoolSaturatedError:
+            yield event("error", {"status_code": 503, "detail": "Resume parser is busy, please retry shortly"})
+            return
+        if not resume_text:
+            yield event("error", {"status_code": 422, "detail": "Could not extract text from PDF"})
+            return
+
+        yield event("parsed", {
+            "text_length": len(resume_text),
+            "text_preview": resume_text[:TEXT_PREVIEW_CHARS]
+        })
+
+        # Own session: the request's session is closed before a streamed body is sent
+        db = SessionLocal()
+        extraction: Optional[asyncio.Future] = None
+        try:
+            student = db.query(StudentProfile).filter(StudentProfile.id == student_id).first()
+            if not student:
+                yield event("error", {"status_code": 404, "detail": "Student profile not found"})
+                return
+
+            student.resume_filename = filename
+            student.resume_file_path = upload.filename
+            student.resume_sha256 = upload.sha256
+            student.raw_resume_text = resume_text
+            student.profile_source = 'resume'
+
+            digest = text_hash(resume_text)
+            version = ai_extractor.version
+            memoized = extraction_cache.lookup(db, student, digest, version)
+            if memoized is None:
+                # Start the LLM call on the parsed text right away and save
+                # the upload while it runs (run_in_executor submits immediately)
+                extraction = asyncio.get_running_loop().run_in_executor(
+                    None, ai_extractor.extract_profile_from_resume, resume_text
+                )
+            db.commit()
+
+            if extraction is not None:
+                extracted_data, source = await extraction, "extracted"
+                extraction_cache.put(db, digest, version, extracted_data)
+                if not extracted_data.get("degraded"):
+                    extraction_cache.mark_current(student, digest, version)
+            else:
+                extracted_data, source = memoized
+
+            if source != "profile":
+                ai_extractor.apply_to_profile(student, extracted_data)
+            db.commit()
+            db.refresh(student)
+
+            yield event("extracted", extraction_summary(student, extracted_data, source))
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Resume pipeline failed for student {student_id}: {str(e)}")
+            yield event("error", {"status_code": 500, "detail": f"Extraction failed: {str(e)}"})
+        finally:
+            if extraction is not None and not extraction.done():
+                extraction.cancel()
+            db.close()
+
+
+# Singleton instance
+resume_pipeline = ResumePipeline()
@@ -0,0 +1,211 @@
+"""
+Section Segmenter Service
+Splits resume text into sections in one pass over the text.
+
+Header words are compiled into a trie. Only short, capitalized lines can be
+headings, and each word of such a line (at most MAX_HEADER_WORDS) is walked
+at most as far as the longest header word, so a scan is O(len(text)) overall,
+independent of the number of sections and keywords.
+
+Every word of a heading is looked up, not just the first: in "Professional
+Summary" or "Academic Achievements" the last word names the section. Head
+nouns win over modifier words, and among several the last one wins.
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Section name -> header keywords, in the order sections are reported
+SECTION_KEYWORDS = {
+    "contact": ["contact", "email", "phone", "address"],
+    "education": ["education", "academic", "university", "college", "degree"],
+    "experience": ["experience", "work", "employment", "professional"],
+    "skills": ["skills", "technical", "competencies", "technologies"],
+    "achievements": ["achievements", "awards", "honors", "accomplishments"],
+    "summary": ["summary", "objective", "profile", "about"],
+}
+
+# Headings that end the previous section but are not reported themselves
+OTHER_HEADERS = [
+    "references", "projects", "activities", "leadership", "research", "publications",
+    "volunteer", "volunteering", "certifications", "languages", "interests", "hobbies",
+]
+
+# Header words that usually qualify another ("Professional Summary", "Technical
+# Skills"); they name the section only when the heading has no other header word
+MODIFIER_KEYWORDS = {
+    "professional", "technical", "academic", "work", "university", "college", "degree",
+    "about", "profile", "email", "phone", "address",
+}
+# Lowercase words allowed inside a title-case heading
+HEADING_CONNECTORS = {"and", "of", "the", "for", "in", "at"}
+
+WORD_PATTERN = re.compile(r"[A-Za-z]+")
+
+# A heading line has at most this many words (unless it is an inline "Skills: ..." label)
+MAX_HEADER_WORDS = 4
+# Bullets and whitespace allowed before a heading word
+LEADING_CHARS = " \t•·-*▪◦>|"
+
+_END = "$"  # key of the (section, keyword length) payload in a trie node
+
+
+class SectionSegmenter:
+    """Finds every section header in one scan and returns each section's span"""
+
+    def __init__(
+        self,
+        section_keywords: Dict[str, List[str]] = SECTION_KEYWORDS,
+        other_headers: List[str] = OTHER_HEADERS,
+        modifier_keywords: set = MODIFIER_KEYWORDS
+    ):
+        self.section_names = list(section_keywords)
+        self.modifier_keywords = modifier_keywords
+        self.root: Dict[str, dict] = {}
+        for section, keywords in section_keywords.items():
+            for keyword in keywords:
+                self._add(keyword, section)
+        for keyword in other_headers:
+            self._add(keyword, None)
+
+    def _add(self, keyword: str, section: Optional[str]) -> None:
+        node = self.root
+        for char in keyword.lower():
+            node = node.setdefault(char, {})
+        # First registration wins, like the first matching keyword list
+        node.setdefault(_END, (section, keyword))
+
+    def _match_at(self, text_lower: str, start: int) -> Optional[Tuple[Optional[str], str]]:
+        """Longest header word starting at `start` that ends on a word boundary"""
+        node = self.root
+        best = None
+        i = start
+        n = len(text_lower)
+        while i < n:
+            node = node.get(text_lower[i])
+            if node is None:
+                break
+            i += 1
+            if _END in node and (i == n or not text_lower[i].isalnum()):
+                best = node[_END]
+        return best
+
+    def _match_heading(self, body: str) -> Optional[Tuple[Optional[str], str]]:
+        """
+        (section or None, header word) if a line is a heading
+
+        A heading is a short line, or a short label before ":" whose last word
+        names a reported section ("Technical Skills: ..."; "Languages: ..."
+        inside Skills must not end the Skills section). Header words after
+        the first word only count in a title-case heading, so a short
+        sentence that mentions "work" is not one.
+        """
+        colon = body.find(":")
+        head = body if colon == -1 else body[:colon]
+        if len(head.split()) > MAX_HEADER_WORDS:
+            return None
+        if colon == -1 and head.rstrip().endswith("."):
+            return None
+
+        head_lower = head.lower()
+        words = list(WORD_PATTERN.finditer(head))
+        matches = []  # (word index, section, keyword)
+        for index, word in enumerate(words):
+            match = self._match_at(head_lower, word.start())
+            if match is not None:
+                matches.append((index, match[0], match[1]))
+        if not matches:
+            return None
+        if matches[0][0] != 0 and not all(
+            word.group()[0].isupper() or word.group().lower() in HEADING_CONNECTORS for word in words
+        ):
+            return None
+
+        # Head nouns over modifiers; the last one names the section
+        nouns = [match for match in matches if match[2] not in self.modifier_keywords]
+        index, section, keyword = (nouns or matches)[-1]
+        if colon != -1 and (section is None or index != len(words) - 1):
+            return None
+        return section, keyword
+
+    def _headers(self, text: str) -> List[Tuple[Optional[str], str, int]]:
+        """(section or None, header word, start) of every heading in text order"""
+        headers = []
+        line_start = 0
+        for line in text.split("\n"):
+            line_end = line_start + len(line)
+            body = line.lstrip(LEADING_CHARS)
+            # Cheap reject before walking the trie: headings are capitalized
+            if body and body[0].isupper():
+                match = self._match_heading(body.rstrip())
+                if match is not None:
+                    section, keyword = match
+                    # Consecutive headings of one section (e.g. "Education"
+                    # then "University of X") stay one span
+                    if not headers or headers[-1][0] != section or section is None:
+                        headers.append((section, keyword, line_end - len(body)))
+            line_start = line_end + 1
+        return headers
+
+    def segment(self, text: str) -> List[Tuple[Optional[str], int, int]]:
+        """
+        Locate section spans
+
+        Args:
+            text: Raw resume text (line breaks preserved)
+
+        Returns:
+            List of (section name or None for other headings, start, end) in
+            text order; each span runs to the next heading
+        """
+        return [(section, start, end) for section, _, start, end in self._spans(text)]
+
+    def _spans(self, text: str) -> List[Tuple[Optional[str], str, int, int]]:
+        headers = self._headers(text)
+        spans = []
+        for index, (section, keyword, start) in enumerate(headers):
+            end = headers[index + 1][2] if index + 1 < len(headers) else len(text)
+            spans.append((section, keyword, start, end))
+        return spans
+
+    def labelled(self, text: str) -> List[Tuple[str, int, int]]:
+        """
+        Section spans labelled by section name, or by heading word for other headings
+
+        Args:
+            text: Raw resume text (line breaks preserved)
+
+        Returns:
+            List of (label, start, end), e.g. ("skills", ...) or ("certifications", ...)
+        """
+        return [(section or keyword, start, end) for section, keyword, start, end in self._spans(text)]
+
+    def sections(self, text: str) -> Dict[str, str]:
+        """
+        Text of every known section (empty string if absent)
+
+        Repeated sections are joined in text order. Without a contact heading,
+        the preamble before the first heading (name, email, phone) is contact.
+
+        Args:
+            text: Raw resume text
+
+        Returns:
+            Dictionary of section name -> section text
+        """
+        parts: Dict[str, List[str]] = {name: [] for name in self.section_names}
+        spans = self.segment(text)
+        for section, start, end in spans:
+            if section is not None:
+                parts[section].append(text[start:end].strip())
+
+        preamble_end = spans[0][1] if spans else len(text)
+        if "contact" in parts and not parts["contact"] and text[:preamble_end].strip():
+            parts["contact"].append(text[:preamble_end].strip())
+        return {name: "\n".join(chunks) for name, chunks in parts.items()}
+
+
+# Singleton instance
+section_segmenter = SectionSegmenter()
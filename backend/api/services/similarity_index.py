@@ -0,0 +1,347 @@
+"""
+Similarity Index Service
+"More like this" for scholarships using local hashed TF-IDF vectors
+and a random-hyperplane LSH index with incremental inserts
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+from api.services.text_vectorizer import HashedTfidfVectorizer
+
+logger = logging.getLogger(__name__)
+
+
+class VectorIndex:
+    """
+    Approximate nearest-neighbour index over L2-normalized float32 vectors
+
+    Each of `n_tables` hash tables buckets vectors by the sign pattern of
+    `n_bits` random hyperplanes. A query reranks the union of its buckets
+    exactly, and falls back to a full scan when the buckets are too sparse.
+    """
+
+    def __init__(self, dim: int, n_tables: int = 8, n_bits: int = 10, seed: int = 42):
+        self.dim = dim
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((dim, n_tables * n_bits)).astype(np.float32)
+        self._powers = (1 << np.arange(n_bits)).astype(np.int64)
+
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+        self._size = 0
+        self.ids: List[int] = []
+        self._row_of: Dict[int, int] = {}
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in range(n_tables)]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._row_of
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Live rows of the vector matrix"""
+        return self._matrix[:self._size]
+
+    def _hash_keys(self, vectors: np.ndarray) -> np.ndarray:
+        bits = (vectors @ self.planes) > 0
+        bits = bits.reshape(len(vectors), self.n_tables, self.n_bits)
+        return bits.astype(np.int64) @ self._powers  # (n, n_tables)
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        if needed <= len(self._matrix):
+            return
+        capacity = max(needed, 2 * len(self._matrix), 64)
+        grown = np.zeros((capacity, self.dim), dtype=np.float32)
+        grown[:self._size] = self._matrix[:self._size]
+        self._matrix = grown
+
+    def add(self, ids: List[int], vectors: np.ndarray) -> None:
+        """
+        Insert (or replace) vectors
+
+        Args:
+            ids: Item IDs, one per row
+            vectors: Float32 matrix of shape (len(ids), dim)
+        """
+        if len(ids) == 0:
+            return
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim)
+        keys = self._hash_keys(vectors)
+
+        self._reserve(len(ids))
+        for item_id, vector, item_keys in zip(ids, vectors, keys):
+            row = self._row_of.get(item_id)
+            if row is None:
+                row = self._size
+                self._size += 1
+                self.ids.append(item_id)
+                self._row_of[item_id] = row
+            else:
+                # Re-embedded item: drop its old bucket entries
+                self._unbucket(row)
+
+            self._matrix[row] = vector
+            self._bucket(row, item_keys)
+
+    def remove(self, ids: Iterable[int]) -> None:
+        """
+        Delete items; the last row moves into each freed slot
+
+        Args:
+            ids: Item IDs (unknown IDs are ignored)
+        """
+        for item_id in ids:
+            row = self._row_of.pop(item_id, None)
+            if row is None:
+                continue
+            self._unbucket(row)
+            last = self._size - 1
+            if row != last:
+                moved_id = self.ids[last]
+                self._unbucket(last)
+                self._matrix[row] = self._matrix[last]
+                self.ids[row] = moved_id
+                self._row_of[moved_id] = row
+                self._bucket(row, self._hash_keys(self._matrix[row:row + 1])[0])
+            self.ids.pop()
+            self._size -= 1
+
+    def _bucket(self, row: int, keys: np.ndarray) -> None:
+        for table, key in zip(self._tables, keys):
+            table.setdefault(int(key), []).append(row)
+
+    def _unbucket(self, row: int) -> None:
+        keys = self._hash_keys(self._matrix[row:row + 1])[0]
+        for table, key in zip(self._tables, keys):
+            bucket = table[int(key)]
+            bucket.remove(row)
+            if not bucket:
+                del table[int(key)]
+
+    def vector(self, item_id: int) -> Optional[np.ndarray]:
+        """Stored vector for an item, or None"""
+        row = self._row_of.get(item_id)
+        return None if row is None else self._matrix[row]
+
+    def search(self, query: np.ndarray, k: int = 5, exclude: Iterable[int] = ()) -> List[Tuple[int, float]]:
+        """
+        Approximate top-k cosine neighbours
+
+        Args:
+            query: L2-normalized query vector
+            k: Number of neighbours
+            exclude: Item IDs to leave out (e.g. the query item itself)
+
+        Returns:
+            List of (item_id, cosine similarity), best first
+        """
+        if self._size == 0 or k <= 0:
+            return []
+
+        query = np.asarray(query, dtype=np.float32).reshape(1, self.dim)
+        exclude_rows = {self._row_of[i] for i in exclude if i in self._row_of}
+
+        candidates = set()
+        for table, key in zip(self._tables, self._hash_keys(query)[0]):
+            candidates.update(table.get(int(key), ()))
+        candidates -= exclude_rows
+
+        if len(candidates) < k:
+            rows = np.array([r for r in range(self._size) if r not in exclude_rows], dtype=np.int64)
+        else:
+            rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        if len(rows) == 0:
+            return []
+
+        scores = self._matrix[rows] @ query[0]
+        top = min(k, len(rows))
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best])]
+        return [(self.ids[rows[i]], float(scores[i])) for i in best]
+
+    def save(self, directory: Path) -> None:
+        """
+        Persist vectors and IDs; hash tables are rebuilt on load
+
+        Args:
+            directory: Target directory
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, array in (("vectors.npy", self.matrix), ("ids.npy", np.array(self.ids, dtype=np.int64))):
+            tmp_path = directory / f".{name}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp_path, directory / name)
+
+    def load(self, directory: Path) -> bool:
+        """
+        Load vectors saved with save()
+
+        Args:
+            directory: Source directory
+
+        Returns:
+            True if an index was found and loaded
+        """
+        vectors_path = directory / "vectors.npy"
+        ids_path = directory / "ids.npy"
+        if not vectors_path.exists() or not ids_path.exists():
+            return False
+
+        vectors = np.load(vectors_path)
+        ids = np.load(ids_path).tolist()
+        if vectors.shape != (len(ids), self.dim):
+            logger.warning(f"Ignoring similarity index at {directory}: shape mismatch")
+            return False
+
+        self.add(ids, vectors)
+        return True
+
+
+class ScholarshipSimilarityService:
+    """Keeps one on-disk vector index per scholarship source (database or mock data)"""
+
+    INDEX_DIR = Path(os.getenv(
+        "SIMILARITY_INDEX_DIR",
+        str(Path(__file__).parent.parent.parent / "indexes" / "scholarships")
+    ))
+    N_FEATURES = 512
+    # Refit idf once the catalog has grown this much since the last fit
+    REFIT_GROWTH = 2.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._vectorizers: Dict[str, HashedTfidfVectorizer] = {}
+        self._indexes: Dict[str, VectorIndex] = {}
+        # Per source: scholarship ID -> version the stored vector was embedded from
+        self._versions: Dict[str, Dict[int, str]] = {}
+
+    @staticmethod
+    def document_text(scholarship: Dict[str, Any]) -> str:
+        """Text that gets embedded for a scholarship"""
+        return f"{scholarship.get('description') or ''}\n{scholarship.get('criteria') or ''}"
+
+    @classmethod
+    def document_version(cls, scholarship: Dict[str, Any]) -> str:
+        """Content hash of the embedded text, for catalogs without an updated_at"""
+        return hashlib.sha256(cls.document_text(scholarship).encode("utf-8")).hexdigest()
+
+    def _load(self, source: str) -> Tuple[HashedTfidfVectorizer, VectorIndex]:
+        if source not in self._indexes:
+            directory = self.INDEX_DIR / source
+            vectorizer_path = directory / "idf.npz"
+            versions_path = directory / "versions.json"
+            index = VectorIndex(dim=self.N_FEATURES)
+            versions: Dict[int, str] = {}
+            if vectorizer_path.exists() and index.load(directory):
+                vectorizer = HashedTfidfVectorizer.load(vectorizer_path)
+                if versions_path.exists():
+                    # Without versions every vector counts as stale and is re-embedded once
+                    with open(versions_path) as f:
+                        versions = {int(item_id): version for item_id, version in json.load(f).items()}
+                logger.info(f"Loaded {len(index)} scholarship vectors from {directory}")
+            else:
+                vectorizer = HashedTfidfVectorizer(n_features=self.N_FEATURES, signed=True)
+                index = VectorIndex(dim=self.N_FEATURES)
+            self._vectorizers[source] = vectorizer
+            self._indexes[source] = index
+            self._versions[source] = versions
+        return self._vectorizers[source], self._indexes[source]
+
+    def _save(self, source: str) -> None:
+        directory = self.INDEX_DIR / source
+        try:
+            self._indexes[source].save(directory)
+            self._vectorizers[source].save(directory / "idf.npz")
+            tmp_path = directory / ".versions.json.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({str(item_id): version for item_id, version in self._versions[source].items()}, f)
+            os.replace(tmp_path, directory / "versions.json")
+        except OSError as e:
+            logger.error(f"Failed to persist similarity index: {e}")
+
+    def sync(
+        self,
+        source: str,
+        catalog: Dict[int, str],
+        fetch: Callable[[List[int]], List[Dict[str, Any]]]
+    ) -> None:
+        """
+        Bring the index in line with the catalog: embed new and changed
+        scholarships, drop deleted ones
+
+        Args:
+            source: 'database' or 'mock_data'
+            catalog: Every scholarship ID currently in the catalog mapped to its
+                version (updated_at or document_version()); a changed version
+                means the scholarship is re-embedded
+            fetch: Loads scholarship dicts (id, description, criteria) by ID
+        """
+        with self._lock:
+            vectorizer, index = self._load(source)
+            versions = self._versions[source]
+            deleted = [i for i in index.ids if i not in catalog]
+            stale = [i for i, version in catalog.items() if versions.get(i) != version]
+            if not deleted and not stale:
+                return
+
+            index.remove(deleted)
+            for item_id in deleted:
+                versions.pop(item_id, None)
+            added = sum(1 for i in stale if i not in index)
+
+            if vectorizer.n_docs == 0 or len(index) + added >= self.REFIT_GROWTH * vectorizer.n_docs:
+                # Catalog changed shape - refit idf and re-embed everything
+                logger.info(f"Refitting scholarship idf ({len(catalog)} documents)")
+                scholarships = fetch(list(catalog))
+                vectorizer = HashedTfidfVectorizer(n_features=self.N_FEATURES, signed=True)
+                vectorizer.partial_fit(self.document_text(s) for s in scholarships)
+                index = VectorIndex(dim=self.N_FEATURES)
+                versions = {}
+                self._vectorizers[source] = vectorizer
+                self._indexes[source] = index
+                self._versions[source] = versions
+            elif stale:
+                scholarships = fetch(stale)
+            else:
+                scholarships = []
+
+            texts = [self.document_text(s) for s in scholarships]
+            index.add([s["id"] for s in scholarships], vectorizer.transform_dense(texts))
+            for s in scholarships:
+                versions[s["id"]] = catalog[s["id"]]
+            self._save(source)
+
+    def similar(self, source: str, scholarship_id: int, k: int = 5) -> Optional[List[Tuple[int, float]]]:
+        """
+        Nearest scholarships to an indexed scholarship
+
+        Args:
+            source: 'database' or 'mock_data'
+            scholarship_id: Query scholarship
+            k: Number of results
+
+        Returns:
+            List of (scholarship_id, score), or None if the ID is not indexed
+        """
+        with self._lock:
+            _, index = self._load(source)
+            query = index.vector(scholarship_id)
+            if query is None:
+                return None
+            return index.search(query, k=k, exclude=[scholarship_id])
+
+
+# Singleton instance
+similarity_service = ScholarshipSimilarityService()
@@ -0,0 +1,192 @@
+"""
+Skill Taxonomy Service
+Finds known skills (and their aliases) in free text in one pass.
+
+The taxonomy is a tab-separated data file (canonical name, category, aliases)
+compiled once into a trie over word tokens. Text is tokenized with a single
+regex scan and each token start walks the trie at most as far as the longest
+alias (in tokens), so a scan is O(len(text)) whatever the taxonomy size.
+Matching whole tokens makes it word-boundary aware: "Java" is not found in
+"JavaScript", and "machine-learning" matches "machine learning".
+"""
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Default taxonomy shipped with the repo (data/skill_taxonomy.tsv)
+SKILL_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH",
+    str(Path(__file__).parent.parent.parent.parent / "data" / "skill_taxonomy.tsv")
+)
+
+# Word tokens, keeping the punctuation skill names use inside a word
+# (C++, C#, R&D, Node.js, .NET); a trailing period is not part of the token
+TOKEN_PATTERN = re.compile(r"\.?[A-Za-z0-9][A-Za-z0-9+#&]*(?:\.[A-Za-z0-9+#&]+)*")
+
+EXACT_PREFIX = "="  # alias must match case exactly
+ALIAS_SEPARATOR = "|"
+
+_END = "$"  # key of the match payload in a trie node
+
+
+class SkillMatch(NamedTuple):
+    """One skill occurrence in a text"""
+    skill: str  # Canonical name
+    category: str
+    start: int  # Character span of the matched alias
+    end: int
+
+
+class SkillTaxonomy:
+    """Skills and aliases compiled into a token trie"""
+
+    def __init__(self, entries: Iterable[Tuple[str, str, List[str]]] = ()):
+        """
+        Args:
+            entries: (canonical name, category, aliases) triples
+        """
+        self.skills: List[Tuple[str, str]] = []
+        self.root: Dict[str, dict] = {}
+        self.max_alias_tokens = 0
+        for name, category, aliases in entries:
+            self.add(name, category, aliases)
+
+    @classmethod
+    def load(cls, path: str) -> "SkillTaxonomy":
+        """
+        Build a taxonomy from a data file
+
+        Lines are "name<TAB>category<TAB>alias|alias|..."; blank lines and
+        lines starting with "#" are skipped.
+
+        Args:
+            path: Taxonomy file
+
+        Returns:
+            SkillTaxonomy (empty if the file is missing)
+        """
+        taxonomy = cls()
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line_number, line in enumerate(f, 1):
+                    line = line.rstrip("\n")
+                    if not line.strip() or line.startswith("#"):
+                        continue
+                    parts = line.split("\t")
+                    if len(parts) < 2:
+                        logger.warning(f"Skipping malformed taxonomy line {line_number} in {path}")
+                        continue
+                    aliases = parts[2].split(ALIAS_SEPARATOR) if len(parts) > 2 else []
+                    taxonomy.add(parts[0].strip(), parts[1].strip(), aliases)
+        except FileNotFoundError:
+            logger.warning(f"Skill taxonomy not found at {path}, skill matching disabled")
+            return taxonomy
+
+        logger.info(f"Loaded {len(taxonomy)} skills from {path}")
+        return taxonomy
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def add(self, name: str, category: str, aliases: Iterable[str] = ()) -> None:
+        """
+        Register a skill under its name and aliases
+
+        The name is matched case-insensitively unless it is also listed as an
+        exact alias ("=Go"), in which case only that casing matches.
+
+        Args:
+            name: Canonical skill name
+            category: Skill category
+            aliases: Alternative names; a leading "=" requires an exact-case match
+        """
+        skill_id = len(self.skills)
+        self.skills.append((name, category))
+
+        aliases = [alias.strip() for alias in aliases if alias.strip()]
+        exact = {alias[len(EXACT_PREFIX):] for alias in aliases if alias.startswith(EXACT_PREFIX)}
+        if name not in exact:
+            self._add_alias(name, skill_id, exact=False)
+        for alias in aliases:
+            if alias.startswith(EXACT_PREFIX):
+                self._add_alias(alias[len(EXACT_PREFIX):], skill_id, exact=True)
+            else:
+                self._add_alias(alias, skill_id, exact=False)
+
+    def _add_alias(self, alias: str, skill_id: int, exact: bool) -> None:
+        tokens = TOKEN_PATTERN.findall(alias)
+        if not tokens:
+            return
+        self.max_alias_tokens = max(self.max_alias_tokens, len(tokens))
+        node = self.root
+        for token in tokens:
+            node = node.setdefault(token.lower(), {})
+        payload = node.setdefault(_END, [])
+        surface = tuple(tokens) if exact else None
+        # First registration of a case-insensitive alias wins
+        if surface is None and any(existing is None for _, existing in payload):
+            return
+        payload.append((skill_id, surface))
+
+    def scan(self, text: str) -> Iterator[SkillMatch]:
+        """
+        Skill occurrences in text order (longest alias wins, no overlaps)
+
+        Args:
+            text: Text to scan
+
+        Yields:
+            SkillMatch per occurrence
+        """
+        if not text or not self.root:
+            return
+        tokens = [(match.group(), match.start(), match.end()) for match in TOKEN_PATTERN.finditer(text)]
+        lowered = [token.lower() for token, _, _ in tokens]
+        n = len(tokens)
+        i = 0
+        while i < n:
+            node = self.root
+            best: Optional[Tuple[int, int]] = None  # (skill id, end token)
+            j = i
+            while j < n and j - i < self.max_alias_tokens:
+                node = node.get(lowered[j])
+                if node is None:
+                    break
+                j += 1
+                for skill_id, surface in node.get(_END, ()):
+                    if surface is None or surface == tuple(token for token, _, _ in tokens[i:j]):
+                        best = (skill_id, j)
+                        break
+            if best is None:
+                i += 1
+                continue
+            skill_id, end = best
+            name, category = self.skills[skill_id]
+            yield SkillMatch(name, category, tokens[i][1], tokens[end - 1][2])
+            i = end
+
+    def find(self, text: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Distinct skills mentioned in a text, in order of first mention
+
+        Args:
+            text: Text to scan
+            limit: Return at most this many skills
+
+        Returns:
+            Canonical skill names
+        """
+        found: Dict[str, None] = {}
+        for match in self.scan(text):
+            found.setdefault(match.skill)
+            if limit is not None and len(found) >= limit:
+                break
+        return list(found)
+
+
+# Singleton instance
+skill_taxonomy = SkillTaxonomy.load(SKILL_TAXONOMY_PATH)
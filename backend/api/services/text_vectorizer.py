@@ -0,0 +1,186 @@
+"""
+Text Vectorizer Service
+Local hashed TF-IDF vectors - no network, no GPU, no vocabulary to ship
+"""
+import re
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Two or more characters, starting with a letter
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9+#]+")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been
+before being below between both but by can could did do does doing down during each
+few for from further had has have having he her here hers herself him himself his how
+i if in into is it its itself just me more most my myself no nor not now of off on
+once only or other our ours ourselves out over own same she should so some such than
+that the their theirs them themselves then there these they this those through to too
+under until up very was we were what when where which while who whom why will with
+would you your yours yourself yourselves
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase word tokens with stopwords removed
+
+    Args:
+        text: Raw text
+
+    Returns:
+        List of tokens in document order
+    """
+    if not text:
+        return []
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+class HashedTfidfVectorizer:
+    """
+    TF-IDF over hashed feature buckets
+
+    Tokens are mapped to buckets with crc32 (stable across processes, unlike
+    the builtin hash()), so the only state is the document-frequency vector.
+    """
+
+    def __init__(self, n_features: int = 2 ** 15, signed: bool = False):
+        self.n_features = n_features
+        # Signed hashing halves collision bias for small dense vectors
+        self.signed = signed
+        self.doc_freq = np.zeros(n_features, dtype=np.int64)
+        self.n_docs = 0
+        self._bucket_cache: Dict[str, int] = {}
+        # First token seen per bucket, so hashed features can be read back as keywords
+        self.bucket_terms: Dict[int, str] = {}
+
+    def _bucket(self, token: str) -> int:
+        bucket = self._bucket_cache.get(token)
+        if bucket is None:
+            bucket = zlib.crc32(token.encode("utf-8"))
+            if len(self._bucket_cache) < 500_000:
+                self._bucket_cache[token] = bucket
+                self.bucket_terms.setdefault(bucket % self.n_features, token)
+        return bucket
+
+    def term_counts(self, text: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Hash a document into sorted unique buckets
+
+        Args:
+            text: Document text
+
+        Returns:
+            Tuple of (bucket indices, term counts, hash signs)
+        """
+        token_counts = Counter(tokenize(text))
+        if not token_counts:
+            empty = np.zeros(0, dtype=np.float32)
+            return np.zeros(0, dtype=np.int64), empty, empty
+
+        # Hash each distinct token once rather than every occurrence
+        n_unique = len(token_counts)
+        hashes = np.fromiter(map(self._bucket, token_counts), dtype=np.int64, count=n_unique)
+        term_freq = np.fromiter(token_counts.values(), dtype=np.float32, count=n_unique)
+        buckets = hashes % self.n_features
+        signs = np.where((hashes >> 31) & 1, -1.0, 1.0).astype(np.float32)
+
+        indices, inverse = np.unique(buckets, return_inverse=True)
+        counts = np.bincount(inverse, weights=term_freq).astype(np.float32)
+        # Sign of a bucket is the sign of its first token; collisions are rare
+        bucket_signs = np.ones(len(indices), dtype=np.float32)
+        bucket_signs[inverse[::-1]] = signs[::-1]
+        return indices, counts, bucket_signs
+
+    def partial_fit(self, texts: Iterable[str]) -> "HashedTfidfVectorizer":
+        """
+        Update document frequencies with more documents
+
+        Args:
+            texts: Documents to count
+
+        Returns:
+            self
+        """
+        for text in texts:
+            indices, _, _ = self.term_counts(text)
+            self.doc_freq[indices] += 1
+            self.n_docs += 1
+        return self
+
+    @property
+    def idf(self) -> np.ndarray:
+        """Smoothed inverse document frequency per bucket"""
+        return (np.log((1.0 + self.n_docs) / (1.0 + self.doc_freq)) + 1.0).astype(np.float32)
+
+    def transform_sparse(self, text: str, idf: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorize one document as an L2-normalized sparse vector
+
+        Args:
+            text: Document text
+            idf: Precomputed idf vector (pass it when transforming many docs)
+
+        Returns:
+            Tuple of (bucket indices, weights)
+        """
+        indices, counts, signs = self.term_counts(text)
+        if len(indices) == 0:
+            return indices, counts
+
+        if idf is None:
+            idf = self.idf
+        values = (1.0 + np.log(counts)) * idf[indices]
+        if self.signed:
+            values *= signs
+
+        norm = np.sqrt(np.dot(values, values))
+        if norm > 0:
+            values /= norm
+        return indices, values.astype(np.float32)
+
+    def transform_dense(self, texts: List[str]) -> np.ndarray:
+        """
+        Vectorize documents into a dense float32 matrix
+
+        Args:
+            texts: Documents
+
+        Returns:
+            Matrix of shape (len(texts), n_features), rows L2-normalized
+        """
+        idf = self.idf
+        matrix = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            indices, values = self.transform_sparse(text, idf)
+            matrix[row, indices] = values
+        return matrix
+
+    def save(self, path: Path) -> None:
+        """Persist document frequencies (and bucket keywords) to an .npz file"""
+        np.savez(
+            path,
+            doc_freq=self.doc_freq,
+            meta=np.array([self.n_features, self.n_docs, int(self.signed)], dtype=np.int64),
+            term_buckets=np.fromiter(self.bucket_terms.keys(), dtype=np.int64, count=len(self.bucket_terms)),
+            terms=np.array(list(self.bucket_terms.values()), dtype=str),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "HashedTfidfVectorizer":
+        """Restore a vectorizer saved with save()"""
+        with np.load(path) as data:
+            n_features, n_docs, signed = (int(v) for v in data["meta"])
+            vectorizer = cls(n_features=n_features, signed=bool(signed))
+            vectorizer.doc_freq = data["doc_freq"].astype(np.int64)
+            vectorizer.n_docs = n_docs
+            if "terms" in data.files:
+                vectorizer.bucket_terms = dict(zip(data["term_buckets"].tolist(), data["terms"].tolist()))
+        return vectorizer
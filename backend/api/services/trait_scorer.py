@@ -0,0 +1,145 @@
+"""
+Trait Scorer Service
+Lexicon-based scoring of text against the six persona traits, plus skills from
+the shared skill taxonomy (multi-word skills like "machine learning" that the
+single-word lexicon cannot see)
+"""
+from collections import Counter
+from typing import Dict, List
+import logging
+
+from api.services.text_vectorizer import tokenize
+from api.services.skill_taxonomy import SkillTaxonomy, skill_taxonomy
+
+logger = logging.getLogger(__name__)
+
+# Same trait keys as the persona "weights" genome
+TRAITS = ["Academics", "Leadership", "Community", "Innovation", "FinancialNeed", "Research"]
+
+TRAIT_LEXICON: Dict[str, List[str]] = {
+    "Academics": [
+        "academic", "academics", "gpa", "grades", "honors", "honor", "dean", "coursework",
+        "curriculum", "class", "classes", "course", "courses", "exam", "exams", "study",
+        "studies", "studying", "scholar", "scholarly", "learning", "learn", "learned",
+        "degree", "major", "mathematics", "math", "physics", "chemistry", "biology",
+        "literature", "ap", "ib", "valedictorian", "tutoring", "tutor", "education", "school",
+        "university", "college", "intellectual", "excellence", "merit", "knowledge",
+    ],
+    "Leadership": [
+        "lead", "leader", "leaders", "leadership", "led", "leading", "captain", "president",
+        "founder", "founded", "organized", "organize", "organizing", "initiative", "initiated",
+        "managed", "manage", "directed", "coordinated", "spearheaded", "team", "teams",
+        "mentor", "mentored", "mentoring", "delegate", "vision", "inspire", "inspired",
+        "chair", "chaired", "head", "officer", "responsibility", "responsible", "motivate",
+    ],
+    "Community": [
+        "community", "communities", "volunteer", "volunteered", "volunteering", "service",
+        "serve", "served", "nonprofit", "charity", "outreach", "neighborhood", "local",
+        "helping", "help", "helped", "empathy", "compassion", "social", "shelter", "food",
+        "donate", "donated", "fundraiser", "fundraising", "youth", "underserved", "civic",
+        "grassroots", "impact", "families", "inclusion", "equity", "support", "care",
+    ],
+    "Innovation": [
+        "innovation", "innovative", "innovate", "invent", "invented", "invention", "build",
+        "built", "building", "design", "designed", "prototype", "startup", "entrepreneur",
+        "entrepreneurial", "entrepreneurship", "app", "software", "code", "coding", "coded",
+        "robotics", "robot", "engineering", "technology", "tech", "ai", "creative",
+        "creativity", "hackathon", "developed", "develop", "solution", "solutions", "product",
+    ],
+    "FinancialNeed": [
+        "financial", "finances", "afford", "afforded", "affordable", "tuition", "debt",
+        "loan", "loans", "income", "low", "poverty", "hardship", "hardships", "struggle",
+        "struggled", "struggles", "job", "jobs", "worked", "working", "paycheck", "rent",
+        "expenses", "sacrifice", "sacrificed", "first", "generation", "immigrant", "single",
+        "parent", "support", "assistance", "need", "needs", "resilience", "resilient",
+    ],
+    "Research": [
+        "research", "researcher", "researched", "researching", "lab", "laboratory",
+        "experiment", "experiments", "experimental", "hypothesis", "data", "analysis",
+        "analyzed", "study", "publication", "published", "paper", "papers", "journal",
+        "professor", "investigation", "investigated", "scientific", "science", "scientist",
+        "findings", "results", "method", "methods", "thesis", "dissertation", "poster",
+        "conference", "peer", "reviewed", "model", "models", "statistical",
+    ],
+}
+
+
+# Skill taxonomy category -> trait its skills count towards
+CATEGORY_TRAITS: Dict[str, str] = {
+    "programming": "Innovation",
+    "web": "Innovation",
+    "database": "Innovation",
+    "ai": "Innovation",
+    "cloud": "Innovation",
+    "devops": "Innovation",
+    "security": "Innovation",
+    "mobile": "Innovation",
+    "software": "Innovation",
+    "engineering": "Innovation",
+    "design": "Innovation",
+    "data": "Research",
+    "science": "Research",
+    "research": "Research",
+    "leadership": "Leadership",
+    "community": "Community",
+    "healthcare": "Community",
+    "education": "Academics",
+}
+
+
+class TraitScorer:
+    """Counts lexicon and taxonomy skill hits per trait in one pass over the text each"""
+
+    def __init__(
+        self,
+        lexicon: Dict[str, List[str]] = TRAIT_LEXICON,
+        taxonomy: SkillTaxonomy = skill_taxonomy,
+        category_traits: Dict[str, str] = CATEGORY_TRAITS
+    ):
+        self.token_traits: Dict[str, List[str]] = {}
+        for trait, words in lexicon.items():
+            for word in words:
+                self.token_traits.setdefault(word, []).append(trait)
+        self.taxonomy = taxonomy
+        self.category_traits = category_traits
+
+    def trait_counts(self, text: str) -> Dict[str, int]:
+        """
+        Count lexicon and skill hits per trait
+
+        Args:
+            text: Text to score
+
+        Returns:
+            Dictionary of trait -> hit count
+        """
+        counts = dict.fromkeys(TRAITS, 0)
+        for token, n in Counter(tokenize(text)).items():
+            for trait in self.token_traits.get(token, ()):
+                counts[trait] += n
+        for match in self.taxonomy.scan(text):
+            trait = self.category_traits.get(match.category)
+            # Single words already in the lexicon were counted above
+            if trait and text[match.start:match.end].lower() not in self.token_traits:
+                counts[trait] += 1
+        return counts
+
+    def score(self, text: str) -> Dict[str, float]:
+        """
+        Trait distribution of a text (sums to 1.0, or all zeros if no hits)
+
+        Args:
+            text: Text to score
+
+        Returns:
+            Dictionary of trait -> weight
+        """
+        counts = self.trait_counts(text)
+        total = sum(counts.values())
+        if total == 0:
+            return dict.fromkeys(TRAITS, 0.0)
+        return {trait: count / total for trait, count in counts.items()}
+
+
+# Singleton instance
+trait_scorer = TraitScorer()
@@ -22,7 +22,8 @@ from db.models import (
     Essay,
     Evaluation,
     WinnerEssayCluster,
-    APILog
+    APILog,
+    ExtractionResult
 )
 
 # this is the Alembic Config object
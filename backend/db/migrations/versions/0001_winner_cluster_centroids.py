@@ -0,0 +1,31 @@
+"""Add centroid, essay_count and updated_at to winner_essay_clusters
+
+Revision ID: 0001_winner_cluster_centroids
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_winner_cluster_centroids'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('winner_essay_clusters', sa.Column('centroid', sa.LargeBinary(), nullable=True))
+    op.add_column('winner_essay_clusters', sa.Column('essay_count', sa.Integer(), nullable=True))
+    op.add_column(
+        'winner_essay_clusters',
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.func.current_timestamp(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('winner_essay_clusters', 'updated_at')
+    op.drop_column('winner_essay_clusters', 'essay_count')
+    op.drop_column('winner_essay_clusters', 'centroid')
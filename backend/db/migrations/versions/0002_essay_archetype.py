@@ -0,0 +1,26 @@
+"""Add nearest-archetype tag to essays
+
+Revision ID: 0002_essay_archetype
+Revises: 0001_winner_cluster_centroids
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_essay_archetype'
+down_revision = '0001_winner_cluster_centroids'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('essays', sa.Column('archetype_cluster_id', sa.Integer(), nullable=True))
+    op.add_column('essays', sa.Column('archetype_similarity', sa.DECIMAL(4, 3), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('essays', 'archetype_similarity')
+    op.drop_column('essays', 'archetype_cluster_id')
@@ -0,0 +1,25 @@
+"""Record which scorer produced an evaluation
+
+Revision ID: 0003_evaluation_scorer
+Revises: 0002_essay_archetype
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_evaluation_scorer'
+down_revision = '0002_essay_archetype'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Every evaluation stored before this revision came from Claude
+    op.add_column('evaluations', sa.Column('scorer', sa.String(20), server_default='llm', nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('evaluations', 'scorer')
@@ -0,0 +1,47 @@
+"""Add typed persona weight columns and backfill them from the JSONB genome
+
+Revision ID: 0004_persona_weight_columns
+Revises: 0003_evaluation_scorer
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_persona_weight_columns'
+down_revision = '0003_evaluation_scorer'
+branch_labels = None
+depends_on = None
+
+WEIGHT_COLUMNS = {
+    "Academics": "weight_academics",
+    "Leadership": "weight_leadership",
+    "Community": "weight_community",
+    "Innovation": "weight_innovation",
+    "FinancialNeed": "weight_financial_need",
+    "Research": "weight_research",
+}
+
+
+def upgrade() -> None:
+    for column in WEIGHT_COLUMNS.values():
+        op.add_column('personas', sa.Column(column, sa.Float(), nullable=False, server_default='0'))
+
+    # Backfill in one UPDATE per dialect
+    if op.get_bind().dialect.name == 'postgresql':
+        extract = "COALESCE((weights->>'{trait}')::float, 0)"
+    else:
+        extract = "COALESCE(CAST(json_extract(weights, '$.{trait}') AS REAL), 0)"
+
+    assignments = ", ".join(
+        f"{column} = {extract.format(trait=trait)}"
+        for trait, column in WEIGHT_COLUMNS.items()
+    )
+    op.execute(f"UPDATE personas SET {assignments} WHERE weights IS NOT NULL")
+
+
+def downgrade() -> None:
+    for column in reversed(list(WEIGHT_COLUMNS.values())):
+        op.drop_column('personas', column)
@@ -0,0 +1,26 @@
+"""Reference resume uploads by content hash
+
+Revision ID: 0005_resume_content_hash
+Revises: 0004_persona_weight_columns
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_resume_content_hash'
+down_revision = '0004_persona_weight_columns'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('student_profiles', sa.Column('resume_sha256', sa.String(64), nullable=True))
+    op.create_index('ix_student_profiles_resume_sha256', 'student_profiles', ['resume_sha256'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_student_profiles_resume_sha256', table_name='student_profiles')
+    op.drop_column('student_profiles', 'resume_sha256')
@@ -0,0 +1,42 @@
+"""Memoize resume extractions by normalized text hash and extractor version
+
+Revision ID: 0006_extraction_memo
+Revises: 0005_resume_content_hash
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_extraction_memo'
+down_revision = '0005_resume_content_hash'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('student_profiles', sa.Column('extraction_text_sha256', sa.String(64), nullable=True))
+    op.add_column('student_profiles', sa.Column('extractor_version', sa.String(64), nullable=True))
+
+    op.create_table(
+        'extraction_results',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('text_sha256', sa.String(64), nullable=False),
+        sa.Column('extractor_version', sa.String(64), nullable=False),
+        sa.Column('result', postgresql.JSONB(), nullable=True),
+        sa.Column('hit_count', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.current_timestamp(), nullable=True),
+        sa.Column('last_used_at', sa.TIMESTAMP(), server_default=sa.func.current_timestamp(), nullable=True),
+        sa.UniqueConstraint('text_sha256', 'extractor_version', name='uq_extraction_results_text_version')
+    )
+    op.create_index('ix_extraction_results_id', 'extraction_results', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_extraction_results_id', table_name='extraction_results')
+    op.drop_table('extraction_results')
+    op.drop_column('student_profiles', 'extractor_version')
+    op.drop_column('student_profiles', 'extraction_text_sha256')
@@ -0,0 +1,28 @@
+"""Record the routed model and token split of each Claude call
+
+Revision ID: 0007_api_log_routes
+Revises: 0006_extraction_memo
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_api_log_routes'
+down_revision = '0006_extraction_memo'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('api_logs', sa.Column('model', sa.String(100), nullable=True))
+    op.add_column('api_logs', sa.Column('input_tokens', sa.Integer(), nullable=True))
+    op.add_column('api_logs', sa.Column('output_tokens', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('api_logs', 'output_tokens')
+    op.drop_column('api_logs', 'input_tokens')
+    op.drop_column('api_logs', 'model')
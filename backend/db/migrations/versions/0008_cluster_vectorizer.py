@@ -0,0 +1,32 @@
+"""Store the winner cluster idf state next to the centroids
+
+Revision ID: 0008_cluster_vectorizer
+Revises: 0007_api_log_routes
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_cluster_vectorizer'
+down_revision = '0007_api_log_routes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'winner_cluster_vectorizer',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('n_features', sa.Integer(), nullable=False),
+        sa.Column('n_docs', sa.Integer(), nullable=False),
+        sa.Column('signed', sa.Boolean(), nullable=True),
+        sa.Column('doc_freq', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.func.current_timestamp(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('winner_cluster_vectorizer')
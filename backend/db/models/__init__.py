@@ -6,8 +6,9 @@ from .student_profile import StudentProfile
 from .persona import Persona
 from .essay import Essay
 from .evaluation import Evaluation
-from .winner_cluster import WinnerEssayCluster
+from .winner_cluster import WinnerEssayCluster, WinnerClusterVectorizer
 from .api_log import APILog
+from .extraction_result import ExtractionResult
 
 __all__ = [
     "Scholarship",
@@ -16,5 +17,7 @@ __all__ = [
     "Essay",
     "Evaluation",
     "WinnerEssayCluster",
+    "WinnerClusterVectorizer",
     "APILog",
+    "ExtractionResult",
 ]
@@ -16,9 +16,12 @@ class APILog(Base):
     id = Column(Integer, primary_key=True, index=True)
     endpoint = Column(String(100))
     prompt_type = Column(String(50))  # 'persona_builder', 'essay_generator', etc.
+    model = Column(String(100))  # Model the prompt type was routed to
     request_payload = Column(JSONB)
     response_payload = Column(JSONB)
-    tokens_used = Column(Integer)
+    input_tokens = Column(Integer)
+    output_tokens = Column(Integer)
+    tokens_used = Column(Integer)  # input + output
     latency_ms = Column(Integer)
     status = Column(String(20))  # 'success', 'error', 'timeout'
     error_message = Column(Text)
@@ -30,6 +30,8 @@ class Essay(Base):
     tone_used = Column(String(100))
     overall_alignment = Column(DECIMAL(4, 3))
     summary = Column(Text)
+    archetype_cluster_id = Column(Integer)  # Nearest WinnerEssayCluster.cluster_id
+    archetype_similarity = Column(DECIMAL(4, 3))  # Cosine similarity to that centroid
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
 
     # Constraints
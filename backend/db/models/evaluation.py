@@ -1,7 +1,7 @@
 """
 Evaluation model
 """
-from sqlalchemy import Column, Integer, Text, DECIMAL, TIMESTAMP, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Text, DECIMAL, TIMESTAMP, ForeignKey, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from config.database import Base
@@ -36,6 +36,7 @@ class Evaluation(Base):
     tone_consistency_score = Column(DECIMAL(4, 3))
     summary = Column(Text)
     recommendation = Column(Text)
+    scorer = Column(String(20), server_default='llm')  # 'local' (fast) or 'llm' (deep)
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
 
     # Relationships
@@ -0,0 +1,30 @@
+"""
+Extraction Result model
+"""
+from sqlalchemy import Column, Integer, String, TIMESTAMP, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import JSONB
+from config.database import Base
+
+
+class ExtractionResult(Base):
+    """
+    Memoized resume extractions
+    Shared by every profile whose resume normalizes to the same text
+    """
+    __tablename__ = "extraction_results"
+
+    id = Column(Integer, primary_key=True, index=True)
+    text_sha256 = Column(String(64), nullable=False)  # Hash of the normalized resume text
+    extractor_version = Column(String(64), nullable=False)  # AIExtractor.version that produced it
+    result = Column(JSONB)  # extract_profile_from_resume output
+    hit_count = Column(Integer, default=0)
+    created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
+    last_used_at = Column(TIMESTAMP, server_default=func.current_timestamp())
+
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint('text_sha256', 'extractor_version', name='uq_extraction_results_text_version'),
+    )
+
+    def __repr__(self):
+        return f"<ExtractionResult(id={self.id}, text_sha256='{self.text_sha256[:12]}')>"
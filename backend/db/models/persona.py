@@ -1,11 +1,21 @@
 """
 Persona model
 """
-from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey, CheckConstraint, func
+from sqlalchemy import Column, Integer, String, Text, Float, TIMESTAMP, ForeignKey, CheckConstraint, func
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from config.database import Base
 
+# Trait key in the weights genome -> typed column
+WEIGHT_COLUMNS = {
+    "Academics": "weight_academics",
+    "Leadership": "weight_leadership",
+    "Community": "weight_community",
+    "Innovation": "weight_innovation",
+    "FinancialNeed": "weight_financial_need",
+    "Research": "weight_research",
+}
+
 
 class Persona(Base):
     """
@@ -23,10 +33,29 @@ class Persona(Base):
     version = Column(Integer, default=1)  # Track re-analysis
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
 
+    # Typed copies of `weights` so matching can rank in SQL without parsing JSON
+    weight_academics = Column(Float, nullable=False, default=0.0, server_default="0")
+    weight_leadership = Column(Float, nullable=False, default=0.0, server_default="0")
+    weight_community = Column(Float, nullable=False, default=0.0, server_default="0")
+    weight_innovation = Column(Float, nullable=False, default=0.0, server_default="0")
+    weight_financial_need = Column(Float, nullable=False, default=0.0, server_default="0")
+    weight_research = Column(Float, nullable=False, default=0.0, server_default="0")
+
     # Relationships
     scholarship = relationship("Scholarship", back_populates="personas")
     essays = relationship("Essay", back_populates="persona", cascade="all, delete-orphan")
     evaluations = relationship("Evaluation", back_populates="persona", cascade="all, delete-orphan")
 
+    @validates("weights")
+    def _sync_weight_columns(self, key, weights):
+        """Keep the typed weight columns in step with the JSONB genome"""
+        for trait, column in WEIGHT_COLUMNS.items():
+            try:
+                value = float((weights or {}).get(trait, 0.0) or 0.0)
+            except (TypeError, ValueError):
+                value = 0.0
+            setattr(self, column, value)
+        return weights
+
     def __repr__(self):
         return f"<Persona(id={self.id}, name='{self.persona_name}')>"
@@ -27,6 +27,7 @@ class StudentProfile(Base):
     profile_source = Column(String(50), default='manual')  # 'manual', 'resume', 'ai_extracted'
     resume_filename = Column(String(255))
     resume_file_path = Column(String(500))
+    resume_sha256 = Column(String(64), index=True)  # Content address of the stored PDF blob
     raw_resume_text = Column(Text)  # Extracted text from resume
 
     # Enhanced profile fields from AI extraction
@@ -41,6 +42,8 @@ class StudentProfile(Base):
     # AI extraction metadata
     extraction_confidence = Column(DECIMAL(3, 2))  # 0.00-1.00
     last_extracted_at = Column(TIMESTAMP)
+    extraction_text_sha256 = Column(String(64))  # Normalized resume text hash the extraction was made from
+    extractor_version = Column(String(64))  # AIExtractor.version that made it
 
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
     updated_at = Column(
@@ -1,7 +1,7 @@
 """
 Winner Essay Cluster model
 """
-from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, func
+from sqlalchemy import Boolean, Column, Integer, String, Text, LargeBinary, TIMESTAMP, func
 from sqlalchemy.dialects.postgresql import JSONB, ARRAY
 from config.database import Base
 
@@ -21,7 +21,36 @@ class WinnerEssayCluster(Base):
     weights = Column(JSONB)  # Trait weights for this cluster
     keywords = Column(JSONB)  # Array of keywords
     sample_essays = Column(ARRAY(Text))  # Array of essay texts
+    centroid = Column(LargeBinary)  # L2-normalized float32 hashed TF-IDF centroid
+    essay_count = Column(Integer, default=0)  # Essays assigned so far
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
+    updated_at = Column(
+        TIMESTAMP,
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp()
+    )
 
     def __repr__(self):
         return f"<WinnerEssayCluster(id={self.id}, archetype='{self.archetype_name}')>"
+
+
+class WinnerClusterVectorizer(Base):
+    """
+    Document frequencies the winner cluster centroids were built with
+    Single row, written in the same transaction as the clusters
+    """
+    __tablename__ = "winner_cluster_vectorizer"
+
+    id = Column(Integer, primary_key=True)
+    n_features = Column(Integer, nullable=False)
+    n_docs = Column(Integer, nullable=False)
+    signed = Column(Boolean, default=False)
+    doc_freq = Column(LargeBinary, nullable=False)  # int64 document frequency per hash bucket
+    updated_at = Column(
+        TIMESTAMP,
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp()
+    )
+
+    def __repr__(self):
+        return f"<WinnerClusterVectorizer(n_features={self.n_features}, n_docs={self.n_docs})>"
@@ -5,11 +5,14 @@ Hackathon version - simplified for demo
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import os
+import logging
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="ScholarLens API - Hackathon Demo",
@@ -51,6 +54,53 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.on_event("startup")
+def load_archetypes():
+    """
+    Load winner essay cluster centroids for archetype tagging
+    """
+    from config.database import SessionLocal
+    from api.services.archetype_matcher import archetype_matcher
+
+    db = SessionLocal()
+    try:
+        archetype_matcher.load(db)
+    except Exception as e:
+        logger.warning(f"Archetype centroids not loaded: {e}")
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+async def start_blob_sweeper():
+    """
+    Start background collection of unreferenced resume blobs
+    """
+    from api.services.blob_sweeper import blob_sweeper
+
+    blob_sweeper.start()
+
+
+@app.on_event("shutdown")
+async def stop_blob_sweeper():
+    """
+    Stop the resume blob sweeper
+    """
+    from api.services.blob_sweeper import blob_sweeper
+
+    await blob_sweeper.stop()
+
+
+@app.on_event("shutdown")
+def stop_pdf_workers():
+    """
+    Stop the PDF parsing process pool
+    """
+    from api.services.pdf_worker_pool import pdf_worker_pool
+
+    pdf_worker_pool.shutdown()
+
+
 # Import routes
 from api.routes import demo, profiles
 
@@ -0,0 +1,96 @@
+"""
+Benchmark peak RSS and time of PDF parsing: original extract_text loop vs
+PDFParser.parse, with and without the upload page/character budgets
+
+Each run happens in a fresh process so peak RSS is not shared between modes.
+
+Usage:
+    python scripts/benchmark_bounded_parse.py --pages 100 --runs 3
+"""
+import sys
+import multiprocessing
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from generate_resume_corpus import generate_resume_pdf
+
+# Same budgets as the upload route
+MAX_PAGES = 30
+MAX_CHARS = 50000
+
+
+def legacy_extract_text(pdf_path: str) -> str:
+    """The pre-ParsedDocument extract_text: every page, cached, += concatenation"""
+    import pdfplumber
+    from api.services.pdf_parser import pdf_parser
+
+    text = ""
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
+    return pdf_parser._clean_text(text)
+
+
+def run_mode(mode: str, pdf_path: str, queue) -> None:
+    from api.services.pdf_parser import pdf_parser
+
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if mode == "legacy":
+        text = legacy_extract_text(pdf_path)[:MAX_CHARS]
+    elif mode == "full":
+        text = pdf_parser.parse(pdf_path).text[:MAX_CHARS]
+    else:
+        text = pdf_parser.parse(pdf_path, max_pages=MAX_PAGES, max_chars=MAX_CHARS).text[:MAX_CHARS]
+    seconds = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((seconds, peak_kb, peak_kb - baseline_kb, text))
+
+
+def measure(mode: str, pdf_path: Path):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=run_mode, args=(mode, str(pdf_path), queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main(n_pages: int, runs: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = generate_resume_pdf(Path(tmp) / "long_resume.pdf", n_pages=n_pages)
+        size_kb = pdf_path.stat().st_size / 1024
+        print(f"{n_pages}-page resume ({size_kb:.0f} KB), budget {MAX_PAGES} pages / {MAX_CHARS} chars\n")
+
+        texts = {}
+        for mode in ("legacy", "full", "bounded"):
+            results = [measure(mode, pdf_path) for _ in range(runs)]
+            seconds = min(r[0] for r in results)
+            peak_mb = min(r[1] for r in results) / 1024
+            growth_mb = min(r[2] for r in results) / 1024
+            texts[mode] = results[0][3]
+            print(f"  {mode:8s} {seconds:6.2f}s   peak RSS {peak_mb:6.1f} MB   parse growth {growth_mb:6.1f} MB")
+
+        same = texts["legacy"] == texts["full"] == texts["bounded"]
+        print(f"\n  stored text identical across modes: {same}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bounded-memory PDF parse benchmark")
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    main(args.pages, args.runs)
@@ -0,0 +1,103 @@
+"""
+Benchmark winner essay clustering on a synthetic corpus
+
+Usage:
+    python scripts/benchmark_clustering.py --essays 100000
+"""
+import sys
+import json
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import numpy as np
+
+from api.services.essay_clustering import EssayClusterer, iter_batches, iter_corpus
+from api.services.trait_scorer import TRAIT_LEXICON, TRAITS
+
+FILLER = (
+    "always believe journey experience family friends today future world people time "
+    "year years moment challenge goal goals dream dreams hope passion growth change"
+).split()
+
+
+def generate_corpus(path: Path, n_essays: int, words_per_essay: int, seed: int = 0) -> None:
+    """Write essays that each draw mostly from one trait's vocabulary"""
+    rng = np.random.default_rng(seed)
+    vocab = {trait: np.array(words) for trait, words in TRAIT_LEXICON.items()}
+    filler = np.array(FILLER)
+
+    with open(path, "w") as f:
+        for i in range(n_essays):
+            trait = TRAITS[i % len(TRAITS)]
+            secondary = TRAITS[rng.integers(len(TRAITS))]
+            n_main = int(words_per_essay * 0.5)
+            n_secondary = int(words_per_essay * 0.2)
+            words = np.concatenate([
+                rng.choice(vocab[trait], n_main),
+                rng.choice(vocab[secondary], n_secondary),
+                rng.choice(filler, words_per_essay - n_main - n_secondary),
+            ])
+            rng.shuffle(words)
+            f.write(json.dumps({"text": " ".join(words), "label": trait}) + "\n")
+
+
+def main(n_essays: int, words_per_essay: int, n_clusters: int, batch_size: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = Path(tmp) / "essays.jsonl"
+        print(f"Generating {n_essays:,} synthetic essays ({words_per_essay} words each)...")
+        generate_corpus(corpus, n_essays, words_per_essay)
+        size_mb = corpus.stat().st_size / 1024 / 1024
+
+        clusterer = EssayClusterer(n_clusters=n_clusters)
+
+        start = time.perf_counter()
+        clusterer.fit_idf(iter_corpus(corpus))
+        idf_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for batch in iter_batches(iter_corpus(corpus), batch_size):
+            clusterer.partial_fit(batch, update_idf=False)
+        cluster_seconds = time.perf_counter() - start
+
+        new_winners = [{"text": r["text"]} for _, r in zip(range(1000), iter_corpus(corpus))]
+        start = time.perf_counter()
+        clusterer.partial_fit(new_winners, update_idf=True)
+        update_seconds = time.perf_counter() - start
+
+        # Purity against the generating trait
+        labels, truth = [], []
+        for batch in iter_batches(iter_corpus(corpus), batch_size):
+            labels.extend(clusterer.predict([r["text"] for r in batch]).tolist())
+            truth.extend(r["label"] for r in batch)
+        pairs = {}
+        for label, trait in zip(labels, truth):
+            pairs.setdefault(label, {}).setdefault(trait, 0)
+            pairs[label][trait] += 1
+        purity = sum(max(c.values()) for c in pairs.values()) / len(truth)
+
+    print(f"\nCorpus: {n_essays:,} essays, {size_mb:.1f} MB")
+    print(f"  idf pass:          {idf_seconds:6.2f}s  {n_essays / idf_seconds:10,.0f} essays/s  {size_mb / idf_seconds:6.1f} MB/s")
+    print(f"  clustering pass:   {cluster_seconds:6.2f}s  {n_essays / cluster_seconds:10,.0f} essays/s  {size_mb / cluster_seconds:6.1f} MB/s")
+    print(f"  1k-winner update:  {update_seconds * 1000:6.0f}ms")
+    print(f"  purity vs generating trait: {purity:.3f}")
+    print("\nArchetypes:")
+    for row in clusterer.cluster_rows():
+        print(f"  [{row['cluster_id']}] {row['archetype_name']:<34} {row['essay_count']:>7,}  {', '.join(row['keywords'][:5])}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Clustering throughput benchmark")
+    parser.add_argument("--essays", type=int, default=100_000)
+    parser.add_argument("--words", type=int, default=250)
+    parser.add_argument("--clusters", type=int, default=6)
+    parser.add_argument("--batch-size", type=int, default=1024)
+    args = parser.parse_args()
+
+    main(args.essays, args.words, args.clusters, args.batch_size)
@@ -0,0 +1,61 @@
+"""
+Benchmark PDF parsing: inline (old upload path) vs the process pool
+
+Usage:
+    python scripts/benchmark_pdf_pool.py --docs 16 --pages 20 --workers 1 2 4
+"""
+import sys
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from generate_resume_corpus import generate_corpus
+from api.services.pdf_parser import pdf_parser
+from api.services.pdf_worker_pool import PDFWorkerPool
+
+
+async def parse_all(pool: PDFWorkerPool, paths) -> list:
+    return await asyncio.gather(*(pool.extract_text(str(p)) for p in paths))
+
+
+def main(n_docs: int, n_pages: int, worker_counts) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = generate_corpus(Path(tmp), n_docs, n_pages)
+        size_mb = sum(p.stat().st_size for p in paths) / 1024 / 1024
+        print(f"{n_docs} resumes x {n_pages} pages ({size_mb:.1f} MB)\n")
+
+        start = time.perf_counter()
+        expected = [pdf_parser.extract_text(str(p)) for p in paths]
+        inline_seconds = time.perf_counter() - start
+        print(f"  inline (blocks event loop): {inline_seconds:6.2f}s  {n_docs / inline_seconds:6.2f} docs/s")
+
+        for workers in worker_counts:
+            PDFWorkerPool.MAX_WORKERS = workers
+            pool = PDFWorkerPool()
+            # Warm the pool so process start-up isn't counted
+            asyncio.run(parse_all(pool, paths[:1]))
+            start = time.perf_counter()
+            texts = asyncio.run(parse_all(pool, paths))
+            seconds = time.perf_counter() - start
+            pool.shutdown()
+            assert texts == expected, "pool output differs from inline parse"
+            print(f"  pool, {workers:2d} workers:         {seconds:6.2f}s  {n_docs / seconds:6.2f} docs/s  "
+                  f"speedup {inline_seconds / seconds:4.1f}x")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="PDF worker pool benchmark")
+    parser.add_argument("--docs", type=int, default=16)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    main(args.docs, args.pages, args.workers)
@@ -0,0 +1,118 @@
+"""
+Compare extraction prompt strategies on long resumes
+
+full: one prompt for every field; sectioned: per-section sub-prompts;
+hybrid: local extraction first, then either prompt shape for the fields
+that are still missing or uncertain.
+
+No API calls: a stub client records every prompt and sleeps for a simple
+latency model (prefill per input token + decode per output token), so the
+wall-clock numbers show the effect of smaller, concurrent prompts rather
+than real Claude timings. Tokens are estimated as characters / 4.
+
+Usage:
+    python scripts/benchmark_sectioned_extraction.py --docs 10 --pages 8
+"""
+import logging
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add backend to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from generate_resume_corpus import generate_corpus
+from api.services.ai_extractor import AIExtractor
+from api.services.claude_service import ClaudeService
+from api.services.pdf_parser import pdf_parser, RESUME_MAX_CHARS, RESUME_MAX_PAGES
+
+CHARS_PER_TOKEN = 4
+
+logging.disable(logging.INFO)
+
+
+class StubMessages:
+    """messages.create stand-in: records prompts, sleeps per the latency model"""
+
+    def __init__(self, prefill_ms_per_1k: float, decode_ms_per_token: float, output_ratio: float):
+        self.prefill_ms_per_1k = prefill_ms_per_1k
+        self.decode_ms_per_token = decode_ms_per_token
+        self.output_ratio = output_ratio
+        self.input_tokens = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def create(self, model, max_tokens, temperature, messages, **kwargs):
+        input_tokens = len(messages[0]["content"]) // CHARS_PER_TOKEN
+        output_tokens = min(max_tokens, int(input_tokens * self.output_ratio))
+        with self._lock:
+            self.input_tokens += input_tokens
+            self.calls += 1
+        time.sleep((input_tokens / 1000 * self.prefill_ms_per_1k + output_tokens * self.decode_ms_per_token) / 1000)
+        return SimpleNamespace(
+            content=[SimpleNamespace(text="{}")],
+            usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens)
+        )
+
+
+STRATEGIES = {
+    "full": ("full", False),
+    "sectioned": ("sectioned", False),
+    "hybrid": ("full", True),
+    "hybrid+sec": ("sectioned", True),
+}
+
+
+def run(extractor: AIExtractor, texts, strategy: str):
+    mode, local_first = STRATEGIES[strategy]
+    stub = extractor.claude.client.messages
+    stub.input_tokens = stub.calls = 0
+    start = time.perf_counter()
+    for text in texts:
+        extractor.extract_profile_from_resume(text, mode=mode, local_first=local_first)
+    return time.perf_counter() - start, stub.input_tokens, stub.calls
+
+
+def main(n_docs: int, n_pages: int, prefill_ms_per_1k: float, decode_ms_per_token: float, output_ratio: float) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = generate_corpus(Path(tmp), n_docs, n_pages)
+        texts = [
+            pdf_parser.parse(str(p), max_pages=RESUME_MAX_PAGES, max_chars=RESUME_MAX_CHARS).text[:RESUME_MAX_CHARS]
+            for p in paths
+        ]
+
+    extractor = AIExtractor()
+    extractor.claude = ClaudeService()
+    extractor.claude.client = SimpleNamespace(messages=StubMessages(prefill_ms_per_1k, decode_ms_per_token, output_ratio))
+    extractor.claude.model = "stub"
+    extractor.claude.call_log = None  # Stub calls don't belong in api_logs
+
+    avg_chars = sum(map(len, texts)) / len(texts)
+    print(f"{n_docs} resumes x ~{n_pages} pages, {avg_chars:,.0f} chars each")
+    print(f"latency model: {prefill_ms_per_1k} ms per 1k input tokens + {decode_ms_per_token} ms per output token")
+
+    results = {strategy: run(extractor, texts, strategy) for strategy in STRATEGIES}
+    full_seconds, full_tokens, _ = results["full"]
+    for strategy, (seconds, tokens, calls) in results.items():
+        print(f"  {strategy:10s} {tokens / n_docs:9,.0f} input tokens/resume  {calls / n_docs:4.1f} calls/resume  "
+              f"{seconds / n_docs * 1000:8.0f} ms/resume  tokens {tokens / full_tokens - 1:+4.0%}  "
+              f"latency {seconds / full_seconds - 1:+4.0%}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sectioned extraction benchmark")
+    parser.add_argument("--docs", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=8)
+    parser.add_argument("--prefill-ms", type=float, default=100.0, help="ms per 1k input tokens")
+    parser.add_argument("--decode-ms", type=float, default=1.0, help="ms per output token")
+    parser.add_argument("--output-ratio", type=float, default=0.3, help="output tokens per input token (capped)")
+    args = parser.parse_args()
+
+    main(args.docs, args.pages, args.prefill_ms, args.decode_ms, args.output_ratio)
@@ -0,0 +1,117 @@
+"""
+Benchmark resume section segmentation: the original per-section keyword scan
+vs the single-pass SectionSegmenter, across resume lengths
+
+Runs a heading regression check first and exits non-zero if it fails.
+
+Usage:
+    python scripts/benchmark_segmenter.py --pages 1 4 16 64 --docs 50
+"""
+import sys
+import random
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from generate_resume_corpus import SECTIONS, resume_lines
+from api.services.section_segmenter import SECTION_KEYWORDS, section_segmenter
+
+# Heading line -> expected label (None: not a heading)
+HEADING_CASES = {
+    "Professional Summary": "summary",
+    "Career Objective": "summary",
+    "Work Experience": "experience",
+    "Professional Experience": "experience",
+    "Technical Skills": "skills",
+    "Academic Achievements": "achievements",
+    "AWARDS & HONORS": "achievements",
+    "Contact Information": "contact",
+    "Research Projects": "projects",
+    "Technical Skills: Python, SQL": "skills",
+    "Education": "education",
+    "Managed work projects": None,
+    "Programming Languages: Python, C++": None,
+    "Work Authorization: US Citizen": None,
+}
+
+NEXT_SECTIONS = ["education", "experience", "skills", "achievements",
+                 "references", "contact", "summary", "objective"]
+
+
+def legacy_extract_section(text: str, keywords: list) -> str:
+    """PDFParser._extract_section before the segmenter"""
+    text_lower = text.lower()
+    start_pos = -1
+    for keyword in keywords:
+        pos = text_lower.find(keyword.lower())
+        if pos != -1 and (start_pos == -1 or pos < start_pos):
+            start_pos = pos
+    if start_pos == -1:
+        return ""
+    section_text = text[start_pos:start_pos + 500]
+    for next_section in NEXT_SECTIONS:
+        if next_section not in keywords:
+            next_pos = text_lower.find(next_section, start_pos + len(keywords[0]))
+            if next_pos != -1:
+                section_text = text[start_pos:next_pos]
+                break
+    return section_text.strip()
+
+
+def legacy_sections(text: str) -> dict:
+    return {name: legacy_extract_section(text, keywords) for name, keywords in SECTION_KEYWORDS.items()}
+
+
+def check_headings() -> bool:
+    """Every HEADING_CASES line is labelled as expected"""
+    ok = True
+    for line, expected in HEADING_CASES.items():
+        spans = section_segmenter.labelled(f"Jane Doe\n{line}\nbody text\n")
+        label = spans[0][0] if spans else None
+        if label != expected:
+            print(f"heading check failed: {line!r} -> {label!r}, expected {expected!r}")
+            ok = False
+    return ok
+
+
+def time_per_doc(fn, texts, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(texts)
+
+
+def main(page_counts, n_docs: int) -> None:
+    print(f"{'pages':>5} {'chars':>8} {'legacy µs':>10} {'segmenter µs':>13} {'ns/char':>8}  headers found")
+    for n_pages in page_counts:
+        texts = [
+            "\n".join(text for text, _ in resume_lines(random.Random(seed), n_pages))
+            for seed in range(n_docs)
+        ]
+        chars = sum(len(t) for t in texts) / n_docs
+        legacy = time_per_doc(legacy_sections, texts)
+        segmenter = time_per_doc(section_segmenter.segment, texts)
+        expected = sum(1 for text in texts for line in text.split("\n") if line in SECTIONS)
+        found = sum(len(section_segmenter.segment(t)) for t in texts)
+        print(f"{n_pages:5d} {chars:8.0f} {legacy * 1e6:10.1f} {segmenter * 1e6:13.1f} "
+              f"{segmenter * 1e9 / chars:8.1f}  {found}/{expected}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Section segmenter benchmark")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--docs", type=int, default=50)
+    args = parser.parse_args()
+
+    if not check_headings():
+        sys.exit(1)
+    main(args.pages, args.docs)
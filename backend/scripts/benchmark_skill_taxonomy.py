@@ -0,0 +1,119 @@
+"""
+Benchmark skill matching: a substring check per skill (the original
+SKILL_KEYWORDS approach) vs the SkillTaxonomy token trie, across taxonomy
+sizes and resume lengths
+
+Without --taxonomy the shipped seed is padded with generated skills up to
+each --entries size. Names reuse resume words as well as made-up ones, so
+trie walks go past the first token as they would with a real export. Pass
+--taxonomy to time a real file instead (e.g. one written by
+import_skill_taxonomy.py).
+
+Usage:
+    python scripts/benchmark_skill_taxonomy.py --entries 300 3000 30000 --pages 1 16 128
+    python scripts/benchmark_skill_taxonomy.py --taxonomy ../data/skill_taxonomy_full.tsv
+"""
+import sys
+import random
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from generate_resume_corpus import resume_lines
+from api.services.skill_taxonomy import SKILL_TAXONOMY_PATH, TOKEN_PATTERN, SkillTaxonomy
+
+CATEGORIES = ["programming", "data", "science", "leadership", "community", "design", "engineering"]
+SYLLABLES = ["ka", "lo", "mi", "ter", "vas", "un", "dro", "pel", "six", "zor", "ne", "qua", "bri", "tol"]
+
+
+def seed_entries(path: str) -> list:
+    """(name, category, aliases) triples from a taxonomy file"""
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.rstrip("\n").split("\t")
+            if line.startswith("#") or len(parts) < 2:
+                continue
+            entries.append((parts[0], parts[1], parts[2].split("|") if len(parts) > 2 and parts[2] else []))
+    return entries
+
+
+def synthetic_entries(n: int, vocabulary: list, seed: int = 0) -> list:
+    """Seed taxonomy padded with generated 1-4 word skills (0-3 aliases each) up to n entries"""
+    rng = random.Random(seed)
+    entries = seed_entries(SKILL_TAXONOMY_PATH)
+    names = {name.lower() for name, _, _ in entries}
+
+    def word() -> str:
+        if rng.random() < 0.5:
+            return rng.choice(vocabulary)
+        return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+
+    while len(entries) < n:
+        name = " ".join(word() for _ in range(rng.randint(1, 4)))
+        if name.lower() in names:
+            continue
+        names.add(name.lower())
+        aliases = [" ".join(word() for _ in range(rng.randint(1, 3))) for _ in range(rng.randint(0, 3))]
+        entries.append((name, rng.choice(CATEGORIES), aliases))
+    return entries
+
+
+def substring_find(needles: list, text: str) -> list:
+    """Original approach: one case-insensitive substring search per skill"""
+    lowered = text.lower()
+    return [needle for needle in needles if needle in lowered]
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(entry_counts, page_counts, taxonomy_path) -> None:
+    texts = {n_pages: "\n".join(text for text, _ in resume_lines(random.Random(n_pages), n_pages)) for n_pages in page_counts}
+    vocabulary = sorted({token.lower() for text in texts.values() for token in TOKEN_PATTERN.findall(text) if len(token) > 3})
+
+    if taxonomy_path:
+        start = time.perf_counter()
+        taxonomies = [SkillTaxonomy.load(taxonomy_path)]
+        print(f"Loaded {len(taxonomies[0])} skills from {taxonomy_path} in {time.perf_counter() - start:.2f}s\n")
+    else:
+        taxonomies = []
+        for n in entry_counts:
+            entries = synthetic_entries(n, vocabulary)
+            start = time.perf_counter()
+            taxonomies.append(SkillTaxonomy(entries))
+            print(f"Compiled {n} skills in {time.perf_counter() - start:.2f}s")
+        print()
+
+    print(f"{'skills':>7} {'chars':>9} {'substring ms':>13} {'trie ms':>9} {'ns/char':>8} {'matches':>8}")
+    for taxonomy in taxonomies:
+        needles = [name.lower() for name, _ in taxonomy.skills]
+        for n_pages, text in texts.items():
+            substring = best_of(lambda: substring_find(needles, text))
+            trie = best_of(lambda: list(taxonomy.scan(text)))
+            matches = sum(1 for _ in taxonomy.scan(text))
+            print(f"{len(taxonomy):7d} {len(text):9d} {substring * 1e3:13.1f} {trie * 1e3:9.1f} "
+                  f"{trie * 1e9 / len(text):8.1f} {matches:8d}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Skill taxonomy matching benchmark")
+    parser.add_argument("--entries", type=int, nargs="+", default=[300, 3000, 30000],
+                        help="Synthetic taxonomy sizes")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 16, 128], help="Resume lengths")
+    parser.add_argument("--taxonomy", help="Time this taxonomy file instead of synthetic ones")
+    args = parser.parse_args()
+
+    main(args.entries, args.pages, args.taxonomy)
@@ -0,0 +1,132 @@
+"""
+Calibration report: local fast-path evaluator vs stored Claude evaluations
+
+Re-scores every stored LLM Evaluation that still has both essays with the
+local evaluator and reports agreement per trait.
+
+Usage:
+    python scripts/calibrate_local_evaluator.py [--limit 500] [--json report.json]
+"""
+import sys
+import json
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import numpy as np
+from sqlalchemy import or_
+
+from config.database import SessionLocal
+from db.models import Evaluation
+from api.services.local_evaluator import local_evaluator
+from api.services.trait_scorer import TRAITS
+
+
+def pearson(x, y):
+    """Pearson correlation, or None when either side is constant"""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    if len(x) < 2 or x.std() == 0 or y.std() == 0:
+        return None
+    return float(np.corrcoef(x, y)[0, 1])
+
+
+def agreement(local_values, llm_values):
+    """Correlation and mean absolute error between two score lists"""
+    diff = np.abs(np.asarray(local_values, dtype=float) - np.asarray(llm_values, dtype=float))
+    return {
+        "pearson": pearson(local_values, llm_values),
+        "mae": float(diff.mean()) if len(diff) else None,
+    }
+
+
+def build_report(limit: int) -> dict:
+    db = SessionLocal()
+    try:
+        evaluations = db.query(Evaluation).filter(
+            or_(Evaluation.scorer == "llm", Evaluation.scorer.is_(None)),
+            Evaluation.adaptive_essay_id.isnot(None),
+            Evaluation.baseline_essay_id.isnot(None)
+        ).order_by(Evaluation.id.desc()).limit(limit).all()
+
+        pairs = {f"adaptive.{t}": ([], []) for t in TRAITS}
+        pairs.update({f"baseline.{t}": ([], []) for t in TRAITS})
+        pairs["alignment_gain"] = ([], [])
+        pairs["tone_consistency_score"] = ([], [])
+        same_winner = 0
+        scored = 0
+        local_seconds = 0.0
+
+        for evaluation in evaluations:
+            persona = evaluation.persona
+            if not (persona and evaluation.adaptive_essay and evaluation.baseline_essay):
+                continue
+
+            persona_dict = {"persona_name": persona.persona_name, "tone": persona.tone, "weights": persona.weights}
+            start = time.perf_counter()
+            local = local_evaluator.compare(
+                persona_dict,
+                evaluation.adaptive_essay.paragraphs,
+                evaluation.baseline_essay.paragraphs
+            )
+            local_seconds += time.perf_counter() - start
+            scored += 1
+
+            for prefix, local_scores, llm_scores in (
+                ("adaptive", local["trait_alignment"], evaluation.trait_alignment or {}),
+                ("baseline", local["baseline_alignment"], evaluation.baseline_alignment or {}),
+            ):
+                for trait in TRAITS:
+                    if trait in llm_scores:
+                        pairs[f"{prefix}.{trait}"][0].append(local_scores[trait])
+                        pairs[f"{prefix}.{trait}"][1].append(float(llm_scores[trait]))
+
+            llm_gain = float(evaluation.alignment_gain or 0)
+            pairs["alignment_gain"][0].append(local["alignment_gain"])
+            pairs["alignment_gain"][1].append(llm_gain)
+            if (local["alignment_gain"] > 0) == (llm_gain > 0):
+                same_winner += 1
+
+            if evaluation.tone_consistency_score is not None:
+                pairs["tone_consistency_score"][0].append(local["tone_consistency_score"])
+                pairs["tone_consistency_score"][1].append(float(evaluation.tone_consistency_score))
+
+        return {
+            "evaluations_scored": scored,
+            "winner_agreement": same_winner / scored if scored else None,
+            "local_ms_per_evaluation": local_seconds / scored * 1000 if scored else None,
+            "metrics": {name: agreement(*values) for name, values in pairs.items() if values[0]},
+        }
+    finally:
+        db.close()
+
+
+def print_report(report: dict) -> None:
+    print(f"\n📊 Local vs LLM evaluator calibration ({report['evaluations_scored']} evaluations)\n")
+    if not report["evaluations_scored"]:
+        print("No stored LLM evaluations with both essays found.")
+        return
+
+    print(f"  Same winner (sign of alignment_gain): {report['winner_agreement']:.1%}")
+    print(f"  Local scorer cost: {report['local_ms_per_evaluation']:.2f} ms/evaluation\n")
+    print(f"  {'metric':<28} {'pearson':>8} {'mae':>8}")
+    for name, values in report["metrics"].items():
+        r = f"{values['pearson']:.3f}" if values["pearson"] is not None else "n/a"
+        print(f"  {name:<28} {r:>8} {values['mae']:>8.3f}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Calibrate local evaluator against stored LLM evaluations")
+    parser.add_argument("--limit", type=int, default=1000, help="Most recent evaluations to compare")
+    parser.add_argument("--json", type=Path, help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    report = build_report(args.limit)
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+        print(f"\n✅ Report written to {args.json}")
@@ -0,0 +1,111 @@
+"""
+Cluster winner essays into archetypes and upsert WinnerEssayCluster rows
+
+Usage:
+    python scripts/cluster_winner_essays.py fit data/winner_essays.jsonl --clusters 8
+    python scripts/cluster_winner_essays.py update data/new_winners.jsonl
+"""
+import sys
+import os
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from api.services.essay_clustering import EssayClusterer, iter_batches, iter_corpus, upsert_clusters
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = Path(os.getenv(
+    "CLUSTER_STATE_PATH",
+    str(backend_dir / "indexes" / "winner_clusters.npz")
+))
+
+
+def save_to_database(clusterer: EssayClusterer) -> None:
+    """Bulk-upsert cluster summaries"""
+    from config.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        written = upsert_clusters(db, clusterer.cluster_rows(), clusterer.vectorizer)
+        logger.info(f"✅ Upserted {written} winner essay clusters")
+    except Exception as e:
+        logger.error(f"Error saving clusters: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def fit(corpus: Path, n_clusters: int, batch_size: int, state_path: Path) -> EssayClusterer:
+    """Fit clusters from scratch with two streaming passes over the corpus"""
+    clusterer = EssayClusterer(n_clusters=n_clusters)
+
+    start = time.perf_counter()
+    n_idf = clusterer.fit_idf(iter_corpus(corpus))
+    idf_seconds = time.perf_counter() - start
+    logger.info(f"idf pass: {n_idf} essays in {idf_seconds:.1f}s ({n_idf / max(idf_seconds, 1e-9):,.0f} essays/s)")
+
+    start = time.perf_counter()
+    n_clustered = 0
+    for batch in iter_batches(iter_corpus(corpus), batch_size):
+        clusterer.partial_fit(batch, update_idf=False)
+        n_clustered += len(batch)
+    cluster_seconds = time.perf_counter() - start
+    logger.info(
+        f"clustering pass: {n_clustered} essays in {cluster_seconds:.1f}s "
+        f"({n_clustered / max(cluster_seconds, 1e-9):,.0f} essays/s)"
+    )
+
+    clusterer.save(state_path)
+    return clusterer
+
+
+def update(corpus: Path, batch_size: int, state_path: Path) -> EssayClusterer:
+    """Fold new winner essays into existing clusters"""
+    clusterer = EssayClusterer.load(state_path)
+
+    start = time.perf_counter()
+    n_essays = 0
+    for batch in iter_batches(iter_corpus(corpus), batch_size):
+        clusterer.partial_fit(batch, update_idf=True)
+        n_essays += len(batch)
+    seconds = time.perf_counter() - start
+    logger.info(f"incremental update: {n_essays} essays in {seconds:.1f}s")
+
+    clusterer.save(state_path)
+    return clusterer
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Winner essay clustering")
+    parser.add_argument(
+        "action",
+        choices=["fit", "update"],
+        help="fit (from scratch) or update (fold new winners into saved clusters)"
+    )
+    parser.add_argument("corpus", type=Path, help="JSONL file or directory of .txt essays")
+    parser.add_argument("--clusters", type=int, default=8, help="Number of archetypes (fit only)")
+    parser.add_argument("--batch-size", type=int, default=1024, help="Essays per mini-batch")
+    parser.add_argument("--state", type=Path, default=DEFAULT_STATE_PATH, help="Clustering state file")
+    parser.add_argument("--no-db", action="store_true", help="Skip the database upsert")
+
+    args = parser.parse_args()
+
+    if args.action == "fit":
+        result = fit(args.corpus, args.clusters, args.batch_size, args.state)
+    else:
+        result = update(args.corpus, args.batch_size, args.state)
+
+    for row in result.cluster_rows():
+        print(f"  [{row['cluster_id']}] {row['archetype_name']} - {row['essay_count']} essays - {', '.join(row['keywords'][:6])}")
+
+    if not args.no_db:
+        save_to_database(result)
@@ -0,0 +1,79 @@
+"""
+Run AI extraction for every profile with resume text that was never extracted
+
+Command-line twin of POST /profiles/extract-batch. Pending profiles are read
+by keyset pagination and committed in batches, so an interrupted run can
+simply be started again.
+
+Usage:
+    python scripts/extract_pending_profiles.py --concurrency 8 --batch-size 50
+    python scripts/extract_pending_profiles.py --limit 200 --dry-run
+"""
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from api.services.batch_extraction import batch_extractor, BatchProgress
+import logging
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+def print_progress(progress: BatchProgress) -> None:
+    """Single-line live progress on stderr"""
+    stats = progress.to_dict()
+    eta = f"  eta {stats['eta_seconds']}s" if stats["eta_seconds"] is not None else ""
+    print(
+        f"\r{progress.processed}/{progress.total} profiles  {progress.extracted} extracted  "
+        f"{progress.reused} reused  {progress.failed} failed  {progress.degraded} degraded  {stats['profiles_per_second']:6.2f} profiles/s{eta}",
+        end="", file=sys.stderr, flush=True
+    )
+
+
+def main(limit, concurrency: int, batch_size: int, dry_run: bool) -> None:
+    from config.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        pending = batch_extractor.count_pending(db)
+    finally:
+        db.close()
+    print(f"{pending} profiles pending extraction")
+    if dry_run or not pending:
+        return
+
+    progress = batch_extractor.run(
+        limit=limit,
+        concurrency=concurrency,
+        batch_size=batch_size,
+        on_progress=print_progress
+    )
+    print(file=sys.stderr)
+    stats = progress.to_dict()
+    print(f"Batch {progress.status}: {progress.processed} profiles in {stats['elapsed_seconds']}s "
+          f"({stats['profiles_per_second']} profiles/s), {progress.extracted} extractor calls, "
+          f"{progress.reused} reused, {progress.failed} failed")
+    if progress.degraded:
+        print(f"{progress.degraded} profiles got degraded (local-only) results and stay pending; rerun when Claude is available")
+    if progress.error:
+        print(f"Error: {progress.error}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Batch profile extraction")
+    parser.add_argument("--limit", type=int, default=None, help="Extract at most this many profiles")
+    parser.add_argument("--concurrency", type=int, default=batch_extractor.CONCURRENCY,
+                        help="Concurrent extractions")
+    parser.add_argument("--batch-size", type=int, default=batch_extractor.BATCH_SIZE,
+                        help="Profiles per page and per commit")
+    parser.add_argument("--dry-run", action="store_true", help="Only count pending profiles")
+    args = parser.parse_args()
+
+    main(args.limit, args.concurrency, args.batch_size, args.dry_run)
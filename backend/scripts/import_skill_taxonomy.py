@@ -0,0 +1,188 @@
+"""
+Import a standard skills export into the skill taxonomy TSV format
+
+Supported sources:
+  esco  ESCO classification CSV export (skills_en.csv, or the directory holding
+        it; broaderRelationsSkillPillar_en.csv and skillGroups_en.csv next to it
+        supply categories)
+  onet  O*NET "Technology Skills.txt" or "Tools Used.txt" (tab-delimited)
+
+The curated seed taxonomy is written first and wins on conflicts: an imported
+skill whose name or alias the seed already covers is dropped, so the seed's
+exact-case rules (Go, R, React) keep applying.
+
+Usage:
+    python scripts/import_skill_taxonomy.py esco ~/esco-v1.2 --output ../data/skill_taxonomy_full.tsv
+    python scripts/import_skill_taxonomy.py onet "Technology Skills.txt" --output ../data/skill_taxonomy_full.tsv
+    SKILL_TAXONOMY_PATH=../data/skill_taxonomy_full.tsv uvicorn main:app
+"""
+import sys
+import csv
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Add backend to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from api.services.skill_taxonomy import ALIAS_SEPARATOR, EXACT_PREFIX, SKILL_TAXONOMY_PATH, TOKEN_PATTERN
+
+Entry = Tuple[str, str, List[str]]  # (name, category, aliases)
+
+# Source group/commodity label -> taxonomy category (first match wins); the
+# categories are the keys of trait_scorer.CATEGORY_TRAITS
+CATEGORY_RULES = [
+    (re.compile(r"artificial intelligence|machine learning|neural", re.I), "ai"),
+    (re.compile(r"program|software develop|compiler|object or component|development environment", re.I), "programming"),
+    (re.compile(r"database", re.I), "database"),
+    (re.compile(r"web|internet|browser", re.I), "web"),
+    (re.compile(r"cloud|platform as a service", re.I), "cloud"),
+    (re.compile(r"security|encryption|antivirus", re.I), "security"),
+    (re.compile(r"mobile|smartphone", re.I), "mobile"),
+    (re.compile(r"configuration management|operating system|network", re.I), "devops"),
+    (re.compile(r"data|statistic|analytic", re.I), "data"),
+    (re.compile(r"graphic|design|drafting|drawing", re.I), "design"),
+    (re.compile(r"engineer|manufactur|mechanic|electric", re.I), "engineering"),
+    (re.compile(r"research|laborator", re.I), "research"),
+    (re.compile(r"scien|biolog|chemi|physic|mathemat", re.I), "science"),
+    (re.compile(r"lead|manag|supervis|coordinat", re.I), "leadership"),
+    (re.compile(r"health|medic|nurs|patient|clinic|care", re.I), "healthcare"),
+    (re.compile(r"teach|educat|training|instruct", re.I), "education"),
+    (re.compile(r"social|communit|volunteer|counsel", re.I), "community"),
+    (re.compile(r"software|application|computer", re.I), "software"),
+]
+
+# Single short tokens ("R", "Go", "C") are also ordinary words or letters
+EXACT_MAX_CHARS = 2
+
+
+def categorize(label: str, default: str) -> str:
+    """Taxonomy category for a source group label"""
+    for pattern, category in CATEGORY_RULES:
+        if pattern.search(label or ""):
+            return category
+    return default
+
+
+def clean_label(label: str, max_words: int) -> Optional[str]:
+    """Label usable as a TSV name/alias, or None"""
+    label = " ".join((label or "").split())
+    if not label or "\t" in label or ALIAS_SEPARATOR in label or label.startswith(EXACT_PREFIX):
+        return None
+    if not 0 < len(TOKEN_PATTERN.findall(label)) <= max_words:
+        return None
+    return label
+
+
+def iter_esco(path: Path) -> Iterator[Entry]:
+    """Released ESCO skills with their alternative labels"""
+    directory = path if path.is_dir() else path.parent
+    skills_path = directory / "skills_en.csv" if path.is_dir() else path
+
+    # Skill URI -> label of its skill group, when the hierarchy files are present
+    groups: Dict[str, str] = {}
+    relations_path = directory / "broaderRelationsSkillPillar_en.csv"
+    groups_path = directory / "skillGroups_en.csv"
+    if relations_path.exists() and groups_path.exists():
+        with open(groups_path, encoding="utf-8", newline="") as f:
+            group_labels = {row["conceptUri"]: row["preferredLabel"] for row in csv.DictReader(f)}
+        with open(relations_path, encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                if row.get("broaderUri") in group_labels:
+                    groups.setdefault(row["conceptUri"], group_labels[row["broaderUri"]])
+
+    with open(skills_path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            if row.get("status", "released") != "released":
+                continue
+            group = groups.get(row.get("conceptUri", ""), "")
+            default = "knowledge" if row.get("skillType") == "knowledge" else "skill"
+            aliases = (row.get("altLabels") or "").split("\n")
+            yield row["preferredLabel"], categorize(group, default), aliases
+
+
+def iter_onet(path: Path) -> Iterator[Entry]:
+    """O*NET technology/tool examples, one entry per distinct example name"""
+    seen = set()
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f, delimiter="\t"):
+            name = row["Example"]
+            if name.lower() in seen:
+                continue
+            seen.add(name.lower())
+            yield name, categorize(row.get("Commodity Title", ""), "software"), []
+
+
+SOURCES = {"esco": iter_esco, "onet": iter_onet}
+
+
+def read_taxonomy(path: Path) -> List[str]:
+    """Data lines of an existing taxonomy file"""
+    with open(path, encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip() and not line.startswith("#")]
+
+
+def covered_keys(lines: List[str]) -> set:
+    """Lowercased names and aliases a taxonomy already registers"""
+    keys = set()
+    for line in lines:
+        parts = line.split("\t")
+        keys.add(parts[0].strip().lower())
+        if len(parts) > 2:
+            keys.update(a.strip().lstrip(EXACT_PREFIX).lower() for a in parts[2].split(ALIAS_SEPARATOR) if a.strip())
+    return keys
+
+
+def convert(entries: Iterator[Entry], covered: set, max_words: int) -> Iterator[str]:
+    """TSV lines for imported entries the seed does not cover"""
+    for name, category, aliases in entries:
+        name = clean_label(name, max_words)
+        if name is None or name.lower() in covered:
+            continue
+        covered.add(name.lower())
+
+        kept = []
+        if len(name) <= EXACT_MAX_CHARS and len(TOKEN_PATTERN.findall(name)) == 1:
+            kept.append(EXACT_PREFIX + name)
+        for alias in aliases:
+            alias = clean_label(alias, max_words)
+            if alias is None or alias.lower() in covered:
+                continue
+            covered.add(alias.lower())
+            kept.append(alias)
+        yield f"{name}\t{category}\t{ALIAS_SEPARATOR.join(kept)}"
+
+
+def main(source: str, path: Path, output: Path, seed: Optional[Path], max_words: int) -> None:
+    seed_lines = read_taxonomy(seed) if seed else []
+    imported = list(convert(SOURCES[source](path), covered_keys(seed_lines), max_words))
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(f"# ScholarLens skill taxonomy: {len(seed_lines)} curated skills + {len(imported)} imported from {source}\n")
+        f.write("# One skill per line: canonical name <TAB> category <TAB> aliases separated by \"|\"\n")
+        for line in seed_lines + imported:
+            f.write(line + "\n")
+
+    categories = Counter(line.split("\t")[1] for line in imported)
+    print(f"✅ Wrote {len(seed_lines) + len(imported)} skills to {output} ({len(imported)} imported)")
+    for category, count in categories.most_common():
+        print(f"  {category:<14} {count}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Import ESCO / O*NET skills into the taxonomy TSV format")
+    parser.add_argument("source", choices=sorted(SOURCES), help="Export format")
+    parser.add_argument("path", type=Path, help="Export file (or ESCO CSV directory)")
+    parser.add_argument("--output", type=Path, required=True, help="Taxonomy file to write")
+    parser.add_argument("--seed", type=Path, default=Path(SKILL_TAXONOMY_PATH),
+                        help="Curated taxonomy written first (default: the shipped one)")
+    parser.add_argument("--no-seed", action="store_true", help="Write imported skills only")
+    parser.add_argument("--max-words", type=int, default=6, help="Drop names/aliases longer than this")
+    args = parser.parse_args()
+
+    main(args.source, args.path, args.output, None if args.no_seed else args.seed, args.max_words)
@@ -0,0 +1,332 @@
+"""
+Bulk-ingest a directory of resume PDFs into StudentProfile rows
+
+PDFs are hashed, stored as blobs and parsed in a process pool; the main
+process upserts profiles in batched transactions. A profile is matched by
+resume hash (already ingested - skipped) or by email, otherwise created.
+Every committed batch is appended to a checkpoint file, so an interrupted
+run picks up where it stopped. A created or replaced resume clears the
+profile's extraction marks, so it stays pending for extract_pending_profiles
+(or --extract, here or on a later run) until it has been extracted.
+
+Usage:
+    python scripts/ingest_resumes.py /data/partner_school --workers 8
+    python scripts/ingest_resumes.py /data/partner_school --extract --extract-workers 4
+"""
+import sys
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Set
+
+# Add backend to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from api.services.file_service import file_service
+from api.services.field_scanner import field_scanner
+from api.services.parse_cache import parse_cache, hash_file
+from api.services.pdf_parser import pdf_parser, RESUME_MAX_CHARS, RESUME_MAX_PAGES
+from api.services.pdf_worker_pool import parse_cache_key
+import logging
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = ".ingest_checkpoint"
+MAX_NAME_WORDS = 5
+
+
+def iter_pdfs(directory: Path) -> Iterator[Path]:
+    """PDFs under a directory, in a stable order"""
+    for path in sorted(directory.rglob("*")):
+        if path.is_file() and path.suffix.lower() == ".pdf":
+            yield path
+
+
+def load_checkpoint(checkpoint: Path) -> Set[str]:
+    """Relative paths already committed by a previous run"""
+    if not checkpoint.exists():
+        return set()
+    with open(checkpoint, encoding="utf-8") as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+def guess_name(text: str, fallback: str) -> str:
+    """First short line without digits or '@' (resumes open with the name), else the file stem"""
+    for line in text.splitlines()[:5]:
+        line = line.strip()
+        if line and len(line.split()) <= MAX_NAME_WORDS and "@" not in line and not any(c.isdigit() for c in line):
+            return line[:100]
+    return fallback.replace("_", " ").replace("-", " ").title()[:100]
+
+
+def process_file(path: str, root: str, store: bool = True) -> Dict[str, Any]:
+    """
+    Hash, store and parse one PDF (runs in a worker process)
+
+    Args:
+        path: Absolute path of the PDF
+        root: Directory being ingested (for the checkpoint key)
+        store: Copy the PDF into blob storage
+
+    Returns:
+        Dict with the parse result, or with "error" set
+    """
+    result: Dict[str, Any] = {
+        "relpath": os.path.relpath(path, root),
+        "filename": os.path.basename(path),
+        "size": 0,
+        "error": None,
+    }
+    try:
+        result["size"] = os.path.getsize(path)
+        if result["size"] > file_service.MAX_FILE_SIZE:
+            raise ValueError(f"larger than {file_service.MAX_FILE_SIZE // 1024 // 1024}MB")
+        with open(path, "rb") as f:
+            if not f.read(len(file_service.PDF_MAGIC)) == file_service.PDF_MAGIC:
+                raise ValueError("not a PDF document")
+
+        sha256 = hash_file(path)
+        result["sha256"] = sha256
+        if store:
+            result["blob_path"] = file_service.store_local_file(path, sha256)
+
+        cache_key = parse_cache_key(sha256, RESUME_MAX_PAGES, RESUME_MAX_CHARS)
+        document = parse_cache.get(cache_key, result["size"])
+        if document is None:
+            document = pdf_parser.parse(path, max_pages=RESUME_MAX_PAGES, max_chars=RESUME_MAX_CHARS)
+            parse_cache.put(cache_key, document)
+
+        text = document.text[:RESUME_MAX_CHARS]
+        if not text:
+            raise ValueError("no extractable text")
+        result["text"] = text
+        result["name"] = guess_name(document.raw_text, Path(path).stem)
+        result.update(field_scanner.extract(document.raw_text))
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def upsert_batch(db, results: List[Dict[str, Any]]) -> Dict[str, List[int]]:
+    """
+    Create or update profiles for a batch of parsed resumes (caller commits)
+
+    Returns:
+        {"created": [...], "updated": [...], "skipped": [...]} student ids
+    """
+    from db.models.student_profile import StudentProfile
+
+    hashes = {r["sha256"] for r in results}
+    emails = {r["email"] for r in results if r.get("email")}
+    by_hash = {
+        p.resume_sha256: p
+        for p in db.query(StudentProfile).filter(StudentProfile.resume_sha256.in_(hashes))
+    }
+    by_email = {}
+    if emails:
+        by_email = {p.email: p for p in db.query(StudentProfile).filter(StudentProfile.email.in_(emails))}
+
+    created, updated, skipped = [], [], []
+    for r in results:
+        student = by_hash.get(r["sha256"])
+        if student is not None:
+            skipped.append(student)
+            continue
+
+        student = by_email.get(r.get("email")) if r.get("email") else None
+        if student is None:
+            student = StudentProfile(name=r["name"], email=r.get("email"))
+            db.add(student)
+            created.append(student)
+            if r.get("email"):
+                by_email[r["email"]] = student
+        else:
+            updated.append(student)
+
+        if r.get("phone") and not student.phone:
+            student.phone = r["phone"][:20]
+        if r.get("gpa") is not None and student.gpa is None:
+            student.gpa = r["gpa"]
+        student.resume_filename = r["filename"]
+        student.resume_file_path = r["blob_path"]
+        student.resume_sha256 = r["sha256"]
+        student.raw_resume_text = r["text"]
+        student.profile_source = 'resume'
+        # New text: pending for batch extraction until it has been extracted
+        student.last_extracted_at = None
+        student.extraction_text_sha256 = None
+        # Later files in this batch with the same content are duplicates
+        by_hash[r["sha256"]] = student
+
+    db.flush()
+    return {
+        "created": [s.id for s in created],
+        "updated": [s.id for s in updated],
+        "skipped": [s.id for s in skipped],
+    }
+
+
+class Progress:
+    """Single-line live throughput report"""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.files = 0
+        self.bytes = 0
+        self.failed = 0
+        self.start = time.perf_counter()
+
+    def add(self, result: Dict[str, Any]) -> None:
+        self.files += 1
+        self.bytes += result["size"]
+        self.failed += result["error"] is not None
+
+    def line(self) -> str:
+        elapsed = max(time.perf_counter() - self.start, 1e-9)
+        return (
+            f"{self.files}/{self.total} files  {self.failed} failed  "
+            f"{self.files / elapsed:6.1f} files/s  {self.bytes / 1024 / 1024 / elapsed:6.2f} MB/s"
+        )
+
+    def show(self) -> None:
+        print(f"\r{self.line()}", end="", file=sys.stderr, flush=True)
+
+
+def ingest(
+    directory: Path,
+    workers: int,
+    batch_size: int,
+    checkpoint: Path,
+    dry_run: bool = False
+) -> None:
+    """
+    Ingest every PDF under a directory not yet in the checkpoint
+
+    Args:
+        directory: Directory to walk
+        workers: Parser processes
+        batch_size: Profiles per transaction
+        checkpoint: Checkpoint file (one committed relative path per line)
+        dry_run: Parse only; no database writes, no checkpoint
+    """
+    done = load_checkpoint(checkpoint)
+    paths = [p for p in iter_pdfs(directory) if os.path.relpath(p, directory) not in done]
+    print(f"{len(paths)} PDFs to ingest ({len(done)} already in checkpoint)")
+    if not paths:
+        return
+
+    db = None
+    if not dry_run:
+        from config.database import SessionLocal
+        db = SessionLocal()
+
+    progress = Progress(len(paths))
+    totals = {"created": 0, "updated": 0, "skipped": 0}
+    batch: List[Dict[str, Any]] = []
+    failed: List[Dict[str, Any]] = []
+
+    def commit_batch() -> None:
+        if not batch:
+            return
+        if db is not None:
+            try:
+                ids = upsert_batch(db, [r for r in batch if r["error"] is None])
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            for key, values in ids.items():
+                totals[key] += len(values)
+            # Only after the commit: a crash before this line re-ingests the batch
+            with open(checkpoint, "a", encoding="utf-8") as f:
+                f.writelines(f"{r['relpath']}\n" for r in batch)
+        batch.clear()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, min(16, len(paths) // (workers * 4)))
+            worker = partial(process_file, root=str(directory), store=not dry_run)
+            results = executor.map(worker, map(str, paths), chunksize=chunksize)
+            for result in results:
+                progress.add(result)
+                if result["error"] is not None:
+                    failed.append(result)
+                else:
+                    batch.append(result)
+                if len(batch) >= batch_size:
+                    commit_batch()
+                progress.show()
+            commit_batch()
+    finally:
+        print(file=sys.stderr)
+        if db is not None:
+            db.close()
+
+    print(f"Done: {progress.line()}")
+    if db is not None:
+        print(f"Profiles: {totals['created']} created, {totals['updated']} updated, "
+              f"{totals['skipped']} unchanged")
+    for result in failed:
+        # Failures stay out of the checkpoint so a rerun retries them
+        print(f"  FAILED {result['relpath']}: {result['error']}")
+
+
+def extract(workers: int, batch_size: int) -> None:
+    """
+    Run AI extraction for every pending profile, committing in batches
+
+    Pending is read from the database (not from this run's ingest), so
+    profiles ingested by an interrupted or earlier run are included.
+    """
+    from config.database import SessionLocal
+    from api.services.batch_extraction import batch_extractor
+    from extract_pending_profiles import print_progress
+
+    db = SessionLocal()
+    try:
+        pending = batch_extractor.count_pending(db)
+    finally:
+        db.close()
+    if not pending:
+        return
+    print(f"Extracting {pending} pending profiles with {workers} workers")
+    progress = batch_extractor.run(
+        concurrency=workers,
+        batch_size=batch_size,
+        on_progress=print_progress
+    )
+    print(file=sys.stderr)
+    print(f"Extraction {progress.status}: {progress.extracted} extracted, {progress.reused} reused, "
+          f"{progress.failed} failed, {progress.degraded} degraded (still pending)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bulk resume ingestion")
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Parser processes")
+    parser.add_argument("--batch-size", type=int, default=100, help="Profiles per transaction")
+    parser.add_argument("--checkpoint", type=Path, default=None,
+                        help=f"Checkpoint file (default: <directory>/{CHECKPOINT_NAME})")
+    parser.add_argument("--restart", action="store_true", help="Ignore and reset the checkpoint")
+    parser.add_argument("--extract", action="store_true", help="Run AI extraction on all pending profiles afterwards")
+    parser.add_argument("--extract-workers", type=int, default=4, help="Concurrent AI extraction requests")
+    parser.add_argument("--dry-run", action="store_true", help="Parse only; no database writes")
+    args = parser.parse_args()
+
+    directory = args.directory.resolve()
+    if not directory.is_dir():
+        parser.error(f"{directory} is not a directory")
+    checkpoint = args.checkpoint or directory / CHECKPOINT_NAME
+    if args.restart and checkpoint.exists():
+        checkpoint.unlink()
+
+    ingest(directory, args.workers, args.batch_size, checkpoint, args.dry_run)
+    if args.extract and not args.dry_run:
+        extract(args.extract_workers, args.batch_size)
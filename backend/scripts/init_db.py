@@ -17,7 +17,8 @@ from db.models import (
     Essay,
     Evaluation,
     WinnerEssayCluster,
-    APILog
+    APILog,
+    ExtractionResult
 )
 
 
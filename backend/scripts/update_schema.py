@@ -16,6 +16,7 @@ from db.models.essay import Essay
 from db.models.evaluation import Evaluation
 from db.models.api_log import APILog
 from db.models.winner_cluster import WinnerEssayCluster
+from db.models.extraction_result import ExtractionResult
 
 def update_schema():
     """